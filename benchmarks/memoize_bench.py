@@ -0,0 +1,68 @@
+# coding=utf-8
+"""
+Measure the cost of a cache hit of the memoize helpers, compared with
+the previous implementation which inspected the function on every call.
+
+Usage::
+
+    python benchmarks/memoize_bench.py [--number N]
+"""
+from __future__ import print_function
+
+import argparse
+import functools
+import timeit
+
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    from inspect import getargspec
+
+from dce.utils.utils import cached, memoize, memoize_in_object
+
+
+def legacy_memoize(fn):
+    cache = fn.cache = {}
+
+    @functools.wraps(fn)
+    def _memoize(*args, **kwargs):
+        kwargs.update(dict(zip(getargspec(fn).args, args)))
+        key = tuple(kwargs.get(k, None) for k in getargspec(fn).args if k != 'self')
+        if key not in cache:
+            cache[key] = fn(**kwargs)
+        return cache[key]
+
+    return _memoize
+
+
+def add(a, b=1):
+    return a + b
+
+
+class Object(object):
+    def add(self, a, b=1):
+        return a + b
+
+    cached_add = memoize_in_object(add)
+
+
+def run(number):
+    obj = Object()
+    cases = [
+        ('legacy memoize', legacy_memoize(add), (1, 2)),
+        ('memoize', memoize(add), (1, 2)),
+        ('memoize, maxsize=128', cached(maxsize=128)(add), (1, 2)),
+        ('memoize, ttl=60', cached(ttl=60)(add), (1, 2)),
+        ('memoize_in_object', obj.cached_add, (1, 2)),
+    ]
+
+    for name, fn, args in cases:
+        fn(*args)
+        seconds = min(timeit.repeat(lambda: fn(*args), number=number, repeat=3))
+        print('{0:<28} {1:8.0f} ns per hit'.format(name, seconds / number * 1e9))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=200000)
+    run(parser.parse_args().number)
@@ -1,12 +1,40 @@
 # coding=utf-8
 from .api.client import APIClient
+from .api.pool import ClientPool
+from .api.discovery import DiscoveryCache
+from .api.cache import ResponseCache
+from .api.conditional import (
+    ValidatorStore, MemoryValidatorStore, FileValidatorStore
+)
+from .api.retry import RetryPolicy, RetryBudget
+from .api.limiter import EndpointLimiter, Limit
+from .api.breaker import CircuitBreaker
+from .api.hedge import HedgePolicy
+from .api.deadline import deadline
+from .api.pager import Pager, OffsetPaging, PagePaging
+from .api.batch import Batch
+from .api.inventory import InventoryStore
+from .api.crawler import CrawlStats
+from .api.search import RepositoryIndex
 from .utils.utils import (
     gen_plugins_storage_token, camelize_dict
 )
 from .utils.decorators import (
-    maximum_version, minimum_version
+    maximum_version, minimum_version, resolve_version_gates
 )
 from .errors import (
     NotFound, NullResource,
-    NotAuthorizedError
+    NotAuthorizedError, BatchDependencyError, CircuitOpenError,
+    DeadlineExceeded, ThrottledError
 )
+
+
+def __getattr__(name):
+    # aiohttp is slow to import, so `dce.AsyncAPIClient` is imported on
+    # first access, or by `from dce.api.async_client import AsyncAPIClient`
+    if name == 'AsyncAPIClient':
+        from .api.async_client import AsyncAPIClient
+        return AsyncAPIClient
+    raise AttributeError(
+        "module '{0}' has no attribute '{1}'".format(__name__, name)
+    )
@@ -50,7 +50,7 @@ class AccessKeyApiMixin:
         url = '/access-keys/{0}'.format(access_key)
 
         res = self._delete(self._url(url))
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
 
 class TeamAPiMixin:
@@ -148,7 +148,7 @@ class TeamAPiMixin:
         url = '/teams/{0}'.format(team)
 
         res = self._delete(self._url(url))
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def add_team_member(self, team, name=None):
         """
@@ -180,7 +180,7 @@ class TeamAPiMixin:
         url = '/teams/{0}/members'.format(team)
 
         res = self._delete(self._url(url), params={'Name': name})
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
 
 class TenantApiMixin:
@@ -282,7 +282,7 @@ class TenantApiMixin:
         url = '/tenants/{0}'.format(tenant)
 
         res = self._delete(self._url(url))
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def authorize_team_for_tenant(self, tenant, team_id=None, role=None):
         """
@@ -319,7 +319,7 @@ class TenantApiMixin:
         url = '/tenants/{0}/accessible-list'.format(tenant)
 
         res = self._delete(self._url(url), params={'TeamId': team_id})
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def put_tenant_quota(self, tenant, limit_cpu=None, limit_memory=None):
         """
@@ -541,7 +541,7 @@ class AccountApiMixin(AccessKeyApiMixin,
         url = '/accounts/{0}'.format(account)
 
         res = self._delete(self._url(url))
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def list_account_tenant(self, account, iter=False, limit=None):
         """
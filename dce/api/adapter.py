@@ -0,0 +1,89 @@
+# coding=utf-8
+import socket
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.connection import HTTPConnection
+
+from ..consts import (
+    DEFAULT_TCP_KEEPALIVE_IDLE, DEFAULT_TCP_KEEPALIVE_INTERVAL,
+    DEFAULT_TCP_KEEPALIVE_COUNT
+)
+
+
+def keepalive_socket_options(idle=DEFAULT_TCP_KEEPALIVE_IDLE,
+                             interval=DEFAULT_TCP_KEEPALIVE_INTERVAL,
+                             count=DEFAULT_TCP_KEEPALIVE_COUNT):
+    """
+    Get the socket options enabling TCP keep-alive, the options
+    which are not supported by current platform are skipped.
+
+    :param idle: the seconds of idle before sending keep-alive probes.
+    :param interval: the seconds between keep-alive probes.
+    :param count: the number of failed probes before dropping connection.
+
+    :return: a list of socket options.
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # TCP_KEEPALIVE is the name of TCP_KEEPIDLE on macOS
+    idle_option = getattr(socket, 'TCP_KEEPIDLE',
+                          getattr(socket, 'TCP_KEEPALIVE', None))
+    for option, value in ((idle_option, idle),
+                          (getattr(socket, 'TCP_KEEPINTVL', None), interval),
+                          (getattr(socket, 'TCP_KEEPCNT', None), count)):
+        if option is not None and value is not None:
+            options.append((socket.IPPROTO_TCP, option, value))
+    return options
+
+
+class DCEHTTPAdapter(HTTPAdapter):
+    """
+    A :class:`requests.adapters.HTTPAdapter` with configurable socket
+    options, which reports the usage of its connection pools.
+    """
+    __attrs__ = HTTPAdapter.__attrs__ + ['socket_options']
+
+    def __init__(self, socket_options=None, **kwargs):
+        """
+        :param socket_options: the socket options of new connections,
+                               extending the default options of urllib3.
+        :param kwargs: the arguments of `HTTPAdapter`, including
+                       `pool_connections`, `pool_maxsize`, `pool_block`
+                       and `max_retries`.
+        """
+        self.socket_options = socket_options
+        super(DCEHTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options:
+            kwargs['socket_options'] = (
+                HTTPConnection.default_socket_options + list(self.socket_options)
+            )
+        super(DCEHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+    def pool_stats(self):
+        """
+        Get the usage of connection pools.
+
+        :return: a dict keyed by `scheme://host:port`, values are dicts
+                 including `Connections`, the number of connections opened,
+                 `Requests`, the number of requests sent, `Idle`, the number
+                 of idle connections in pool and `MaxSize`.
+        """
+        stats = {}
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            queue = pool.pool
+            # the free slots of pool are filled with None
+            idle = 0
+            if queue is not None:
+                idle = sum(1 for conn in list(queue.queue) if conn is not None)
+            stats['{0}://{1}:{2}'.format(pool.scheme, pool.host, pool.port)] = {
+                'Connections': pool.num_connections,
+                'Requests': pool.num_requests,
+                'Idle': idle,
+                'MaxSize': queue.maxsize if queue is not None else 0
+            }
+        return stats
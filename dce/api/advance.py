@@ -1,104 +1,257 @@
 # coding=utf-8
-import json as to_json
+import threading
+from contextlib import contextmanager
 
+from ..consts import (
+    DEFAULT_BATCH_WORKERS, DEFAULT_EXPORT_CHUNK_SIZE, STREAM_CHUNK_SIZE_BYTES
+)
+from ..utils.export import export_records
+from ..utils.jsonstream import iter_json_array
+from .batch import Batch, BatchMixin
+from .crawler import CrawlerMixin
+from .inventory import InventoryMixin
+from .search import SearchIndexMixin
+from .tagcheck import TagCheckMixin
 
-def json_loads(text, **kwargs):
-    from requests.utils import guess_json_utf
 
-    encoding = guess_json_utf(text)
-    if encoding is not None:
-        try:
-            return to_json.loads(text.decode(encoding).strip(',\n\t '), **kwargs)
-        except UnicodeDecodeError:
-            pass
+class StreamStats(object):
+    """
+    Counters of iterated listings which were released before their
+    whole body was read.
+    """
 
-    return to_json.loads(text, **kwargs)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.early_releases = 0
+        self.bytes_avoided = 0
 
+    def record(self, content_length, bytes_read):
+        """
+        Record an early released response.
 
-class IterResult(object):
-    def _advanced_get(self, url, **kwargs):
-        kwargs.setdefault('stream', True)
+        :param content_length: the length of body, None if unknown.
+        :param bytes_read: the number of bytes read from the body.
+        """
+        with self._lock:
+            self.early_releases += 1
+            if content_length is not None:
+                self.bytes_avoided += max(content_length - bytes_read, 0)
 
-        return self._request('GET', url, **kwargs)
+    def __repr__(self):
+        return '<StreamStats early_releases={0} bytes_avoided={1}>'.format(
+            self.early_releases, self.bytes_avoided
+        )
 
-    @staticmethod
-    def __get_result(response, limit=None, json=False):
 
-        if limit is not None and not isinstance(limit, int):
-            raise TypeError(
-                "'limit' got an unexpected type: {0}, expected int or None".format(
-                    limit
-                )
+def _content_length(headers):
+    try:
+        return int(headers['Content-Length'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _release(response, stats, consumed):
+    if not consumed and stats is not None:
+        raw = response.raw
+        stats.record(_content_length(response.headers),
+                     raw.tell() if hasattr(raw, 'tell') else 0)
+    # release connection
+    response.close()
+
+
+def iter_result(response, limit=None, json=False, stats=None):
+    if limit is not None and not isinstance(limit, int):
+        raise TypeError(
+            "'limit' got an unexpected type: {0}, expected int or None".format(
+                limit
             )
+        )
 
-        def iter_object():
-            record = 0
-            start = False
-            container = []
-            for line in response.iter_lines():
-                if '{' in line:
-                    start = True
-                    record += 1
-                elif '}' in line:
-                    record -= 1
-                if start:
-                    container.append(line)
-                    if record == 0:
-                        if json:
-                            yield json_loads(''.join(container))
-                        else:
-                            yield ''.join(container)
-                        start = False
-                        container = []
-        if limit:
-            count = 1
-            for object_ in iter_object():
-                if limit >= count:
-                    yield object_
-                    count += 1
-        else:
-            for object_ in iter_object():
+    chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE_BYTES)
+    released = False
+    try:
+        for count, object_ in enumerate(iter_json_array(chunks, json=json), 1):
+            if limit and count >= limit:
+                # stop reading the body before handing out the last object
+                _release(response, stats, consumed=False)
+                released = True
                 yield object_
-        # release connection
-        response.close()
+                return
+            yield object_
+        _release(response, stats, consumed=True)
+        released = True
+    finally:
+        if not released:
+            _release(response, stats, consumed=False)
+
+
+class IterResult(object):
+    @contextmanager
+    def _iter_options(self, **options):
+        """
+        Set options of the iterated listings requested by current thread
+        within the context, e.g. extra query `params`.
+        """
+        local = self.__dict__.setdefault('_iter_local', threading.local())
+        previous = getattr(local, 'options', {})
+        local.options = dict(previous, **options)
+        try:
+            yield
+        finally:
+            local.options = previous
+
+    def _current_iter_options(self):
+        local = self.__dict__.get('_iter_local')
+        return getattr(local, 'options', {})
+
+    def _advanced_get(self, url, **kwargs):
+        kwargs.setdefault('stream', True)
+        params = self._current_iter_options().get('params')
+        if params:
+            kwargs['params'] = dict(kwargs.get('params') or {}, **params)
+
+        return self._request('GET', url, **kwargs)
 
     def _advanced_result(self, response, iter=True, limit=None, json=False):
         self._raise_for_status(response)
-        result = self.__get_result(response, limit=limit, json=json)
+        options = self._current_iter_options()
+        model = options.get('model')
+        result = iter_result(response, limit=limit,
+                             json=json and model is None and
+                             not options.get('raw'),
+                             stats=getattr(self, 'stream_stats', None))
+        if model is not None:
+            result = (model(raw) for raw in result)
 
         return result if iter else list(result)
 
+    def models(self, model):
+        """
+        Make the iterated listings requested by current thread within
+        the context yield models decoded lazily from the raw JSON of
+        objects, instead of dicts::
+
+            with client.models(Repository):
+                for repository in client.list_registry_namespaced_repository(
+                        registry, namespace, iter=True):
+                    print(repository.name)
+
+        :param model: a subclass of :class:`dce.models.Model`.
+        """
+        return self._iter_options(model=model)
+
+    def export(self, path, method, *args, **kwargs):
+        """
+        Stream an iterated listing into a file, chunk by chunk::
+
+            client.export('repositories.parquet',
+                          client.list_registry_namespaced_repository,
+                          registry, namespace)
+
+        The objects of listing are piped into the file as they are read
+        from the response, so memory stays constant whatever the size of
+        listing. The NDJSON format writes the raw JSON of objects without
+        decoding them.
+
+        :param path: the path of file.
+        :param method: an API method supporting `iter=True`.
+        :param args: the positional arguments of method.
+        :param kwargs: the keyword arguments of method, and `format`,
+                       `columns` and `chunk_size` of export, see
+                       :func:`dce.utils.export.export_records`.
+
+        :return: the number of objects written.
+        """
+        format = kwargs.pop('format', None)
+        columns = kwargs.pop('columns', None)
+        chunk_size = kwargs.pop('chunk_size', DEFAULT_EXPORT_CHUNK_SIZE)
+        kwargs['iter'] = True
+
+        with self._iter_options(raw=True):
+            records = method(*args, **kwargs)
+            return export_records(records, path, format=format,
+                                  columns=columns, chunk_size=chunk_size)
+
 
 class CreateAccountWithTTRN(object):
     def create_account_with_ttrn(self, name=None, email=None,
                                  password=None, is_admin='False',
                                  registry='buildin-registry',
-                                 limit_cpu=0, limit_memory=0):
-        self.create_account(
-            name=name,
-            email=email,
-            password=password,
-            is_admin=is_admin
+                                 limit_cpu=0, limit_memory=0,
+                                 max_workers=DEFAULT_BATCH_WORKERS):
+        """
+        Create account with its own team, tenant and registry namespace.
+
+        The team, tenant and registry namespace are created concurrently
+        once the account exists, and if any step fails, the created
+        resources are deleted.
+
+        :param name: the name of account, team, tenant and namespace.
+        :param email: the email of account.
+        :param password: the password of account.
+        :param is_admin: is the account an administrator.
+        :param registry: the name of registry.
+        :param limit_cpu: the cpu limit of tenant, integer or float.
+        :param limit_memory: the memory limit of tenant, integer.
+        :param max_workers: the maximum number of steps executed concurrently.
+
+        :return: a dict including `Account`, `Team`, `Tenant`
+                 and `RegistryNamespace` fields.
+
+        :raise APIError: if server returns an error.
+        """
+        batch = Batch(max_workers=max_workers, rollback=True)
+
+        account = batch.add(
+            self.create_account, name=name, email=email,
+            password=password, is_admin=is_admin,
+            undo=lambda _: self.delete_account(name)
+        )
+        team = batch.add(
+            self.create_team, name, depends_on=[account],
+            undo=lambda team_: self.delete_team(team_['Id'])
         )
-        team = to_json.loads(self.create_team(name))
-        tenant = to_json.loads(self.create_tenant(name))
-        registry_namespace = to_json.loads(
-            self.create_registry_namespace(registry, name=name)
+        tenant = batch.add(
+            self.create_tenant, name, depends_on=[account],
+            undo=lambda tenant_: self.delete_tenant(tenant_['Name'])
         )
+        registry_namespace = batch.add(
+            self.create_registry_namespace, registry, name=name,
+            depends_on=[account],
+            undo=lambda namespace: self.delete_registry_namespace(
+                registry, namespace['Name']
+            )
+        )
+
+        batch.add(self.add_team_member, team['Id'], name=name)
+        if limit_cpu or limit_memory:
+            batch.add(self.put_tenant_quota, tenant['Name'],
+                      limit_cpu=limit_cpu, limit_memory=limit_memory)
+        authorization = batch.add(
+            self.authorize_team_for_registry_namespace,
+            registry, registry_namespace['Name'],
+            team_id=team['Id'], role='full_control'
+        )
+        batch.add(self.patch_registry_namespace,
+                  registry, registry_namespace['Name'],
+                  visibility='False', depends_on=[authorization])
+
+        batch.run()
+        batch.raise_for_errors()
 
-        if team:
-            team['Members'].append(name)
-            self.add_team_member(team['Id'], name=name)
-        if tenant and not (limit_cpu or limit_memory):
-            self.put_tenant_quota(tenant['Name'], limit_cpu=limit_cpu,
-                                  limit_memory=limit_memory)
-        if registry_namespace and team:
-            self.authorize_team_for_registry_namespace(registry, registry_namespace['Name'],
-                                                       team_id=team['Id'], role='full_control')
-            self.patch_registry_namespace(registry, registry_namespace['Name'],
-                                          visibility='False')
+        return {
+            'Account': account.result,
+            'Team': team.result,
+            'Tenant': tenant.result,
+            'RegistryNamespace': registry_namespace.result
+        }
 
 
 class AdvancedMethodMixin(IterResult,
+                          BatchMixin,
+                          InventoryMixin,
+                          CrawlerMixin,
+                          SearchIndexMixin,
+                          TagCheckMixin,
                           CreateAccountWithTTRN):
     pass
@@ -0,0 +1,374 @@
+# coding=utf-8
+import asyncio
+
+import aiohttp
+from semantic_version import Version
+
+from .compat import urlparse
+from ..consts import (
+    DEFAULT_TIMEOUT_SECONDS, DEFAULT_CONNECT_TIMEOUT_SECONDS,
+    DEFAULT_USER_AGENT,
+    DEFAULT_ASYNC_POOL_SIZE, DEFAULT_BATCH_WORKERS, MINIMUM_DCE_VERSION,
+    STREAM_CHUNK_SIZE_BYTES
+)
+from ..errors import (
+    BatchDependencyError, DCEException, InvalidVersion
+)
+from ..utils.jsonstream import JSONArrayParser
+from .advance import StreamStats
+from .batch import Batch, _resolve
+from .registry import RegistryApiMixin
+from .account import AccountApiMixin
+from .plugin import PluginApiMixin
+from .base import (
+    BaseClientMixin, build_response, decode_result,
+    normalize_base_url, raise_for_status
+)
+
+
+class AsyncBatch(Batch):
+    """
+    Execute many awaitable operations concurrently on the event loop,
+    see :class:`Batch`.
+
+    Usage::
+
+        async with client.batch(max_workers=64) as batch:
+            team = batch.add(client.create_team, name)
+            batch.add(client.add_team_member, team['Id'], name=name)
+    """
+
+    async def _execute(self, item, tasks, semaphore):
+        for dependency in item.dependencies:
+            if dependency in tasks:
+                await tasks[dependency]
+
+        failed = [d for d in item.dependencies if not d.ok]
+        if failed:
+            item.error = BatchDependencyError(
+                'Skipped since the dependencies {0} failed'.format(failed)
+            )
+        else:
+            async with semaphore:
+                try:
+                    item.result = await item.fn(*_resolve(item.args),
+                                                **_resolve(item.kwargs))
+                    self._completed.append(item)
+                except Exception as e:
+                    item.error = e
+        item.done = True
+
+    async def _rollback(self):
+        while self._completed:
+            item = self._completed.pop()
+            if item.undo is None:
+                continue
+            try:
+                await item.undo(item.result)
+                item.rolled_back = True
+            except Exception as e:
+                self.rollback_errors.append((item, e))
+
+    async def run(self):
+        """
+        Execute the operations which are not executed yet.
+
+        :return: a list of all items, in the order they were added.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        tasks = {}
+        for item in self.items:
+            if not item.done:
+                tasks[item] = asyncio.ensure_future(
+                    self._execute(item, tasks, semaphore)
+                )
+        await asyncio.gather(*tasks.values())
+
+        if self.rollback and self.errors:
+            await self._rollback()
+
+        return self.items
+
+    def __enter__(self):
+        raise TypeError('Use `async with` instead')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.run()
+
+
+def _encode_params(params):
+    """
+    Encode query params the way `requests` does: drop `None` values and
+    expand lists into repeated keys.
+    """
+    if not params:
+        return None
+
+    encoded = []
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            encoded.extend((key, str(v)) for v in value)
+        else:
+            encoded.append((key, str(value)))
+    return encoded
+
+
+class AsyncAPIClient(RegistryApiMixin,
+                     AccountApiMixin,
+                     PluginApiMixin,
+                     BaseClientMixin):
+    """
+    An asyncio client exposing the same API methods as :class:`APIClient`,
+    every method returns an awaitable instead of the result.
+
+    The versions are retrieved when the client is opened, so it must be
+    used as an async context manager or opened explicitly::
+
+        async with AsyncAPIClient(base_url, username, password) as client:
+            accounts = await client.list_account()
+
+    With `iter=True` listing methods return an async generator.
+    """
+
+    def __init__(self, base_url=None, username=None, password=None,
+                 token=None, timeout=DEFAULT_TIMEOUT_SECONDS,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT_SECONDS,
+                 user_agent=DEFAULT_USER_AGENT,
+                 pool_size=DEFAULT_ASYNC_POOL_SIZE, pool_size_per_host=0,
+                 check_resources=True):
+        self.base_url = normalize_base_url(base_url)
+        self.check_resources = check_resources
+
+        self.auth = None
+        if username and password:
+            self.auth = aiohttp.BasicAuth(username, password)
+
+        # like the requests of `APIClient`, the read timeout applies to
+        # each read rather than to the whole response, so that long
+        # iterated listings aren't cut off
+        if isinstance(timeout, (tuple, list)):
+            connect_timeout, timeout = timeout
+        self.timeout = (connect_timeout, timeout)
+        self.host = urlparse(self.base_url).hostname
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+
+        self.headers = {'User-Agent': user_agent}
+        if token:
+            self.headers['X-DCE-Access-Token'] = token
+
+        self._session = None
+        self._versions = None
+        self._info = None
+        self.stream_stats = StreamStats()
+
+    async def open(self):
+        """
+        Create the pooled session and retrieve the versions of DCE.
+
+        :return: the client itself.
+
+        :raise InvalidVersion: if the version of DCE is not supported.
+        :raise APIError: if server returns an error.
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size_per_host,
+                ssl=False
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                auth=self.auth,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=self.timeout[0],
+                    sock_read=self.timeout[1]
+                )
+            )
+
+        if self._versions is None:
+            self._prefix, self._versions = await self._retrieve_versions_prefix()
+            self._parsed_dce_version = Version(self.dce_version)
+            if self._parsed_dce_version < Version(MINIMUM_DCE_VERSION):
+                raise InvalidVersion(
+                    'DCE Version {} < {} is not supported'.format(
+                        self.dce_version, MINIMUM_DCE_VERSION)
+                )
+
+        return self
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _retrieve_versions_prefix(self):
+        prefix = 'dce'
+        try:
+            versions = await self._version(prefix=prefix)
+        except Exception:
+            prefix = 'api'
+            versions = await self._version(prefix=prefix)
+
+        return prefix, versions
+
+    def _version(self, prefix='dce'):
+        self._prefix = prefix
+
+        return self._result(self._get(self._url('/version')), json=True)
+
+    def _url(self, path, *args, **kwargs):
+        if self._prefix is None:
+            raise DCEException(
+                '{0!r} is not opened, use `await client.open()` or '
+                '`async with` first'.format(self)
+            )
+        return super(AsyncAPIClient, self)._url(path, *args, **kwargs)
+
+    async def _request(self, method, url, params=None, **kwargs):
+        if self._session is None:
+            raise DCEException('{0!r} is closed'.format(self))
+
+        async with self._session.request(
+                method, url, params=_encode_params(params), **kwargs
+        ) as response:
+            content = await response.read()
+
+        return build_response(
+            str(response.url), response.status, response.headers, content,
+            reason=response.reason, encoding=response.charset
+        )
+
+    def _post(self, url, **kwargs):
+        return self._request('POST', url, **kwargs)
+
+    def _get(self, url, **kwargs):
+        return self._request('GET', url, **kwargs)
+
+    def _put(self, url, **kwargs):
+        return self._request('PUT', url, **kwargs)
+
+    def _patch(self, url, **kwargs):
+        return self._request('PATCH', url, **kwargs)
+
+    def _delete(self, url, **kwargs):
+        return self._request('DELETE', url, **kwargs)
+
+    @staticmethod
+    async def _raise_for_status(response):
+        raise_for_status(await response)
+
+    async def _result(self, response, json=False, binary=False):
+        return decode_result(await response, json=json, binary=binary)
+
+    async def _advanced_get(self, url, params=None, **kwargs):
+        if self._session is None:
+            raise DCEException('{0!r} is closed'.format(self))
+
+        return await self._session.request(
+            'GET', url, params=_encode_params(params), **kwargs
+        )
+
+    def _advanced_result(self, response, iter=True, limit=None, json=False):
+        result = self._iter_result(response, limit=limit, json=json)
+
+        return result if iter else self._collect(result)
+
+    async def _iter_result(self, response, limit=None, json=False):
+        if limit is not None and not isinstance(limit, int):
+            raise TypeError(
+                "'limit' got an unexpected type: {0}, expected int or None".format(
+                    limit
+                )
+            )
+
+        response = await response
+        consumed = False
+        bytes_read = 0
+        try:
+            if response.status >= 400:
+                consumed = True
+                content = await response.read()
+                raise_for_status(build_response(
+                    str(response.url), response.status, response.headers,
+                    content, reason=response.reason, encoding=response.charset
+                ))
+
+            count = 0
+            parser = JSONArrayParser(json=json)
+            async for chunk in response.content.iter_chunked(
+                    STREAM_CHUNK_SIZE_BYTES):
+                bytes_read += len(chunk)
+                for object_ in parser.feed(chunk):
+                    count += 1
+                    if limit and count >= limit:
+                        # stop reading the body before handing out
+                        # the last object
+                        response.close()
+                        yield object_
+                        return
+                    yield object_
+            for object_ in parser.close():
+                count += 1
+                yield object_
+                if limit and count >= limit:
+                    break
+            consumed = True
+        finally:
+            if not consumed:
+                self.stream_stats.record(response.content_length, bytes_read)
+            # release connection
+            response.release()
+
+    @staticmethod
+    async def _collect(result):
+        return [object_ async for object_ in result]
+
+    def batch(self, max_workers=DEFAULT_BATCH_WORKERS, rollback=False):
+        """
+        Create a batch of operations, executed when leaving the context.
+
+        :param max_workers: the maximum number of operations
+                            awaited concurrently.
+        :param rollback: if `True`, undo the succeeded operations
+                         when any operation fails, `undo` callbacks
+                         must return awaitables.
+
+        :return: an :class:`AsyncBatch`.
+        """
+        return AsyncBatch(max_workers=max_workers, rollback=rollback)
+
+    @property
+    def dce_version(self):
+        if self._versions is None:
+            return None
+        return self._versions.get('DCEVersion')
+
+    async def info(self):
+        if self._info is None:
+            self._info = await self._result(
+                self._get(self._url('/info')), json=True
+            )
+        return self._info
+
+    async def ping(self):
+        return await self._result(self._get(self._url('/ping')))
+
+    async def now(self):
+        return await self._result(self._get(self._url('/now')), json=True)
+
+    def __repr__(self):
+        return "<AsyncDCEClient '%s'>" % self.host
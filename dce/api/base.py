@@ -0,0 +1,96 @@
+# coding=utf-8
+import six
+import requests
+from functools import partial
+from requests.structures import CaseInsensitiveDict
+
+from .compat import quote_plus, urlparse
+from ..errors import create_api_error_from_http_exception
+
+
+def normalize_base_url(base_url):
+    if base_url.endswith('/'):
+        base_url = base_url[:-1]
+    if not base_url.startswith('http://') or base_url.startswith('https://'):
+        base_url = 'http://' + base_url
+    return base_url
+
+
+def raise_for_status(response):
+    """Raises stored :class:`APIError`, if one occurred."""
+    try:
+        response.raise_for_status()
+    except requests.exceptions.HTTPError as e:
+        raise create_api_error_from_http_exception(e)
+
+
+def decode_result(response, json=False, binary=False):
+    assert not (json and binary)
+    raise_for_status(response)
+
+    if json:
+        return response.json()
+    if binary:
+        return response.content
+    return response.text
+
+
+def build_response(url, status_code, headers, content,
+                   reason=None, encoding=None):
+    """
+    Build a fully consumed :class:`requests.Response`, so that responses
+    which are not received by `requests` can share the same result and
+    error handling.
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.reason = reason
+    response.encoding = encoding
+    response._content = content
+    response._content_consumed = True
+
+    return response
+
+
+class BaseClientMixin(object):
+    """
+    The transport independent part of DCE clients.
+    """
+    base_url = None
+    _prefix = None
+    check_resources = True
+
+    @staticmethod
+    def _raise_for_status(response):
+        """Raises stored :class:`APIError`, if one occurred."""
+        raise_for_status(response)
+
+    def _result(self, response, json=False, binary=False):
+        return decode_result(response, json=json, binary=binary)
+
+    def _url(self, path, *args, **kwargs):
+        for arg in args:
+            if not isinstance(arg, six.string_types):
+                raise ValueError(
+                    'Expected a string but found {0} ({1}) '
+                    'instead'.format(arg, type(arg))
+                )
+
+        quote_f = partial(quote_plus, safe="/:")
+        args = [quote_f(arg) for arg in args]
+
+        return '{0}/{1}{2}'.format(
+            self.base_url, self._prefix, path.format(*args, **kwargs)
+        )
+
+    def _path(self, url):
+        """
+        Get the path of API method from given url, e.g. `/accounts/foo`.
+        """
+        url = url.split('?', 1)[0]
+        root = '{0}/{1}'.format(self.base_url, self._prefix)
+        if url.startswith(root):
+            return url[len(root):]
+        return urlparse(url).path
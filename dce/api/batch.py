@@ -0,0 +1,281 @@
+# coding=utf-8
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ..consts import DEFAULT_BATCH_WORKERS
+from ..errors import BatchDependencyError
+from .deadline import current_deadline, deadline_scope, without_deadline
+
+
+class ItemRef(object):
+    """
+    A reference to a part of the result of :class:`BatchItem`,
+    e.g. `team['Id']`, resolved when the dependent item is executed.
+    """
+
+    def __init__(self, item, keys=()):
+        self.item = item
+        self.keys = keys
+
+    def __getitem__(self, key):
+        return ItemRef(self.item, self.keys + (key,))
+
+    def resolve(self):
+        value = self.item.result
+        for key in self.keys:
+            value = value[key]
+        return value
+
+
+class BatchItem(object):
+    """
+    An operation of :class:`Batch`, holding its result or error
+    once executed.
+    """
+
+    def __init__(self, batch, index, fn, args, kwargs, dependencies,
+                 undo=None):
+        self.batch = batch
+        self.index = index
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.dependencies = dependencies
+        self.dependents = []
+        self.undo = undo
+        self.result = None
+        self.error = None
+        self.done = False
+        self.rolled_back = False
+
+    @property
+    def ok(self):
+        return self.done and self.error is None
+
+    def __getitem__(self, key):
+        return ItemRef(self)[key]
+
+    def __repr__(self):
+        state = 'pending'
+        if self.done:
+            state = 'ok' if self.ok else 'failed'
+        return '<BatchItem #{0} {1} {2}>'.format(
+            self.index, getattr(self.fn, '__name__', self.fn), state
+        )
+
+
+def _references(value):
+    if isinstance(value, (BatchItem, ItemRef)):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if isinstance(v, (BatchItem, ItemRef))]
+    if isinstance(value, dict):
+        return [v for v in value.values() if isinstance(v, (BatchItem, ItemRef))]
+    return []
+
+
+def _resolve(value):
+    if isinstance(value, BatchItem):
+        return value.result
+    if isinstance(value, ItemRef):
+        return value.resolve()
+    if isinstance(value, (list, tuple)):
+        return type(value)(_resolve(v) for v in value)
+    if isinstance(value, dict):
+        return dict((k, _resolve(v)) for k, v in value.items())
+    return value
+
+
+class Batch(object):
+    """
+    Execute many operations on a bounded thread pool.
+
+    An operation runs once all the operations it depends on succeeded,
+    the dependencies are given by `depends_on` or by passing items, or
+    parts of their results, as arguments. An operation whose dependency
+    failed is skipped with :class:`BatchDependencyError`.
+
+    With `rollback=True`, if any operation fails, the `undo` callbacks
+    of the succeeded operations are called in the reverse order of their
+    completion, even if the deadline has passed.
+
+    The operations run under the deadline of the thread calling `run`,
+    see :func:`dce.api.deadline.deadline`.
+
+    Usage::
+
+        with client.batch(max_workers=16) as batch:
+            for name in names:
+                team = batch.add(client.create_team, name)
+                batch.add(client.add_team_member, team['Id'], name=name)
+        for item in batch.items:
+            print(item.result, item.error)
+    """
+
+    def __init__(self, max_workers=DEFAULT_BATCH_WORKERS, rollback=False):
+        """
+        :param max_workers: the maximum number of operations
+                            executed concurrently.
+        :param rollback: if `True`, undo the succeeded operations
+                         when any operation fails.
+        """
+        self.max_workers = max_workers
+        self.rollback = rollback
+        self.items = []
+        self.rollback_errors = []
+        self._completed = []
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+
+    def add(self, fn, *args, **kwargs):
+        """
+        Add an operation.
+
+        :param fn: a callable, e.g. `client.create_team`.
+        :param args: the positional arguments of `fn`.
+        :param depends_on: a list of items that must succeed before
+                           executing the operation.
+        :param undo: a callable reverting the operation, called with
+                     its result when the batch is rolled back.
+        :param kwargs: the keyword arguments of `fn`.
+
+        :return: a :class:`BatchItem`.
+
+        :raise ValueError: if a dependency is not an item of the batch.
+        """
+        depends_on = list(kwargs.pop('depends_on', None) or ())
+        undo = kwargs.pop('undo', None)
+        for value in list(args) + list(kwargs.values()):
+            depends_on.extend(_references(value))
+
+        dependencies = []
+        for dependency in depends_on:
+            if isinstance(dependency, ItemRef):
+                dependency = dependency.item
+            if dependency.batch is not self:
+                raise ValueError(
+                    '{0!r} is not an item of the batch'.format(dependency)
+                )
+            if dependency not in dependencies:
+                dependencies.append(dependency)
+
+        item = BatchItem(self, len(self.items), fn, args, kwargs,
+                         dependencies, undo=undo)
+        for dependency in dependencies:
+            dependency.dependents.append(item)
+        self.items.append(item)
+        return item
+
+    def _execute(self, item):
+        try:
+            with deadline_scope(self._deadline):
+                item.result = item.fn(*_resolve(item.args),
+                                      **_resolve(item.kwargs))
+        except Exception as e:
+            item.error = e
+        self._complete(item)
+
+    def _complete(self, item):
+        ready = []
+        with self._lock:
+            item.done = True
+            if item.error is None:
+                self._completed.append(item)
+            self._remaining -= 1
+            for dependent in item.dependents:
+                self._waiting[dependent] -= 1
+                if self._waiting[dependent] == 0:
+                    ready.append(dependent)
+            self._finished.notify_all()
+        for dependent in ready:
+            self._schedule(dependent)
+
+    def _schedule(self, item):
+        failed = [d for d in item.dependencies if not d.ok]
+        if failed:
+            item.error = BatchDependencyError(
+                'Skipped since the dependencies {0} failed'.format(failed)
+            )
+            self._complete(item)
+        else:
+            self._executor.submit(self._execute, item)
+
+    def run(self):
+        """
+        Execute the operations which are not executed yet.
+
+        :return: a list of all items, in the order they were added.
+        """
+        pending = [item for item in self.items if not item.done]
+        if not pending:
+            return self.items
+
+        self._remaining = len(pending)
+        self._waiting = dict(
+            (item, sum(1 for d in item.dependencies if not d.done))
+            for item in pending
+        )
+        ready = [item for item in pending if self._waiting[item] == 0]
+        # the workers run under the deadline of caller
+        self._deadline = current_deadline()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._executor = executor
+            for item in ready:
+                self._schedule(item)
+            with self._lock:
+                while self._remaining:
+                    self._finished.wait()
+        self._executor = None
+
+        if self.rollback and self.errors:
+            self._rollback()
+
+        return self.items
+
+    def _rollback(self):
+        with without_deadline():
+            while self._completed:
+                item = self._completed.pop()
+                if item.undo is None:
+                    continue
+                try:
+                    item.undo(item.result)
+                    item.rolled_back = True
+                except Exception as e:
+                    self.rollback_errors.append((item, e))
+
+    def raise_for_errors(self):
+        """
+        Raise the error of the first failed operation, the operations
+        skipped because of it are ignored.
+        """
+        for item in self.items:
+            if item.error is not None and \
+                    not isinstance(item.error, BatchDependencyError):
+                raise item.error
+
+    @property
+    def errors(self):
+        return [item for item in self.items if item.error is not None]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.run()
+
+
+class BatchMixin(object):
+    def batch(self, max_workers=DEFAULT_BATCH_WORKERS, rollback=False):
+        """
+        Create a batch of operations, executed when leaving the context.
+
+        :param max_workers: the maximum number of operations
+                            executed concurrently.
+        :param rollback: if `True`, undo the succeeded operations
+                         when any operation fails.
+
+        :return: a :class:`Batch`.
+        """
+        return Batch(max_workers=max_workers, rollback=rollback)
@@ -0,0 +1,162 @@
+# coding=utf-8
+import time
+import threading
+from collections import deque
+
+from ..consts import (
+    DEFAULT_BREAKER_FAILURE_RATE, DEFAULT_BREAKER_WINDOW,
+    DEFAULT_BREAKER_MIN_CALLS, DEFAULT_BREAKER_RESET_TIMEOUT,
+    DEFAULT_BREAKER_HALF_OPEN_PROBES
+)
+from ..errors import CircuitOpenError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker(object):
+    """
+    Fail fast while DCE is unavailable.
+
+    The breaker opens when the failure rate of the last `window` calls
+    reaches `failure_rate`, then the calls raise :class:`CircuitOpenError`
+    immediately. After `reset_timeout` seconds it half-opens, letting
+    `half_open_probes` calls through, and closes if they all succeed or
+    opens again if any fails.
+
+    The connection errors, timeouts and `5xx` responses are failures,
+    the other errors raised by the client don't count.
+    """
+
+    def __init__(self, failure_rate=DEFAULT_BREAKER_FAILURE_RATE,
+                 window=DEFAULT_BREAKER_WINDOW,
+                 min_calls=DEFAULT_BREAKER_MIN_CALLS,
+                 reset_timeout=DEFAULT_BREAKER_RESET_TIMEOUT,
+                 half_open_probes=DEFAULT_BREAKER_HALF_OPEN_PROBES):
+        """
+        :param failure_rate: the rate of failed calls opening the breaker.
+        :param window: the number of recent calls the rate is computed on.
+        :param min_calls: the minimum number of calls in window before
+                          the breaker can open.
+        :param reset_timeout: the seconds before an open breaker half-opens.
+        :param half_open_probes: the number of probe calls of a half-open
+                                 breaker.
+        """
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = None
+        self._probes = 0
+        self._probe_successes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and \
+                    time.time() >= self._opened_at + self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.time()
+        self._probes = 0
+        self._probe_successes = 0
+        self.opened += 1
+
+    def _close(self):
+        self._state = CLOSED
+        self._opened_at = None
+        self._calls.clear()
+
+    def before_call(self):
+        """
+        :raise CircuitOpenError: if the call is not allowed.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+
+            if self._state == OPEN:
+                retry_after = self._opened_at + self.reset_timeout - time.time()
+                if retry_after > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        'Circuit breaker is open, retry after {0:.1f}s'.format(
+                            retry_after
+                        ), retry_after=retry_after
+                    )
+                self._state = HALF_OPEN
+
+            if self._probes >= self.half_open_probes:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    'Circuit breaker is half-open, waiting for probes',
+                    retry_after=0
+                )
+            self._probes += 1
+
+    def record(self, success):
+        """
+        Record the result of an allowed call.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if not success:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._close()
+                return
+
+            if self._state != CLOSED:
+                # a call started before the breaker opened
+                return
+            self._calls.append(success)
+            if len(self._calls) >= self.min_calls:
+                failures = self._calls.count(False)
+                if failures >= self.failure_rate * len(self._calls):
+                    self._open()
+
+    def release(self):
+        """
+        Release an allowed call whose result tells nothing about DCE,
+        e.g. it failed before being sent or was interrupted, so that
+        a half-open breaker lets another probe through.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def reset(self):
+        with self._lock:
+            self._close()
+
+    def stats(self):
+        """
+        :return: a dict including `State`, `FailureRate` of the calls in
+                 window, `Calls`, the number of calls in window, `Opened`,
+                 the number of times the breaker opened, and `Rejected`,
+                 the number of calls failed fast.
+        """
+        state = self.state
+        with self._lock:
+            calls = len(self._calls)
+            return {
+                'State': state,
+                'FailureRate': (
+                    float(self._calls.count(False)) / calls if calls else 0.0
+                ),
+                'Calls': calls,
+                'Opened': self.opened,
+                'Rejected': self.rejected
+            }
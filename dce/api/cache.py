@@ -0,0 +1,88 @@
+# coding=utf-8
+from ..consts import DEFAULT_RESPONSE_CACHE_SIZE
+from ..utils.cache import LRUCache
+from ..utils.utils import URLTemplateMap
+
+# the seconds responses of read endpoints are cached for,
+# keyed by the url templates of API methods.
+DEFAULT_CACHE_TTLS = {
+    '/info': 300,
+    '/my-account': 30,
+    '/accounts/{0}': 30,
+    '/teams/{0}': 30,
+    '/tenants/{0}': 30,
+    '/registries/{0}/info': 300,
+    '/registries/{0}/namespaces/{1}': 30,
+    '/extensions/{0}': 300,
+    '/plugins/{0}': 60,
+    '/builtin-plugins/{0}/settings': 60,
+    '/plugin-store/{0}': 300,
+}
+
+
+def _params_key(params):
+    if not params:
+        return ()
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in params.items()
+    ))
+
+
+def _is_related(cached_path, path):
+    return cached_path == path or \
+        cached_path.startswith(path + '/') or \
+        path.startswith(cached_path + '/')
+
+
+class ResponseCache(object):
+    """
+    A cache of the successful responses of GET endpoints.
+
+    Only the endpoints with a ttl are cached. A POST, PUT, PATCH or DELETE
+    request invalidates the responses of the same path, its sub paths and
+    its parent paths, e.g. `PATCH /accounts/foo` invalidates
+    `GET /accounts/foo` and `GET /accounts`.
+    """
+
+    def __init__(self, ttls=None, maxsize=DEFAULT_RESPONSE_CACHE_SIZE):
+        """
+        :param ttls: a dict mapping url templates of API methods,
+                     e.g. `/accounts/{0}`, to the seconds their responses
+                     are cached for, :data:`DEFAULT_CACHE_TTLS` if None.
+        :param maxsize: the maximum number of cached responses.
+        """
+        self.ttls = URLTemplateMap(DEFAULT_CACHE_TTLS if ttls is None else ttls)
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def get(self, path, params=None):
+        """
+        :return: the cached response, or None.
+        """
+        if self.ttls.get(path) is None:
+            return None
+        return self._cache.get((path, _params_key(params)))
+
+    def set(self, path, params, response):
+        ttl = self.ttls.get(path)
+        if ttl is None or response.status_code != 200:
+            return
+        self._cache.set((path, _params_key(params)), response, ttl=ttl)
+
+    def invalidate(self, path):
+        """
+        Invalidate the cached responses related to given path.
+
+        :return: the number of invalidated responses.
+        """
+        return self._cache.delete_matching(lambda key: _is_related(key[0], path))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        """
+        :return: a dict including `Hits`, `Misses`, `Evictions`,
+                 `Expirations` and `Size`.
+        """
+        return self._cache.stats()
@@ -1,65 +1,261 @@
 # coding=utf-8
 import six
+import time
+import functools
 import urllib3
 import requests
-from functools import partial
 from semantic_version import Version
 from requests.auth import HTTPBasicAuth
 from cached_property import cached_property
 
-from .compat import (
-    quote_plus, urlparse
-)
+from .compat import urlparse
 from ..consts import (
-    DEFAULT_TIMEOUT_SECONDS, DEFAULT_USER_AGENT,
+    DEFAULT_TIMEOUT_SECONDS, DEFAULT_CONNECT_TIMEOUT_SECONDS,
+    DEFAULT_USER_AGENT,
+    DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE,
     MINIMUM_DCE_VERSION
 )
-from ..errors import (
-    InvalidVersion, create_api_error_from_http_exception
-)
-from ..utils.decorators import minimum_version
-from .advance import AdvancedMethodMixin
+from ..errors import InvalidVersion
+from ..utils.decorators import minimum_version, resolve_version_gates
+from ..utils.utils import URLTemplateMap
+from .advance import AdvancedMethodMixin, StreamStats
 from .registry import RegistryApiMixin
 from .account import AccountApiMixin
 from .plugin import PluginApiMixin
+from .base import BaseClientMixin, normalize_base_url
+from .discovery import DiscoveryCache
+from .cache import ResponseCache
+from .retry import RetryPolicy, RETRYABLE_ERRORS
+from .limiter import EndpointLimiter
+from .breaker import CircuitBreaker
+from .deadline import (
+    check_deadline, clamp_timeout, current_deadline, deadline, remaining
+)
+from .hedge import HedgePolicy
+from .conditional import (
+    StoredResponse, MemoryValidatorStore, FileValidatorStore
+)
+from .adapter import DCEHTTPAdapter, keepalive_socket_options
 
 urllib3.disable_warnings()
 
 
+def _timeout_tuple(timeout, connect_timeout):
+    if isinstance(timeout, (tuple, list)):
+        return tuple(timeout)
+    return connect_timeout, timeout
+
+
 class APIClient(requests.Session,
                 AdvancedMethodMixin,
                 RegistryApiMixin,
                 AccountApiMixin,
-                PluginApiMixin):
+                PluginApiMixin,
+                BaseClientMixin):
     def __init__(self, base_url=None, username=None, password=None,
                  token=None, timeout=DEFAULT_TIMEOUT_SECONDS,
-                 user_agent=DEFAULT_USER_AGENT):
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT_SECONDS,
+                 timeouts=None, user_agent=DEFAULT_USER_AGENT, prefix=None,
+                 dce_version=None, lazy=False, discovery_cache=None,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 tcp_keepalive=False, cache=None, conditional=None,
+                 resolve_gates=False, check_resources=True, retry=None,
+                 limits=None, breaker=None, hedge=None):
+        """
+        :param timeout: the seconds waiting for the server to send data,
+                        or a tuple of connect and read timeouts.
+        :param connect_timeout: the seconds waiting for connecting to
+                                the server, unless `timeout` is a tuple.
+        :param timeouts: a dict mapping url templates of API methods to
+                         their timeouts, e.g. a longer read timeout for
+                         `/registries/{0}/repositories`.
+        :param prefix: the api prefix of DCE, `dce` or `api`,
+                       retrieved from server if None.
+        :param dce_version: the version of DCE,
+                            retrieved from server if None.
+        :param lazy: if `True`, the prefix and versions are retrieved
+                     on first use instead of in the constructor.
+        :param discovery_cache: a :class:`DiscoveryCache`, a path of cache
+                                file or `True` for the default path, which
+                                persists the retrieved prefix and versions.
+        :param pool_connections: the number of hosts to keep pools for.
+        :param pool_maxsize: the maximum number of connections kept in
+                             the pool of every host, should be no less than
+                             the number of threads sharing the client.
+        :param pool_block: if `True`, wait for a free connection instead of
+                           opening a connection that won't be pooled.
+        :param tcp_keepalive: if `True`, enable TCP keep-alive with default
+                              options, a dict including `idle`, `interval`
+                              and `count` customizes the options.
+        :param cache: a :class:`ResponseCache`, `True` for the default ttls
+                      or a dict mapping url templates to ttls, which caches
+                      the responses of read endpoints.
+        :param conditional: a :class:`ValidatorStore`, `True` for a store in
+                            memory or a path of directory for a store on
+                            disk, which keeps the ETag and Last-Modified of
+                            GET responses and replays their bodies when the
+                            server answers `304 Not Modified`.
+        :param resolve_gates: if `True`, the methods unavailable to the
+                              version of DCE are replaced by stubs once the
+                              version is known, see
+                              :func:`resolve_version_gates`.
+        :param check_resources: if `False`, skip checking the resources
+                                passed to API methods are not empty.
+        :param retry: a :class:`RetryPolicy`, `True` for the default policy
+                      or the maximum number of retries, which retries the
+                      requests failed transiently.
+        :param limits: an :class:`EndpointLimiter`, or a dict mapping url
+                       templates of API methods to their limits, which
+                       limits the rate and concurrency of requests.
+        :param breaker: a :class:`CircuitBreaker` or `True` for the default
+                        breaker, which fails requests fast with
+                        :class:`CircuitOpenError` while DCE is failing.
+        :param hedge: a :class:`HedgePolicy`, `True` for the default policy
+                      or a list of url templates of API methods, which
+                      duplicates the slow GET requests to these methods
+                      on fresh connections. A duplicate is sent only if
+                      the endpoint limits allow it immediately. A policy
+                      created by the client is shut down on close.
+
+        :raise InvalidVersion: if the version of DCE is not supported.
+        """
         super(APIClient, self).__init__()
 
-        if base_url.endswith('/'):
-            base_url = base_url[:-1]
-        if not base_url.startswith('http://') or base_url.startswith('https://'):
-            base_url = 'http://' + base_url
-        self.base_url = base_url
+        self.base_url = normalize_base_url(base_url)
 
         self.auth = None
         if username and password:
             self.auth = HTTPBasicAuth(username, password)
 
         self.verify = False
-        self.timeout = timeout
+        self.timeout = _timeout_tuple(timeout, connect_timeout)
+        self.timeouts = URLTemplateMap(dict(
+            (template, _timeout_tuple(value, connect_timeout))
+            for template, value in (timeouts or {}).items()
+        ))
         self.host = urlparse(self.base_url).hostname
 
+        self.stream_stats = StreamStats()
+
+        socket_options = None
+        if tcp_keepalive:
+            socket_options = keepalive_socket_options(
+                **(tcp_keepalive if isinstance(tcp_keepalive, dict) else {})
+            )
+        self._adapter = DCEHTTPAdapter(
+            socket_options=socket_options,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self.mount('http://', self._adapter)
+        self.mount('https://', self._adapter)
+
         self.headers['User-Agent'] = user_agent
         if token:
             self.headers['X-DCE-Access-Token'] = token
 
-        self._prefix, self._versions = self._retrieve_versions_prefix()
-        if Version(self.dce_version) < Version(MINIMUM_DCE_VERSION):
+        if discovery_cache is True:
+            discovery_cache = DiscoveryCache()
+        elif isinstance(discovery_cache, six.string_types):
+            discovery_cache = DiscoveryCache(discovery_cache)
+        self.discovery_cache = discovery_cache
+
+        if cache is True:
+            cache = ResponseCache()
+        elif isinstance(cache, dict):
+            cache = ResponseCache(ttls=cache)
+        self.response_cache = cache
+
+        if conditional is True:
+            conditional = MemoryValidatorStore()
+        elif isinstance(conditional, six.string_types):
+            conditional = FileValidatorStore(conditional)
+        self.validator_store = conditional
+        self.resolve_gates = resolve_gates
+        self.check_resources = check_resources
+
+        if retry is True:
+            retry = RetryPolicy()
+        elif isinstance(retry, int) and not isinstance(retry, bool):
+            retry = RetryPolicy(total=retry)
+        self.retry_policy = retry or None
+
+        if isinstance(limits, dict):
+            limits = EndpointLimiter(limits)
+        self.limiter = limits
+
+        if breaker is True:
+            breaker = CircuitBreaker()
+        self.breaker = breaker or None
+
+        # a policy passed in may be shared, thus not shut down on close
+        self._owns_hedge_policy = hedge is True or \
+            isinstance(hedge, (list, tuple))
+        if hedge is True:
+            hedge = HedgePolicy()
+        elif isinstance(hedge, (list, tuple)):
+            hedge = HedgePolicy(templates=hedge)
+        self.hedge_policy = hedge or None
+        self._hedge_session = None
+
+        self._resolved_prefix = prefix
+        self._resolved_versions = None
+        if dce_version:
+            self._resolved_versions = {'DCEVersion': dce_version}
+        elif discovery_cache is not None:
+            cached = discovery_cache.get(self.base_url)
+            if cached and prefix in (None, cached[0]):
+                self._resolved_prefix, self._resolved_versions = cached
+
+        if self._resolved_versions is not None:
+            self._check_version()
+        elif not lazy:
+            self._discover()
+
+    def _check_version(self):
+        if self._parsed_dce_version < Version(MINIMUM_DCE_VERSION):
             raise InvalidVersion(
                 'DCE Version {} < {} is not supported'.format(
                     self.dce_version, MINIMUM_DCE_VERSION)
             )
+        if self.resolve_gates:
+            resolve_version_gates(self)
+
+    def _discover(self):
+        prefix = self._resolved_prefix
+        try:
+            if prefix is None:
+                self._resolved_prefix, versions = self._retrieve_versions_prefix()
+            else:
+                versions = self._version(prefix=prefix)
+        except Exception:
+            self._resolved_prefix = prefix
+            raise
+
+        self._resolved_versions = versions
+        self._check_version()
+        if self.discovery_cache is not None:
+            self.discovery_cache.set(
+                self.base_url, self._resolved_prefix, versions
+            )
+
+    @property
+    def _prefix(self):
+        if self._resolved_prefix is None:
+            self._discover()
+        return self._resolved_prefix
+
+    @_prefix.setter
+    def _prefix(self, prefix):
+        self._resolved_prefix = prefix
+
+    @property
+    def _versions(self):
+        if self._resolved_versions is None:
+            self._discover()
+        return self._resolved_versions
 
     def _retrieve_versions_prefix(self):
         prefix = 'dce'
@@ -78,24 +274,6 @@ class APIClient(requests.Session,
                 self._get(self._url('/version')), json=True
         )
 
-    @staticmethod
-    def _raise_for_status(response):
-        """Raises stored :class:`APIError`, if one occurred."""
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
-            raise create_api_error_from_http_exception(e)
-
-    def _result(self, response, json=False, binary=False):
-        assert not (json and binary)
-        self._raise_for_status(response)
-
-        if json:
-            return response.json()
-        if binary:
-            return response.content
-        return response.text
-
     def _set_request_kwargs(self, kwargs):
         kwargs.setdefault('auth', self.auth)
         kwargs.setdefault('headers', self.headers)
@@ -104,7 +282,177 @@ class APIClient(requests.Session,
         return kwargs
 
     def _request(self, method, url, **kwargs):
-        return self.request(method, url, **self._set_request_kwargs(kwargs))
+        if self.timeouts and 'timeout' not in kwargs:
+            kwargs['timeout'] = self.timeouts.get(self._path(url), self.timeout)
+        kwargs = self._set_request_kwargs(kwargs)
+        cache = self.response_cache
+        if kwargs.get('stream') or \
+                (cache is None and self.validator_store is None):
+            return self._send(method, url, kwargs)
+
+        if method != 'GET':
+            try:
+                return self._send(method, url, kwargs)
+            finally:
+                if cache is not None:
+                    cache.invalidate(self._path(url))
+
+        if cache is None:
+            return self._conditional_get(url, kwargs)
+
+        path = self._path(url)
+        params = kwargs.get('params')
+        response = cache.get(path, params)
+        if response is None:
+            response = self._conditional_get(url, kwargs)
+            cache.set(path, params, response)
+        return response
+
+    def _send(self, method, url, kwargs):
+        """
+        Send the request, retrying it as the retry policy decides.
+        """
+        policy = self.retry_policy
+        if policy is None:
+            check_deadline()
+            return self._send_once(method, url, kwargs)
+
+        attempt = 0
+        while True:
+            # an expired deadline is not a failure of DCE, thus checked
+            # before the circuit breaker
+            check_deadline()
+            try:
+                response = self._send_once(method, url, kwargs)
+            except RETRYABLE_ERRORS as e:
+                delay = policy.next_delay(method, attempt, error=e)
+                if delay is None:
+                    raise
+                left = remaining()
+                if left is not None and delay >= left:
+                    raise
+            else:
+                delay = policy.next_delay(method, attempt, response=response)
+                left = remaining()
+                if delay is None or (left is not None and delay >= left):
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_once(self, method, url, kwargs):
+        breaker = self.breaker
+        if breaker is None:
+            return self._send_limited(method, url, kwargs)
+
+        breaker.before_call()
+        success = None
+        try:
+            response = self._send_limited(method, url, kwargs)
+            success = response.status_code < 500
+            return response
+        except RETRYABLE_ERRORS:
+            success = False
+            raise
+        finally:
+            if success is None:
+                # failed locally or interrupted, e.g. by KeyboardInterrupt
+                breaker.release()
+            else:
+                breaker.record(success)
+
+    @staticmethod
+    def _clamp_timeout(kwargs):
+        """
+        Shorten the timeout of request to the time left before the
+        deadline of current thread.
+
+        :raise DeadlineExceeded: if the deadline has passed.
+        """
+        if current_deadline() is None:
+            return kwargs
+        timeout = kwargs['timeout']
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        return dict(kwargs, timeout=clamp_timeout(timeout))
+
+    def _send_limited(self, method, url, kwargs):
+        if self.limiter is None:
+            return self._dispatch(method, url, self._clamp_timeout(kwargs))
+        # the timeout is clamped after waiting for the limiter
+        with self.limiter.acquire(self._path(url)):
+            return self._dispatch(method, url, self._clamp_timeout(kwargs))
+
+    def _dispatch(self, method, url, kwargs):
+        policy = self.hedge_policy
+        if policy is None or method != 'GET' or kwargs.get('stream'):
+            return self.request(method, url, **kwargs)
+        return policy.send(
+            self._path(url),
+            functools.partial(self.request, method, url, **kwargs),
+            functools.partial(self._send_hedge, method, url, kwargs)
+        )
+
+    def _send_hedge(self, method, url, kwargs):
+        """
+        Send the duplicate of a hedged request, which takes a slot of the
+        endpoint limiter of its own.
+
+        :raise ThrottledError: if the limiter doesn't allow the duplicate
+                               immediately, then the primary request wins.
+        """
+        if self.limiter is None:
+            return self.hedge_session.request(
+                method, url, **self._clamp_timeout(kwargs)
+            )
+        with self.limiter.acquire(self._path(url), blocking=False):
+            return self.hedge_session.request(
+                method, url, **self._clamp_timeout(kwargs)
+            )
+
+    @property
+    def hedge_session(self):
+        """
+        The session sending hedged requests, whose connections are not
+        shared with the client.
+        """
+        if self._hedge_session is None:
+            session = requests.Session()
+            session.verify = self.verify
+            adapter = DCEHTTPAdapter(
+                socket_options=self._adapter.socket_options
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._hedge_session = session
+        return self._hedge_session
+
+    def _conditional_get(self, url, kwargs):
+        """
+        Send the validators of stored response, and replay its body
+        if the server answers `304 Not Modified`.
+        """
+        store = self.validator_store
+        if store is None:
+            return self._send('GET', url, kwargs)
+
+        key = requests.Request(
+            'GET', url, params=kwargs.get('params')
+        ).prepare().url
+        stored = store.get(key)
+        if stored is not None:
+            headers = dict(kwargs['headers'] or {})
+            headers.update(stored.conditional_headers())
+            kwargs = dict(kwargs, headers=headers)
+
+        response = self._send('GET', url, kwargs)
+        if response.status_code == 304 and stored is not None:
+            return stored.to_response(response.url)
+        if response.status_code == 200:
+            stored = StoredResponse.from_response(response)
+            if stored is not None:
+                store.set(key, stored)
+        return response
 
     def _post(self, url, **kwargs):
         return self._request('POST', url, **kwargs)
@@ -121,25 +469,14 @@ class APIClient(requests.Session,
     def _delete(self, url, **kwargs):
         return self._request('DELETE', url, **kwargs)
 
-    def _url(self, path, *args, **kwargs):
-        for arg in args:
-            if not isinstance(arg, six.string_types):
-                raise ValueError(
-                    'Expected a string but found {0} ({1}) '
-                    'instead'.format(arg, type(arg))
-                )
-
-        quote_f = partial(quote_plus, safe="/:")
-        args = [quote_f(arg) for arg in args]
-
-        return '{0}/{1}{2}'.format(
-            self.base_url, self._prefix, path.format(*args, **kwargs)
-        )
-
     @cached_property
     def dce_version(self):
         return self._versions.get('DCEVersion')
 
+    @cached_property
+    def _parsed_dce_version(self):
+        return Version(self.dce_version)
+
     @cached_property
     def info(self):
         return self._result(self._get(self._url('/info')), json=True)
@@ -170,12 +507,87 @@ class APIClient(requests.Session,
     def network_driver(self):
         return self.info.get('NetworkDriver')
 
+    def cache_stats(self):
+        """
+        Get the statistics of response cache, see :meth:`ResponseCache.stats`.
+
+        :return: a dict, or None if the cache is disabled.
+        """
+        if self.response_cache is None:
+            return None
+        return self.response_cache.stats()
+
+    def deadline(self, seconds):
+        """
+        Limit the total time of the calls in the context, including their
+        retries and the operations of batches run in it, see
+        :func:`dce.api.deadline.deadline`.
+
+        :raise DeadlineExceeded: from the requests sent after the deadline.
+        """
+        return deadline(seconds)
+
+    def retry_stats(self):
+        """
+        Get the counters of retries, see :meth:`RetryStats.as_dict`.
+
+        :return: a dict, or None if retrying is disabled.
+        """
+        if self.retry_policy is None:
+            return None
+        return self.retry_policy.stats.as_dict()
+
+    def limiter_stats(self):
+        """
+        Get the usage of endpoint limits, see :meth:`EndpointLimiter.stats`.
+
+        :return: a dict, or None if requests are not limited.
+        """
+        if self.limiter is None:
+            return None
+        return self.limiter.stats()
+
+    def breaker_stats(self):
+        """
+        Get the state of circuit breaker, see :meth:`CircuitBreaker.stats`.
+
+        :return: a dict, or None if the breaker is disabled.
+        """
+        if self.breaker is None:
+            return None
+        return self.breaker.stats()
+
+    def hedge_stats(self):
+        """
+        Get the statistics of hedged requests, see :meth:`HedgePolicy.stats`.
+
+        :return: a dict, or None if hedging is disabled.
+        """
+        if self.hedge_policy is None:
+            return None
+        return self.hedge_policy.stats()
+
+    def pool_stats(self):
+        """
+        Get the usage of connection pools, see :meth:`DCEHTTPAdapter.pool_stats`.
+        """
+        return self._adapter.pool_stats()
+
     def ping(self):
         return self._result(self._get(self._url('/ping')))
 
     def now(self):
         return self._result(self._get(self._url('/now')), json=True)
 
+    def close(self):
+        super(APIClient, self).close()
+        if self._hedge_session is not None:
+            self._hedge_session.close()
+        if self._owns_hedge_policy and self.hedge_policy is not None:
+            self.hedge_policy.shutdown()
+        if self.search_index is not None:
+            self.search_index.stop()
+
     def __repr__(self):
         return "<DCEClient '%s'>" % self.host
 
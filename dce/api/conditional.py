@@ -0,0 +1,160 @@
+# coding=utf-8
+import os
+import abc
+import json
+import hashlib
+import tempfile
+
+import six
+
+from ..consts import (
+    DEFAULT_VALIDATOR_STORE_SIZE, DEFAULT_VALIDATOR_STORE_PATH,
+    IS_WINDOWS_PLATFORM
+)
+from ..utils.cache import LRUCache
+from .base import build_response
+
+# the headers kept along with the stored body
+STORED_HEADERS = ('ETag', 'Last-Modified', 'Content-Type')
+
+
+class StoredResponse(object):
+    """
+    The validators and body of a response, replayed when the server
+    answers `304 Not Modified`.
+    """
+
+    def __init__(self, headers, content, encoding=None):
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        :return: a :class:`StoredResponse`, or None if the response
+                 has no validators.
+        """
+        headers = dict(
+            (name, response.headers[name])
+            for name in STORED_HEADERS if name in response.headers
+        )
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return None
+        return cls(headers, response.content, encoding=response.encoding)
+
+    def conditional_headers(self):
+        headers = {}
+        if 'ETag' in self.headers:
+            headers['If-None-Match'] = self.headers['ETag']
+        if 'Last-Modified' in self.headers:
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+        return headers
+
+    def to_response(self, url):
+        return build_response(url, 200, self.headers, self.content,
+                              reason='OK', encoding=self.encoding)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class ValidatorStore(object):
+    """
+    The interface of stores of :class:`StoredResponse`, keyed by
+    the full urls including params.
+    """
+
+    @abc.abstractmethod
+    def get(self, key):
+        """
+        :return: the :class:`StoredResponse` of key, or None if missing.
+        """
+
+    @abc.abstractmethod
+    def set(self, key, stored):
+        """
+        Store a :class:`StoredResponse` under key.
+        """
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """
+        Remove the stored response of key if exists.
+        """
+
+
+class MemoryValidatorStore(ValidatorStore):
+    """
+    Keep the stored responses in memory, evicting the least recently
+    used ones.
+    """
+
+    def __init__(self, maxsize=DEFAULT_VALIDATOR_STORE_SIZE):
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, stored):
+        self._cache.set(key, stored)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+
+class FileValidatorStore(ValidatorStore):
+    """
+    Keep the stored responses in a directory, one file per url,
+    so that they survive the restarts of process.
+
+    A store that can't be read or written is ignored, since it's only
+    an optimization.
+    """
+
+    def __init__(self, path=DEFAULT_VALIDATOR_STORE_PATH):
+        self.path = os.path.expanduser(path)
+
+    def _file(self, key):
+        return os.path.join(
+            self.path, hashlib.sha1(key.encode('utf-8')).hexdigest()
+        )
+
+    def get(self, key):
+        try:
+            with open(self._file(key), 'rb') as f:
+                meta = json.loads(f.readline().decode('utf-8'))
+                content = f.read()
+        except (IOError, OSError, ValueError):
+            return None
+        if meta.get('Key') != key:
+            return None
+        return StoredResponse(meta['Headers'], content,
+                              encoding=meta.get('Encoding'))
+
+    def set(self, key, stored):
+        meta = json.dumps({
+            'Key': key,
+            'Headers': stored.headers,
+            'Encoding': stored.encoding
+        })
+        path = self._file(key)
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(meta.encode('utf-8') + b'\n')
+                f.write(stored.content)
+            if IS_WINDOWS_PLATFORM and os.path.exists(path):
+                os.remove(path)
+            os.rename(tmp_path, path)
+        except (IOError, OSError):
+            pass
+
+    def delete(self, key):
+        try:
+            os.remove(self._file(key))
+        except (IOError, OSError):
+            pass
+
+    def __repr__(self):
+        return "<FileValidatorStore '%s'>" % self.path
@@ -0,0 +1,155 @@
+# coding=utf-8
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from ..consts import DEFAULT_CRAWL_WORKERS, DEFAULT_CRAWL_MAX_IN_FLIGHT
+from .deadline import current_deadline, deadline_scope
+
+NAMESPACE = 'namespace'
+REPOSITORY = 'repository'
+
+
+class CrawlStats(object):
+    """
+    Counters of a registry crawl, updated as its results are yielded.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.finished_at = None
+        self.requests = 0
+        self.namespaces = 0
+        self.repositories = 0
+        self.tags = 0
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def throughput(self):
+        """
+        :return: the number of requests completed per second.
+        """
+        elapsed = self.elapsed
+        return self.requests / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            '<CrawlStats requests={0} namespaces={1} repositories={2} '
+            'tags={3} throughput={4:.1f}/s>'.format(
+                self.requests, self.namespaces, self.repositories,
+                self.tags, self.throughput
+            )
+        )
+
+
+def _call(deadline_at, fn, *args):
+    with deadline_scope(deadline_at):
+        return fn(*args)
+
+
+class CrawlerMixin(object):
+    def crawl_registry(self, registry, namespaces=None, tags=True,
+                       max_workers=DEFAULT_CRAWL_WORKERS,
+                       max_in_flight=DEFAULT_CRAWL_MAX_IN_FLIGHT,
+                       stats=None):
+        """
+        Crawl the namespaces, repositories and tags of registry
+        concurrently, yielding repositories as their tags arrive::
+
+            stats = CrawlStats()
+            for result in client.crawl_registry('buildin-registry',
+                                                stats=stats):
+                print(result['Namespace'], result['Repository']['Name'],
+                      len(result['Tags']))
+            print(stats.throughput)
+
+        The repositories of namespaces and the tags of repositories are
+        requested by a pool of `max_workers` threads, and at most
+        `max_in_flight` requests are submitted at once, the others wait in
+        a queue. The tags are requested before the repositories of the
+        remaining namespaces, so that results are yielded early. Closing
+        the generator cancels the requests not started yet.
+
+        The requests run under the deadline of the thread iterating,
+        see :func:`dce.api.deadline.deadline`.
+
+        :param registry: the name of registry.
+        :param namespaces: the names of namespaces to crawl,
+                           all namespaces of registry if None.
+        :param tags: if `False`, don't request the tags of repositories.
+        :param max_workers: the maximum number of concurrent requests.
+        :param max_in_flight: the maximum number of submitted requests.
+        :param stats: a :class:`CrawlStats` updated during the crawl.
+
+        :return: a generator of dicts including `Namespace`, the name of
+                 namespace, `Repository`, the repository, and `Tags`,
+                 a list of tags, or None if `tags` is `False`.
+
+        :raise APIError: if server returns an error, the crawl stops.
+        """
+        if stats is None:
+            stats = CrawlStats()
+        max_in_flight = max(max_in_flight or max_workers, 1)
+        deadline_at = current_deadline()
+
+        if namespaces is None:
+            namespaces = [
+                namespace['Name'] for namespace in
+                self.list_registry_namespace(registry, iter=True)
+            ]
+            stats.requests += 1
+        queue = deque((NAMESPACE, namespace, None) for namespace in namespaces)
+        in_flight = {}
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while queue or in_flight:
+                while queue and len(in_flight) < max_in_flight:
+                    kind, namespace, repository = queue.popleft()
+                    if kind == NAMESPACE:
+                        future = executor.submit(
+                            _call, deadline_at,
+                            self.list_registry_namespaced_repository,
+                            registry, namespace
+                        )
+                    else:
+                        future = executor.submit(
+                            _call, deadline_at,
+                            self.list_registry_namespaced_repository_tags,
+                            registry, namespace, repository['Name']
+                        )
+                    in_flight[future] = (kind, namespace, repository)
+
+                done = wait(in_flight, return_when=FIRST_COMPLETED).done
+                for future in done:
+                    kind, namespace, repository = in_flight.pop(future)
+                    result = future.result()
+                    stats.requests += 1
+
+                    if kind == REPOSITORY:
+                        stats.tags += len(result)
+                        yield {'Namespace': namespace,
+                               'Repository': repository,
+                               'Tags': result}
+                        continue
+
+                    stats.namespaces += 1
+                    stats.repositories += len(result)
+                    if tags:
+                        queue.extendleft(
+                            (REPOSITORY, namespace, repository_)
+                            for repository_ in reversed(result)
+                        )
+                        continue
+                    for repository_ in result:
+                        yield {'Namespace': namespace,
+                               'Repository': repository_,
+                               'Tags': None}
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+            stats.finished_at = time.time()
@@ -0,0 +1,103 @@
+# coding=utf-8
+import time
+import threading
+from contextlib import contextmanager
+
+from ..errors import DeadlineExceeded
+
+_local = threading.local()
+
+
+def current_deadline():
+    """
+    :return: the absolute time by which the calls of current thread
+             must finish, or None if there is no deadline.
+    """
+    return getattr(_local, 'deadline', None)
+
+
+@contextmanager
+def deadline_scope(at):
+    """
+    Run the calls of current thread under the absolute deadline `at`,
+    an enclosing deadline which is earlier wins.
+    """
+    previous = current_deadline()
+    if at is None or (previous is not None and previous <= at):
+        yield previous
+        return
+
+    _local.deadline = at
+    try:
+        yield at
+    finally:
+        _local.deadline = previous
+
+
+@contextmanager
+def without_deadline():
+    """
+    Run the calls of current thread without deadline, e.g. the cleanup
+    which must be done even if the deadline has passed.
+    """
+    previous = current_deadline()
+    _local.deadline = None
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def deadline(seconds):
+    """
+    Limit the total time of the calls in the context, including their
+    retries and the operations of batches run in it::
+
+        with deadline(30):
+            client.create_account_with_ttrn(...)
+
+    :raise DeadlineExceeded: from the requests sent after the deadline.
+    """
+    return deadline_scope(time.time() + seconds)
+
+
+def remaining():
+    """
+    :return: the seconds left before the deadline of current thread,
+             or None if there is no deadline.
+    """
+    at = current_deadline()
+    if at is None:
+        return None
+    return at - time.time()
+
+
+def check_deadline():
+    """
+    :return: the seconds left before the deadline of current thread,
+             or None if there is no deadline.
+
+    :raise DeadlineExceeded: if the deadline has passed.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded('Deadline exceeded by {0:.3f}s'.format(-left))
+    return left
+
+
+def clamp_timeout(timeout):
+    """
+    Shorten the `(connect, read)` timeout of a request to the time left
+    before the deadline.
+
+    :raise DeadlineExceeded: if the deadline has passed.
+    """
+    left = check_deadline()
+    if left is None:
+        return timeout
+
+    connect, read = timeout
+    return (
+        left if connect is None else min(connect, left),
+        left if read is None else min(read, left)
+    )
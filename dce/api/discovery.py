@@ -0,0 +1,91 @@
+# coding=utf-8
+import os
+import json
+import time
+import tempfile
+import threading
+
+from ..consts import (
+    DEFAULT_DISCOVERY_CACHE_PATH, DEFAULT_DISCOVERY_CACHE_TTL,
+    IS_WINDOWS_PLATFORM
+)
+
+
+class DiscoveryCache(object):
+    """
+    A JSON file persisting the api prefix and versions of DCE,
+    keyed by `base_url`, so that short-lived processes don't have to
+    probe the versions again.
+    """
+
+    def __init__(self, path=DEFAULT_DISCOVERY_CACHE_PATH,
+                 ttl=DEFAULT_DISCOVERY_CACHE_TTL):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _dump(self, entries):
+        directory = os.path.dirname(self.path) or '.'
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entries, f)
+        if IS_WINDOWS_PLATFORM and os.path.exists(self.path):
+            os.remove(self.path)
+        os.rename(tmp_path, self.path)
+
+    def get(self, base_url):
+        """
+        Get the discovered prefix and versions of given DCE.
+
+        :param base_url: the base url of DCE.
+
+        :return: a tuple of prefix and versions,
+                 or None if not cached or expired.
+        """
+        entry = self._load().get(base_url)
+        if not entry:
+            return None
+        if self.ttl is not None and time.time() > entry['Time'] + self.ttl:
+            return None
+        return entry['Prefix'], entry['Versions']
+
+    def set(self, base_url, prefix, versions):
+        """
+        Persist the discovered prefix and versions of given DCE.
+
+        A cache that can't be written is ignored, since it's only
+        an optimization.
+        """
+        with self._lock:
+            entries = self._load()
+            entries[base_url] = {
+                'Prefix': prefix,
+                'Versions': versions,
+                'Time': time.time()
+            }
+            try:
+                self._dump(entries)
+            except (IOError, OSError):
+                pass
+
+    def invalidate(self, base_url):
+        with self._lock:
+            entries = self._load()
+            if entries.pop(base_url, None) is not None:
+                try:
+                    self._dump(entries)
+                except (IOError, OSError):
+                    pass
+
+    def __repr__(self):
+        return "<DiscoveryCache '%s'>" % self.path
@@ -0,0 +1,247 @@
+# coding=utf-8
+import time
+import threading
+from collections import deque
+from concurrent.futures import (
+    Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
+
+from ..consts import (
+    DEFAULT_HEDGE_TEMPLATES, DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_HEDGE_MIN_DELAY, DEFAULT_HEDGE_MIN_SAMPLES,
+    DEFAULT_HEDGE_WINDOW, DEFAULT_HEDGE_WORKERS
+)
+from ..utils.utils import URLTemplateMap
+from .deadline import current_deadline, deadline_scope
+
+
+class LatencyTracker(object):
+    """
+    The latencies of the recent requests to an endpoint.
+    """
+
+    def __init__(self, size=DEFAULT_HEDGE_WINDOW):
+        self._latencies = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percent):
+        """
+        :return: the latency at given percentile, or None if there are
+                 no latencies recorded.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        index = int(round(percent / 100.0 * (len(latencies) - 1)))
+        return latencies[index]
+
+    def __len__(self):
+        return len(self._latencies)
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class HedgePolicy(object):
+    """
+    Hedge the GET requests to latency-critical endpoints.
+
+    If a request is not completed within the latency at `percentile` of
+    the recent requests to its endpoint, a duplicate request is sent on
+    a fresh connection and the first succeeded response wins. Requests
+    in flight can't be aborted, so the response of loser is closed as
+    soon as it arrives.
+
+    Endpoints are not hedged until `min_samples` latencies are recorded.
+    Only the duplicates run on the `max_workers` threads of policy, and
+    a request is not hedged while all of them are busy. The policy,
+    including its threads and statistics, can be shared by many clients.
+    """
+
+    def __init__(self, templates=DEFAULT_HEDGE_TEMPLATES,
+                 percentile=DEFAULT_HEDGE_PERCENTILE,
+                 min_delay=DEFAULT_HEDGE_MIN_DELAY,
+                 min_samples=DEFAULT_HEDGE_MIN_SAMPLES,
+                 max_workers=DEFAULT_HEDGE_WORKERS):
+        """
+        :param templates: the url templates of hedged API methods,
+                          e.g. `/accounts/{0}`.
+        :param percentile: the percentile of latencies to wait for before
+                           hedging, e.g. 95.
+        :param min_delay: the minimum seconds to wait before hedging.
+        :param min_samples: the number of latencies recorded before
+                            hedging an endpoint.
+        :param max_workers: the maximum number of duplicate requests
+                            in flight.
+        """
+        self.templates = URLTemplateMap(dict(
+            (template, LatencyTracker()) for template in templates
+        ))
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._hedging = 0
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.skipped = 0
+
+    def _start(self, tracker, fn):
+        """
+        Run a primary request in a thread of its own, so that primary
+        requests are never queued behind each other.
+
+        :return: a :class:`concurrent.futures.Future` of the response.
+        """
+        future = Future()
+        deadline_at = current_deadline()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._timed(tracker, deadline_at, fn))
+            except BaseException as e:
+                future.set_exception(e)
+
+        thread = threading.Thread(target=run, name='dce-hedge-primary')
+        thread.daemon = True
+        thread.start()
+        return future
+
+    def _submit(self, tracker, fn):
+        """
+        Submit a duplicate request to the threads of policy.
+
+        :return: a :class:`concurrent.futures.Future` of the response,
+                 or None if all threads are busy.
+        """
+        with self._lock:
+            if self._hedging >= self.max_workers:
+                self.skipped += 1
+                return None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers
+                )
+            executor = self._executor
+            self._hedging += 1
+        try:
+            future = executor.submit(
+                self._timed, tracker, current_deadline(), fn
+            )
+        except RuntimeError:
+            # shut down meanwhile
+            self._hedged(None)
+            return None
+        future.add_done_callback(self._hedged)
+        return future
+
+    def _hedged(self, future):
+        with self._lock:
+            self._hedging -= 1
+
+    @staticmethod
+    def _timed(tracker, deadline_at, fn):
+        started_at = time.time()
+        with deadline_scope(deadline_at):
+            response = fn()
+        tracker.record(time.time() - started_at)
+        return response
+
+    def delay(self, tracker):
+        """
+        :return: the seconds to wait before hedging,
+                 or None if the endpoint is not hedged yet.
+        """
+        if len(tracker) < self.min_samples:
+            return None
+        return max(tracker.percentile(self.percentile), self.min_delay)
+
+    def send(self, path, primary, hedge):
+        """
+        Send a request, hedged if its path is of a hedged endpoint.
+
+        :param path: the path of API method.
+        :param primary: a callable sending the request.
+        :param hedge: a callable sending the duplicate request
+                      on a fresh connection.
+
+        :return: the first succeeded response.
+        """
+        tracker = self.templates.get(path)
+        if tracker is None:
+            return primary()
+
+        with self._lock:
+            self.requests += 1
+        delay = self.delay(tracker)
+        if delay is None:
+            return self._timed(tracker, current_deadline(), primary)
+
+        first = self._start(tracker, primary)
+        if wait([first], timeout=delay).done:
+            return first.result()
+
+        second = self._submit(tracker, hedge)
+        if second is None:
+            return first.result()
+        with self._lock:
+            self.fired += 1
+        pending = [first, second]
+        while True:
+            done = wait(pending, return_when=FIRST_COMPLETED).done
+            pending = [f for f in pending if f not in done]
+            winners = [f for f in (first, second)
+                       if f in done and f.exception() is None]
+            if winners or not pending:
+                break
+
+        if not winners:
+            return first.result()
+        winner = winners[0]
+        for future in (first, second):
+            if future is not winner and not future.cancel():
+                future.add_done_callback(_close_response)
+        if winner is second:
+            with self._lock:
+                self.won += 1
+        return winner.result()
+
+    def stats(self):
+        """
+        :return: a dict including `Requests`, the number of requests to
+                 hedged endpoints, `Fired`, the number of hedged requests
+                 sent, `Won`, the number of hedged requests finished
+                 first, `Skipped`, the number of hedged requests not sent
+                 since all threads were busy, and `Delays`, the current
+                 delays by url template.
+        """
+        with self._lock:
+            stats = {
+                'Requests': self.requests,
+                'Fired': self.fired,
+                'Won': self.won,
+                'Skipped': self.skipped
+            }
+        stats['Delays'] = dict(
+            (template, self.delay(tracker))
+            for template, tracker in self.templates.items()
+        )
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
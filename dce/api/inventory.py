@@ -0,0 +1,338 @@
+# coding=utf-8
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from ..consts import DEFAULT_INVENTORY_PATH, DEFAULT_INVENTORY_MAX_AGE
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS namespaces (
+    registry TEXT NOT NULL,
+    name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (registry, name)
+);
+CREATE TABLE IF NOT EXISTS repositories (
+    registry TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (registry, namespace, name)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    registry TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (registry, namespace, repository, name)
+);
+CREATE TABLE IF NOT EXISTS crawls (
+    registry TEXT NOT NULL,
+    name TEXT NOT NULL,
+    crawled_at REAL NOT NULL,
+    PRIMARY KEY (registry, name)
+);
+'''
+
+
+def fingerprint(obj):
+    """
+    :return: the sha1 of the canonical JSON of obj.
+    """
+    return hashlib.sha1(
+        json.dumps(obj, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+class InventoryStore(object):
+    """
+    A snapshot of the namespaces, repositories and tags of registries
+    kept in a SQLite database, see
+    :meth:`InventoryMixin.sync_inventory`.
+
+    The store can be shared by threads, and `:memory:` keeps
+    the snapshot in memory only.
+    """
+
+    def __init__(self, path=DEFAULT_INVENTORY_PATH):
+        if path != ':memory:':
+            path = os.path.expanduser(path)
+            directory = os.path.dirname(path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def _query(self, sql, *params):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def namespace_fingerprints(self, registry):
+        """
+        :return: a dict mapping namespace names to their fingerprints.
+        """
+        return dict(self._query(
+            'SELECT name, fingerprint FROM namespaces WHERE registry = ?',
+            registry
+        ))
+
+    def crawled_at(self, registry):
+        """
+        :return: a dict mapping namespace names to the time the tags of
+                 all their repositories were last requested.
+        """
+        return dict(self._query(
+            'SELECT name, crawled_at FROM crawls WHERE registry = ?',
+            registry
+        ))
+
+    def repository_fingerprints(self, registry, namespace):
+        """
+        :return: a dict mapping repository names to their fingerprints.
+        """
+        return dict(self._query(
+            'SELECT name, fingerprint FROM repositories '
+            'WHERE registry = ? AND namespace = ?', registry, namespace
+        ))
+
+    def replace_namespace(self, registry, namespace, fingerprint_, data,
+                          repositories):
+        """
+        Replace a namespace and its repositories in one transaction,
+        if the tags of all repositories are given, the namespace is
+        recorded as crawled, see :meth:`crawled_at`.
+
+        :param registry: the name of registry.
+        :param namespace: the name of namespace.
+        :param fingerprint_: the fingerprint of namespace.
+        :param data: the namespace object.
+        :param repositories: a list of `(name, fingerprint, data, tags)`,
+                             tags is a list of tag objects, or None to keep
+                             the stored tags of an unchanged repository.
+        """
+        names = set(repository[0] for repository in repositories)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO namespaces VALUES (?, ?, ?, ?, ?)',
+                (registry, namespace, fingerprint_, json.dumps(data), now)
+            )
+            if all(repository[3] is not None for repository in repositories):
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO crawls VALUES (?, ?, ?)',
+                    (registry, namespace, now)
+                )
+            stale = [
+                name for (name,) in self._conn.execute(
+                    'SELECT name FROM repositories '
+                    'WHERE registry = ? AND namespace = ?',
+                    (registry, namespace)
+                ) if name not in names
+            ]
+            for name in stale:
+                self._delete_repository(registry, namespace, name)
+
+            for name, digest, repository, tags in repositories:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO repositories '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (registry, namespace, name, digest, json.dumps(repository))
+                )
+                if tags is None:
+                    continue
+                self._conn.execute(
+                    'DELETE FROM tags WHERE registry = ? AND namespace = ? '
+                    'AND repository = ?', (registry, namespace, name)
+                )
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO tags VALUES (?, ?, ?, ?, ?)',
+                    [(registry, namespace, name, tag['Name'], json.dumps(tag))
+                     for tag in tags]
+                )
+
+    def _delete_repository(self, registry, namespace, name):
+        self._conn.execute(
+            'DELETE FROM tags WHERE registry = ? AND namespace = ? '
+            'AND repository = ?', (registry, namespace, name)
+        )
+        self._conn.execute(
+            'DELETE FROM repositories WHERE registry = ? AND namespace = ? '
+            'AND name = ?', (registry, namespace, name)
+        )
+
+    def remove_namespace(self, registry, namespace):
+        with self._lock, self._conn:
+            for table, column in (('tags', 'namespace'),
+                                  ('repositories', 'namespace'),
+                                  ('namespaces', 'name'),
+                                  ('crawls', 'name')):
+                self._conn.execute(
+                    'DELETE FROM {0} WHERE registry = ? AND {1} = ?'.format(
+                        table, column
+                    ), (registry, namespace)
+                )
+
+    def namespaces(self, registry):
+        """
+        :return: a list of namespace objects of registry.
+        """
+        return [json.loads(data) for (data,) in self._query(
+            'SELECT data FROM namespaces WHERE registry = ? ORDER BY name',
+            registry
+        )]
+
+    def repositories(self, registry, namespace=None):
+        """
+        :return: a list of repository objects of registry,
+                 or of a namespace if given.
+        """
+        if namespace is None:
+            rows = self._query(
+                'SELECT data FROM repositories WHERE registry = ? '
+                'ORDER BY namespace, name', registry
+            )
+        else:
+            rows = self._query(
+                'SELECT data FROM repositories WHERE registry = ? '
+                'AND namespace = ? ORDER BY name', registry, namespace
+            )
+        return [json.loads(data) for (data,) in rows]
+
+    def tags(self, registry, namespace, repository):
+        """
+        :return: a list of tag objects of repository.
+        """
+        return [json.loads(data) for (data,) in self._query(
+            'SELECT data FROM tags WHERE registry = ? AND namespace = ? '
+            'AND repository = ? ORDER BY name', registry, namespace, repository
+        )]
+
+    def has_tag(self, registry, namespace, repository, tag):
+        return bool(self._query(
+            'SELECT 1 FROM tags WHERE registry = ? AND namespace = ? '
+            'AND repository = ? AND name = ?',
+            registry, namespace, repository, tag
+        ))
+
+    def synced_at(self, registry):
+        """
+        :return: the time of the last sync of registry, or None.
+        """
+        return self._query(
+            'SELECT MAX(synced_at) FROM namespaces WHERE registry = ?',
+            registry
+        )[0][0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __repr__(self):
+        return "<InventoryStore '%s'>" % self.path
+
+
+class InventoryMixin(object):
+    def sync_inventory(self, registry, store, full=False,
+                       max_age=DEFAULT_INVENTORY_MAX_AGE):
+        """
+        Sync the namespaces, repositories and tags of registry into
+        an inventory store, which answers queries locally afterwards::
+
+            store = InventoryStore()
+            client.sync_inventory('buildin-registry', store)
+            store.has_tag('buildin-registry', 'library', 'nginx', 'latest')
+
+        The namespaces and all repositories are listed by two requests.
+        A namespace is fingerprinted by its object and the objects of its
+        repositories, and only the namespaces whose fingerprint changed
+        since the last sync are re-crawled, requesting the tags of their
+        new or changed repositories only.
+
+        This assumes that pushing or deleting a tag changes the repository
+        object, e.g. its `UpdatedAt` field. Since registries may not
+        guarantee it, the tags of all repositories of a namespace are
+        requested again once `max_age` seconds passed since they were
+        last requested.
+
+        :param registry: the name of registry.
+        :param store: a :class:`InventoryStore`.
+        :param full: if `True`, re-crawl every namespace and repository.
+        :param max_age: the seconds after which all tags of a namespace
+                        are requested again, None to trust the
+                        fingerprints only.
+
+        :return: a dict including `Added`, `Changed`, `Expired` and
+                 `Removed` fields, lists of namespace names, `Unchanged`,
+                 the number of namespaces skipped, and `Crawled`, the
+                 number of repositories whose tags were requested.
+
+        :raise APIError: if server returns an error.
+        """
+        namespaces = dict(
+            (namespace['Name'], namespace)
+            for namespace in self.list_registry_namespace(registry, iter=True)
+        )
+        repositories = {}
+        for repository in self.list_repository_for_all_registry_namespaces(
+                registry, with_remote='False', iter=True):
+            repositories.setdefault(
+                repository.get('Namespace'), {}
+            )[repository['Name']] = repository
+
+        known = store.namespace_fingerprints(registry)
+        crawled_at = store.crawled_at(registry)
+        now = time.time()
+        result = {
+            'Added': [], 'Changed': [], 'Expired': [], 'Removed': [],
+            'Unchanged': 0, 'Crawled': 0
+        }
+        for name, namespace in sorted(namespaces.items()):
+            objects = repositories.get(name, {})
+            fingerprints = dict(
+                (repository, fingerprint(object_))
+                for repository, object_ in objects.items()
+            )
+            fingerprint_ = fingerprint([namespace, fingerprints])
+            expired = max_age is not None and \
+                now - crawled_at.get(name, 0) >= max_age
+            changed = known.get(name) != fingerprint_
+            if not (full or expired or changed):
+                result['Unchanged'] += 1
+                continue
+
+            stored = store.repository_fingerprints(registry, name)
+            rows = []
+            for repository, object_ in sorted(objects.items()):
+                tags = None
+                if full or expired or \
+                        stored.get(repository) != fingerprints[repository]:
+                    tags = self.list_registry_namespaced_repository_tags(
+                        registry, name, repository
+                    )
+                    result['Crawled'] += 1
+                rows.append(
+                    (repository, fingerprints[repository], object_, tags)
+                )
+            store.replace_namespace(registry, name, fingerprint_, namespace,
+                                    rows)
+            if name not in known:
+                result['Added'].append(name)
+            elif changed or full:
+                result['Changed'].append(name)
+            else:
+                result['Expired'].append(name)
+
+        for name in sorted(set(known) - set(namespaces)):
+            store.remove_namespace(registry, name)
+            result['Removed'].append(name)
+
+        return result
@@ -0,0 +1,217 @@
+# coding=utf-8
+import time
+import threading
+from contextlib import contextmanager
+
+from ..errors import DeadlineExceeded, ThrottledError
+from ..utils.utils import URLTemplateMap
+from .deadline import check_deadline
+
+
+class TokenBucket(object):
+    """
+    A thread-safe token bucket, allowing `rate` acquisitions per second
+    with bursts of up to `burst` acquisitions.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: the tokens refilled per second.
+        :param burst: the capacity of bucket, `rate` if None.
+        """
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self.burst
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+
+    def _reserve(self, timeout=None):
+        """
+        Take a token, which may be borrowed from the future.
+
+        :param timeout: the maximum seconds to wait, None if unlimited.
+
+        :return: the seconds to wait until the token is available,
+                 or None if it's longer than `timeout`.
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens = min(
+                self._tokens + (now - self._updated_at) * self.rate,
+                self.burst
+            )
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            delay = (1 - self._tokens) / self.rate
+            if timeout is not None and delay > timeout:
+                return None
+            self._tokens -= 1
+            return delay
+
+    def acquire(self, timeout=None):
+        """
+        Block until a token is available.
+
+        :param timeout: the maximum seconds to wait, None if unlimited.
+
+        :return: the seconds waited, or None if no token is available
+                 within `timeout`, then no token is taken.
+        """
+        delay = self._reserve(timeout)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class Limit(object):
+    """
+    The limits of requests to an endpoint.
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None):
+        """
+        :param rate: the maximum number of requests per second,
+                     None if unlimited.
+        :param burst: the number of requests allowed in a burst.
+        :param max_in_flight: the maximum number of concurrent requests,
+                              None if unlimited.
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self.requests = 0
+        self.in_flight = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    @contextmanager
+    def acquire(self, blocking=True):
+        """
+        Wait until a request is allowed, at most until the deadline of
+        current thread.
+
+        :param blocking: if `False`, don't wait.
+
+        :raise DeadlineExceeded: if the request isn't allowed before
+                                 the deadline.
+        :raise ThrottledError: if `blocking` is `False` and the request
+                               isn't allowed immediately.
+        """
+        waited = 0
+        if self.bucket is not None:
+            left = check_deadline()
+            waited = self.bucket.acquire(timeout=left if blocking else 0)
+            if waited is None and not blocking:
+                raise ThrottledError('Rate limit reached')
+            if waited is None:
+                raise DeadlineExceeded(
+                    'Deadline exceeded while waiting for the rate limit'
+                )
+
+        with self._released:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                if not blocking:
+                    raise ThrottledError('Too many requests in flight')
+                started_at = time.time()
+                while self.in_flight >= self.max_in_flight:
+                    # raises DeadlineExceeded once the deadline passes
+                    self._released.wait(check_deadline())
+                waited += time.time() - started_at
+            self.requests += 1
+            self.in_flight += 1
+            if waited > 0:
+                self.throttled += 1
+                self.waited += waited
+        try:
+            yield
+        finally:
+            with self._released:
+                self.in_flight -= 1
+                self._released.notify()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'Requests': self.requests,
+                'InFlight': self.in_flight,
+                'Throttled': self.throttled,
+                'Waited': self.waited
+            }
+
+
+class EndpointLimiter(object):
+    """
+    Limit the rate and concurrency of requests by the url templates of
+    API methods, e.g. `/registries/{0}/repositories`, the limits are
+    shared by all requests to the paths matching a template::
+
+        limiter = EndpointLimiter({
+            '/registries/{0}/repositories': {'rate': 20, 'max_in_flight': 4},
+            '/registries/{0}/repositories/{1}/{2}': Limit(rate=50)
+        })
+        client = APIClient(base_url, limits=limiter)
+    """
+
+    def __init__(self, limits=None, default=None):
+        """
+        :param limits: a dict mapping url templates to :class:`Limit`
+                       or dicts of its arguments.
+        :param default: the limit of requests to the other paths,
+                        None if unlimited.
+        """
+        self.limits = URLTemplateMap(dict(
+            (template, self._limit(limit))
+            for template, limit in (limits or {}).items()
+        ))
+        self.default = self._limit(default) if default is not None else None
+
+    @staticmethod
+    def _limit(limit):
+        if isinstance(limit, Limit):
+            return limit
+        return Limit(**limit)
+
+    def acquire(self, path, blocking=True):
+        """
+        Wait until a request to the path is allowed.
+
+        :param path: the path of API method.
+        :param blocking: if `False`, don't wait.
+
+        :return: a context manager, holding a slot of concurrent requests
+                 until exited.
+
+        :raise DeadlineExceeded: if the request isn't allowed before
+                                 the deadline of current thread.
+        :raise ThrottledError: if `blocking` is `False` and the request
+                               isn't allowed immediately.
+        """
+        matched = self.limits.lookup(path)
+        limit = matched[1] if matched is not None else self.default
+        if limit is None:
+            return _unlimited()
+        return limit.acquire(blocking)
+
+    def stats(self):
+        """
+        :return: a dict keyed by url templates, `*` for the default limit,
+                 values are dicts including `Requests`, `InFlight`,
+                 `Throttled`, the number of requests delayed, and `Waited`,
+                 the total seconds of delays.
+        """
+        stats = dict(
+            (template, limit.stats()) for template, limit in self.limits.items()
+        )
+        if self.default is not None:
+            stats['*'] = self.default.stats()
+        return stats
+
+
+@contextmanager
+def _unlimited():
+    yield
@@ -0,0 +1,211 @@
+# coding=utf-8
+import threading
+from itertools import chain, islice
+
+from six.moves import queue
+
+from ..consts import DEFAULT_PAGE_SIZE
+from .deadline import current_deadline, deadline_scope
+
+_DONE = object()
+
+
+class OffsetPaging(object):
+    """
+    Paginate by the offset of first object and the size of page.
+    """
+
+    def __init__(self, offset_param='Offset', limit_param='Limit'):
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+
+    def params(self, page, page_size):
+        return {
+            self.offset_param: page * page_size,
+            self.limit_param: page_size
+        }
+
+
+class PagePaging(object):
+    """
+    Paginate by the number of page and the size of page.
+    """
+
+    def __init__(self, page_param='Page', size_param='PageSize', first_page=1):
+        self.page_param = page_param
+        self.size_param = size_param
+        self.first_page = first_page
+
+    def params(self, page, page_size):
+        return {
+            self.page_param: page + self.first_page,
+            self.size_param: page_size
+        }
+
+
+def _chunks(objects, size):
+    while True:
+        chunk = list(islice(objects, size))
+        if chunk:
+            yield chunk
+        if len(chunk) < size:
+            return
+
+
+def _prefetch(pages, client):
+    """
+    Fetch the next page in background while current page is consumed,
+    at most one page is kept ahead.
+
+    The pages are fetched under the deadline and iteration options,
+    e.g. :meth:`IterResult.models`, of the thread iterating them.
+    """
+    deadline_at = current_deadline()
+    options = client._current_iter_options()
+    pending = queue.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            with deadline_scope(deadline_at), client._iter_options(**options):
+                for page in pages:
+                    if not put((page, None)):
+                        break
+                else:
+                    put((_DONE, None))
+        except Exception as e:
+            put((None, e))
+        finally:
+            pages.close()
+
+    producer = threading.Thread(target=produce, name='dce-pager-prefetch')
+    producer.daemon = True
+    producer.start()
+
+    try:
+        while True:
+            page, error = pending.get()
+            if error is not None:
+                raise error
+            if page is _DONE:
+                return
+            yield page
+    finally:
+        stop.set()
+
+
+class Pager(object):
+    """
+    Iterate a listing page by page.
+
+    If `paging` is given, every page is requested from server with the
+    paging query params, else the iterated listing is chunked into pages
+    on the client side. In both cases only the current page and the one
+    being prefetched are kept in memory.
+
+    Usage::
+
+        pager = Pager(client.list_registry_namespaced_repository,
+                      'buildin-registry', 'library', page_size=200)
+        for page in pager.pages():
+            ...
+        for repository in pager:
+            ...
+    """
+
+    def __init__(self, method, *args, **kwargs):
+        """
+        :param method: a listing method of client, e.g. `client.list_account`.
+        :param args: the positional arguments of method.
+        :param page_size: the number of objects per page.
+        :param paging: an :class:`OffsetPaging` or :class:`PagePaging`
+                       if the endpoint supports pagination, else None.
+        :param prefetch: if `True`, fetch the next page in background.
+        :param kwargs: the other keyword arguments of method.
+
+        :raise ValueError: if `page_size` is not a positive integer.
+        """
+        self.page_size = kwargs.pop('page_size', DEFAULT_PAGE_SIZE)
+        self.paging = kwargs.pop('paging', None)
+        self.prefetch = kwargs.pop('prefetch', True)
+        if not isinstance(self.page_size, int) or self.page_size <= 0:
+            raise ValueError(
+                "'page_size' got an unexpected value: {0}, "
+                "expected a positive integer".format(self.page_size)
+            )
+
+        self.method = method
+        self.client = method.__self__
+        self.args = args
+        self.kwargs = kwargs
+
+    def _iter_server_pages(self):
+        first = None
+        page = 0
+        while True:
+            params = self.paging.params(page, self.page_size)
+            with self.client._iter_options(params=params):
+                objects = self.method(*self.args, iter=True, **self.kwargs)
+            try:
+                # one more object than a page tells whether the endpoint
+                # ignores the paging params
+                objects_ = list(islice(objects, self.page_size + 1))
+                if len(objects_) > self.page_size:
+                    for chunk in _chunks(chain(objects_, objects),
+                                         self.page_size):
+                        yield chunk
+                    return
+            finally:
+                objects.close()
+
+            if page == 0:
+                first = objects_
+            elif objects_ == first:
+                # the endpoint ignores the paging params, and returned
+                # the first page again
+                return
+            if objects_:
+                yield objects_
+            if len(objects_) < self.page_size:
+                return
+            page += 1
+
+    def _iter_client_pages(self):
+        objects = self.method(*self.args, iter=True, **self.kwargs)
+        try:
+            for chunk in _chunks(objects, self.page_size):
+                yield chunk
+        finally:
+            objects.close()
+
+    def pages(self):
+        """
+        :return: a generator of lists, one per page.
+
+        :raise APIError: if server returns an error.
+        """
+        if self.paging is not None:
+            pages = self._iter_server_pages()
+        else:
+            pages = self._iter_client_pages()
+
+        return _prefetch(pages, self.client) if self.prefetch else pages
+
+    def __iter__(self):
+        for page in self.pages():
+            for object_ in page:
+                yield object_
+
+    def __repr__(self):
+        return '<Pager {0} page_size={1}>'.format(
+            self.method.__name__, self.page_size
+        )
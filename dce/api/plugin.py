@@ -116,7 +116,7 @@ class PluginApiMixin(ExtensionApiMixin):
         url = '/plugins/{0}'.format(plugin)
 
         res = self._delete(self._url(url))
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def validate_plugin(self, image=None, auth=None):
         """
@@ -377,4 +377,4 @@ class PluginApiMixin(ExtensionApiMixin):
         )
 
 
-wrap_checking_resource(PluginApiMixin)
+wrap_checking_resource(PluginApiMixin, exclude=('config',))
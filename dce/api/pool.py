@@ -0,0 +1,147 @@
+# coding=utf-8
+import weakref
+import threading
+
+from .client import APIClient
+from .cache import ResponseCache
+from .conditional import MemoryValidatorStore
+from .retry import RetryPolicy
+from .limiter import EndpointLimiter
+from .breaker import CircuitBreaker
+from .hedge import HedgePolicy
+
+
+class _PooledClient(APIClient):
+    """
+    An :class:`APIClient` owned by one thread of :class:`ClientPool`,
+    whose discovered metadata is shared by the pool.
+    """
+
+    def __init__(self, pool, *args, **kwargs):
+        self._pool = pool
+        super(_PooledClient, self).__init__(*args, **kwargs)
+
+    def _discover(self):
+        self._pool._discover(self)
+
+    @property
+    def info(self):
+        return self._pool.info
+
+
+class ClientPool(object):
+    """
+    A thread-safe facade of :class:`APIClient`.
+
+    Every thread uses its own client, thus its own session and
+    connections, while the prefix, versions and info of DCE are retrieved
+    only once and shared by all threads. The API methods of client can
+    be called on the pool directly::
+
+        pool = ClientPool(base_url, username=username, password=password)
+        accounts = pool.list_account()
+    """
+
+    def __init__(self, base_url=None, **kwargs):
+        """
+        :param base_url: the base url of DCE.
+        :param kwargs: the other arguments of :class:`APIClient`.
+
+        :raise InvalidVersion: if the version of DCE is not supported.
+        """
+        lazy = kwargs.pop('lazy', False)
+        # share the response cache, validators, retry budget, endpoint
+        # limits, circuit breaker and hedge policy between threads
+        cache = kwargs.get('cache')
+        if cache is True:
+            kwargs['cache'] = ResponseCache()
+        elif isinstance(cache, dict):
+            kwargs['cache'] = ResponseCache(ttls=cache)
+        if kwargs.get('conditional') is True:
+            kwargs['conditional'] = MemoryValidatorStore()
+        retry = kwargs.get('retry')
+        if retry is True:
+            kwargs['retry'] = RetryPolicy()
+        elif isinstance(retry, int) and not isinstance(retry, bool):
+            kwargs['retry'] = RetryPolicy(total=retry)
+        if isinstance(kwargs.get('limits'), dict):
+            kwargs['limits'] = EndpointLimiter(kwargs['limits'])
+        if kwargs.get('breaker') is True:
+            kwargs['breaker'] = CircuitBreaker()
+        hedge = kwargs.get('hedge')
+        self._owns_hedge_policy = hedge is True or \
+            isinstance(hedge, (list, tuple))
+        if hedge is True:
+            kwargs['hedge'] = HedgePolicy()
+        elif isinstance(hedge, (list, tuple)):
+            kwargs['hedge'] = HedgePolicy(templates=hedge)
+
+        self.base_url = base_url
+        self._kwargs = kwargs
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._clients = weakref.WeakSet()
+        self._versions = None
+        self._info = None
+
+        if not lazy:
+            self.client._versions
+
+    def _discover(self, client):
+        with self._lock:
+            if self._versions is None:
+                APIClient._discover(client)
+                self._kwargs['prefix'] = client._resolved_prefix
+                self._versions = client._resolved_versions
+            else:
+                client._resolved_prefix = self._kwargs['prefix']
+                client._resolved_versions = self._versions
+                client._check_version()
+
+    @property
+    def client(self):
+        """
+        The client of current thread.
+        """
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            with self._lock:
+                client = _PooledClient(self, self.base_url, lazy=True,
+                                       **self._kwargs)
+                if self._versions is not None:
+                    client._resolved_versions = self._versions
+                    client._check_version()
+                self._clients.add(client)
+            self._local.client = client
+        return client
+
+    @property
+    def info(self):
+        if self._info is None:
+            with self._lock:
+                if self._info is None:
+                    client = self.client
+                    self._info = client._result(
+                        client._get(client._url('/info')), json=True
+                    )
+        return self._info
+
+    def close(self):
+        """
+        Close the clients of all threads, and the hedge policy if it was
+        created by the pool.
+        """
+        with self._lock:
+            for client in list(self._clients):
+                client.close()
+        hedge = self._kwargs.get('hedge')
+        if self._owns_hedge_policy and hedge is not None:
+            hedge.shutdown()
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def __repr__(self):
+        return "<DCEClientPool '%s'>" % self.base_url
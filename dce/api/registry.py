@@ -101,7 +101,7 @@ class RegistryApiMixin:
         url = '/registries/{0}/namespaces/{1}'.format(registry, namespace)
 
         res = self._delete(self._url(url))
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def authorize_team_for_registry_namespace(self, registry, namespace,
                                               team_id=None, role=None):
@@ -139,7 +139,7 @@ class RegistryApiMixin:
         url = '/registries/{0}/namespaces/{1}/accessible-list'.format(registry, namespace)
 
         res = self._delete(self._url(url), params={'TeamId': team_id})
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def list_repository_for_all_registry_namespaces(self, registry, with_remote='True',
                                                     iter=False, limit=None):
@@ -298,7 +298,7 @@ class RegistryApiMixin:
         )
 
         res = self._delete(self._url(url))
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def check_registry_namespaced_repository_tags(self, registry, namespace, repository,
                                                   tags=None):
@@ -363,7 +363,7 @@ class RegistryApiMixin:
         })
 
         res = self._post(self._url(url), json=data)
-        self._raise_for_status(res)
+        return self._raise_for_status(res)
 
     def read_registry_info(self, registry):
         """
@@ -0,0 +1,249 @@
+# coding=utf-8
+import time
+import random
+import threading
+from email.utils import parsedate_tz, mktime_tz
+
+import requests
+
+from ..consts import (
+    DEFAULT_RETRY_TOTAL, DEFAULT_RETRY_BACKOFF_FACTOR,
+    DEFAULT_RETRY_BACKOFF_MAX, DEFAULT_RETRY_STATUSES,
+    DEFAULT_RETRY_BUDGET_RATIO, DEFAULT_RETRY_BUDGET_MIN_PER_SECOND,
+    DEFAULT_RETRY_BUDGET_MAX_TOKENS, IDEMPOTENT_METHODS
+)
+
+# the errors raised before a response was received
+RETRYABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout
+)
+
+
+def parse_retry_after(value):
+    """
+    Parse the `Retry-After` header, either seconds or a HTTP date.
+
+    :return: the seconds to wait, or None if the value is invalid.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(mktime_tz(parsed) - time.time(), 0)
+
+
+class RetryBudget(object):
+    """
+    Limit the retries to a ratio of requests, so that retries can't
+    amplify the load of a DCE which is already failing.
+
+    Every request deposits `ratio` tokens and every retry withdraws one,
+    the tokens are also refilled at `min_per_second` to allow retrying
+    when there are few requests.
+    """
+
+    def __init__(self, ratio=DEFAULT_RETRY_BUDGET_RATIO,
+                 min_per_second=DEFAULT_RETRY_BUDGET_MIN_PER_SECOND,
+                 max_tokens=DEFAULT_RETRY_BUDGET_MAX_TOKENS):
+        """
+        :param ratio: the retries allowed per request.
+        :param min_per_second: the retries always allowed per second.
+        :param max_tokens: the maximum number of retries accumulated.
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens)
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(
+            self._tokens + (now - self._updated_at) * self.min_per_second,
+            self.max_tokens
+        )
+        self._updated_at = now
+
+    def deposit(self):
+        with self._lock:
+            self._refill(time.time())
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self):
+        """
+        :return: `True` if a retry is allowed.
+        """
+        with self._lock:
+            self._refill(time.time())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill(time.time())
+            return self._tokens
+
+
+class RetryStats(object):
+    """
+    Counters of retries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.budget_exhausted = 0
+        self.reasons = {}
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_retry(self, reason):
+        with self._lock:
+            self.retries += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def record_exhausted(self, budget=False):
+        with self._lock:
+            if budget:
+                self.budget_exhausted += 1
+            else:
+                self.exhausted += 1
+
+    def as_dict(self):
+        """
+        :return: a dict including `Requests`, `Retries`, `Exhausted`,
+                 the number of requests given up after all attempts,
+                 `BudgetExhausted`, the number of retries denied by
+                 the budget, and `Reasons`, the retries by status code
+                 or error.
+        """
+        with self._lock:
+            return {
+                'Requests': self.requests,
+                'Retries': self.retries,
+                'Exhausted': self.exhausted,
+                'BudgetExhausted': self.budget_exhausted,
+                'Reasons': dict(self.reasons)
+            }
+
+
+class RetryPolicy(object):
+    """
+    Decide whether and when a failed request is retried.
+
+    A request is retried on the connection errors and timeouts, or the
+    responses whose status is in `statuses`, if its method is in
+    `methods`, by default the idempotent methods only. The delays grow
+    exponentially with full jitter, unless the server asks for a delay
+    by `Retry-After`.
+
+    The policy, including its budget and statistics, can be shared by
+    many clients.
+    """
+
+    def __init__(self, total=DEFAULT_RETRY_TOTAL,
+                 backoff_factor=DEFAULT_RETRY_BACKOFF_FACTOR,
+                 backoff_max=DEFAULT_RETRY_BACKOFF_MAX,
+                 statuses=DEFAULT_RETRY_STATUSES,
+                 methods=IDEMPOTENT_METHODS, jitter=True,
+                 respect_retry_after=True, budget=None):
+        """
+        :param total: the maximum number of retries of a request, or a
+                      dict mapping methods to their maximum numbers.
+        :param backoff_factor: the delay before the first retry, doubled
+                               for every following retry.
+        :param backoff_max: the maximum delay, a `Retry-After` longer than
+                            it is not honored and the request fails.
+        :param statuses: the status codes to retry.
+        :param methods: the methods to retry, non-idempotent methods
+                        like `POST` may be duplicated by retrying.
+        :param jitter: if `True`, the delay is random between 0 and
+                       the exponential delay.
+        :param respect_retry_after: if `True`, wait as `Retry-After` asks.
+        :param budget: a :class:`RetryBudget`, `None` for the default
+                       budget, or `False` for unlimited retries.
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        if budget is None:
+            budget = RetryBudget()
+        self.budget = budget or None
+        self.stats = RetryStats()
+
+    def _total(self, method):
+        if isinstance(self.total, dict):
+            return self.total.get(method, 0)
+        return self.total
+
+    def backoff(self, attempt):
+        """
+        :param attempt: the number of retries done.
+
+        :return: the seconds to wait before next retry.
+        """
+        delay = min(self.backoff_factor * (2 ** attempt), self.backoff_max)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def next_delay(self, method, attempt, response=None, error=None):
+        """
+        Decide whether to retry the request after an attempt.
+
+        :param method: the method of request.
+        :param attempt: the number of retries done.
+        :param response: the response of attempt.
+        :param error: the error raised by attempt.
+
+        :return: the seconds to wait before retrying,
+                 or None if the request should not be retried.
+        """
+        if attempt == 0:
+            self.stats.record_request()
+            if self.budget is not None:
+                self.budget.deposit()
+
+        if error is not None:
+            reason = type(error).__name__
+        elif response.status_code in self.statuses:
+            reason = str(response.status_code)
+        else:
+            return None
+        if method.upper() not in self.methods:
+            return None
+
+        if attempt >= self._total(method.upper()):
+            self.stats.record_exhausted()
+            return None
+
+        delay = None
+        if response is not None and self.respect_retry_after:
+            delay = parse_retry_after(response.headers.get('Retry-After'))
+            if delay is not None and delay > self.backoff_max:
+                return None
+        if delay is None:
+            delay = self.backoff(attempt)
+
+        if self.budget is not None and not self.budget.withdraw():
+            self.stats.record_exhausted(budget=True)
+            return None
+
+        self.stats.record_retry(reason)
+        return delay
@@ -0,0 +1,288 @@
+# coding=utf-8
+import time
+import bisect
+import threading
+
+from ..consts import (
+    DEFAULT_SEARCH_INDEX_REFRESH_SECONDS,
+    DEFAULT_SEARCH_INDEX_MIN_REFRESH_SECONDS
+)
+from .inventory import fingerprint
+
+
+def _trigrams(text):
+    return set(text[i:i + 3] for i in range(len(text) - 2))
+
+
+class RepositoryIndex(object):
+    """
+    An in-process index of the repositories of registries, answering
+    prefix and substring searches of repository names locally.
+
+    Repositories are indexed by `name` and `namespace/name`, in lower
+    case. Prefixes are looked up by bisecting a sorted list, substrings
+    by intersecting the trigrams of query, so searches don't scan
+    the repositories unless the query is shorter than three characters.
+
+    The index is updated incrementally, only the repositories changed
+    since the last update are re-indexed.
+    """
+
+    def __init__(self, registries,
+                 refresh_interval=DEFAULT_SEARCH_INDEX_REFRESH_SECONDS,
+                 min_refresh_interval=DEFAULT_SEARCH_INDEX_MIN_REFRESH_SECONDS):
+        """
+        :param registries: the names of indexed registries.
+        :param refresh_interval: the seconds between background refreshes.
+        :param min_refresh_interval: the minimum seconds between refreshes
+                                     requested by missed searches.
+        """
+        self.registries = list(registries)
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+
+        self._lock = threading.Lock()
+        # (registry, namespace, name) -> (fingerprint, text, repository)
+        self._entries = {}
+        # sorted (indexed name, key) pairs
+        self._names = []
+        self._trigrams = {}
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.refreshed_at = None
+        self.last_error = None
+
+    @property
+    def ready(self):
+        return self.refreshed_at is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add(self, key, digest, repository):
+        text = '{0}/{1}'.format(key[1], key[2]).lower()
+        self._entries[key] = (digest, text, repository)
+        for name in set((key[2].lower(), text)):
+            bisect.insort(self._names, (name, key))
+        for trigram in _trigrams(text):
+            self._trigrams.setdefault(trigram, set()).add(key)
+
+    def _remove(self, key):
+        _, text, _ = self._entries.pop(key)
+        for name in set((key[2].lower(), text)):
+            index = bisect.bisect_left(self._names, (name, key))
+            del self._names[index]
+        for trigram in _trigrams(text):
+            keys = self._trigrams[trigram]
+            keys.discard(key)
+            if not keys:
+                del self._trigrams[trigram]
+
+    def update(self, registry, repositories):
+        """
+        Replace the indexed repositories of registry.
+
+        :param registry: the name of registry.
+        :param repositories: an iterable of repositories including
+                             `Namespace` and `Name` fields.
+
+        :return: a tuple of the numbers of indexed and removed repositories.
+        """
+        digests = {}
+        objects = {}
+        for repository in repositories:
+            key = (registry, repository.get('Namespace') or '',
+                   repository['Name'])
+            digests[key] = fingerprint(repository)
+            objects[key] = repository
+
+        indexed = removed = 0
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == registry]:
+                if key not in digests:
+                    self._remove(key)
+                    removed += 1
+            for key, digest in digests.items():
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == digest:
+                    continue
+                if entry is not None:
+                    self._remove(key)
+                self._add(key, digest, objects[key])
+                indexed += 1
+        return indexed, removed
+
+    def refresh(self, client):
+        """
+        Update the index from the repository listings of registries.
+
+        :param client: an :class:`APIClient`.
+        """
+        for registry in self.registries:
+            repositories = client.list_repository_for_all_registry_namespaces(
+                registry, with_remote='False', iter=True
+            )
+            self.update(registry, repositories)
+        self.refreshed_at = time.time()
+
+    def prefix(self, prefix, limit=None):
+        """
+        :return: a list of repositories whose name or `namespace/name`
+                 starts with prefix, case-insensitively, ordered by
+                 the matched name.
+        """
+        prefix = prefix.lower()
+        keys = []
+        seen = set()
+        with self._lock:
+            index = bisect.bisect_left(self._names, (prefix,))
+            while index < len(self._names) and len(keys) != limit:
+                name, key = self._names[index]
+                if not name.startswith(prefix):
+                    break
+                if key not in seen:
+                    seen.add(key)
+                    keys.append(key)
+                index += 1
+            return [self._entries[key][2] for key in keys]
+
+    def search(self, query, limit=None):
+        """
+        :return: a list of repositories whose `namespace/name` contains
+                 query, case-insensitively, ordered by `namespace/name`.
+        """
+        query = query.lower()
+        with self._lock:
+            if len(query) < 3:
+                keys = [key for key, entry in self._entries.items()
+                        if query in entry[1]]
+            else:
+                candidates = sorted(
+                    (self._trigrams.get(trigram, ())
+                     for trigram in _trigrams(query)), key=len
+                )
+                keys = [key for key in candidates[0]
+                        if all(key in keys_ for keys_ in candidates[1:]) and
+                        query in self._entries[key][1]]
+            keys.sort(key=lambda key: self._entries[key][1])
+            return [self._entries[key][2] for key in keys[:limit]]
+
+    def _run(self, client):
+        while not self._stopped.is_set():
+            try:
+                self.refresh(client)
+                self.last_error = None
+            except Exception as e:
+                # keep serving the last index, retried on next refresh
+                self.last_error = e
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+
+    def start(self, client):
+        """
+        Refresh the index in a background thread every `refresh_interval`
+        seconds, or sooner if a search missed.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, args=(client,))
+            self._thread.daemon = True
+            self._thread.start()
+
+    def refresh_soon(self):
+        """
+        Wake the background refresh, unless the index was refreshed within
+        `min_refresh_interval` seconds.
+        """
+        refreshed_at = self.refreshed_at
+        if refreshed_at is None or \
+                time.time() - refreshed_at >= self.min_refresh_interval:
+            self._wake.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def __repr__(self):
+        return '<RepositoryIndex repositories={0} registries={1}>'.format(
+            len(self), ', '.join(self.registries)
+        )
+
+
+class SearchIndexMixin(object):
+    search_index = None
+
+    def index_repositories(self, registries, refresh_interval=None):
+        """
+        Build an in-process index of the repositories of registries,
+        refreshed in a background thread, and answer
+        :meth:`search_repository` with it.
+
+        :param registries: the names of indexed registries.
+        :param refresh_interval: the seconds between refreshes.
+
+        :return: the :class:`RepositoryIndex`.
+        """
+        if self.search_index is not None:
+            self.search_index.stop()
+        self.search_index = RepositoryIndex(
+            registries,
+            refresh_interval or DEFAULT_SEARCH_INDEX_REFRESH_SECONDS
+        )
+        self.search_index.start(self)
+        return self.search_index
+
+    def search_repository(self, query, prefix=False, limit=None):
+        """
+        Search repositories by name.
+
+        Searches are answered by :attr:`search_index` if built by
+        :meth:`index_repositories`. On a miss, i.e. the index is not
+        ready yet or has no match, the server is searched by
+        :meth:`search_repository_and_image_in_registry`, whose matches
+        are filtered by substring unless `prefix` is `True`, and the
+        index is refreshed in background. The server only searches
+        prefixes, so a substring in the middle of names is found only
+        once the index is ready.
+
+        :param query: the prefix or substring of repository names.
+        :param prefix: if `True`, search repositories whose name or
+                       `namespace/name` starts with query, else those
+                       whose `namespace/name` contains query.
+        :param limit: the maximum number of repositories returned,
+                      if None, return all matched repositories.
+
+        :return: a list of repositories.
+
+        :raise APIError: if server returns an error.
+        """
+        index = self.search_index
+        if index is not None and index.ready:
+            if prefix:
+                result = index.prefix(query, limit=limit)
+            else:
+                result = index.search(query, limit=limit)
+            if result:
+                return result
+            index.refresh_soon()
+
+        result = self.search_repository_and_image_in_registry(
+            prefix=query
+        ).get('ByRepoName') or []
+        if not prefix:
+            query = query.lower()
+            result = [
+                repository for repository in result
+                if query in '{0}/{1}'.format(
+                    repository.get('Namespace') or '', repository['Name']
+                ).lower()
+            ]
+        return result[:limit]
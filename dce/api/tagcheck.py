@@ -0,0 +1,117 @@
+# coding=utf-8
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ..consts import (
+    DEFAULT_TAG_CHECK_WORKERS, DEFAULT_TAG_CHECK_BATCH_SIZE,
+    DEFAULT_TAG_CACHE_SIZE
+)
+from ..utils.cache import LRUCache
+from .deadline import current_deadline, deadline_scope
+
+
+def _existing_tags(result):
+    """
+    :return: the set of tags marked as existing in the `RelatedTable`
+             returned by :meth:`check_registry_namespaced_repository_tags`.
+    """
+    table = result.get('RelatedTable') or {}
+    return set(tag for tag, exists in table.items() if exists)
+
+
+class TagCheckMixin(object):
+    tag_cache = None
+
+    def _check_tags_of(self, deadline_at, registry, repository, tags):
+        namespace, name = repository.split('/', 1)
+        with deadline_scope(deadline_at):
+            result = self.check_registry_namespaced_repository_tags(
+                registry, namespace, name, tags=tags
+            )
+        return repository, tags, _existing_tags(result)
+
+    def bulk_check_tags(self, registry, pairs,
+                        max_workers=DEFAULT_TAG_CHECK_WORKERS,
+                        batch_size=DEFAULT_TAG_CHECK_BATCH_SIZE,
+                        cache_ttl=None):
+        """
+        Check whether tags exist in many repositories::
+
+            client.bulk_check_tags('buildin-registry', [
+                ('library/nginx', '1.19'), ('team/api', 'v2')
+            ])
+
+        Pairs are deduplicated and grouped by repository, and the tags of
+        each repository are checked by one
+        :meth:`check_registry_namespaced_repository_tags` request per
+        `batch_size` tags, sent concurrently by `max_workers` threads.
+
+        If `cache_ttl` is given, the tags found are remembered in
+        :attr:`tag_cache` for `cache_ttl` seconds and not checked again
+        by the following calls. Missing tags are never cached, since
+        they may be pushed anytime.
+
+        :param registry: the name of registry.
+        :param pairs: an iterable of `(repository, tag)`, repository is
+                      `namespace/name`.
+        :param max_workers: the maximum number of concurrent requests.
+        :param batch_size: the maximum number of tags per request.
+        :param cache_ttl: the seconds to cache existing tags.
+
+        :return: a dict mapping each pair to `True` if the tag exists,
+                 else `False`.
+
+        :raise ValueError: if a repository is not `namespace/name`.
+        :raise APIError: if server returns an error.
+        """
+        results = {}
+        groups = OrderedDict()
+        for repository, tag in pairs:
+            if (repository, tag) in results:
+                continue
+            if '/' not in repository:
+                raise ValueError(
+                    "Repository '{0}' is not 'namespace/name'".format(
+                        repository
+                    )
+                )
+            if cache_ttl is not None and self.tag_cache is not None and \
+                    self.tag_cache.get((registry, repository, tag)):
+                results[(repository, tag)] = True
+                continue
+            results[(repository, tag)] = False
+            groups.setdefault(repository, []).append(tag)
+
+        requests = [
+            (repository, tags[i:i + batch_size])
+            for repository, tags in groups.items()
+            for i in range(0, len(tags), batch_size)
+        ]
+        if not requests:
+            return results
+
+        if cache_ttl is not None and self.tag_cache is None:
+            self.tag_cache = LRUCache(maxsize=DEFAULT_TAG_CACHE_SIZE)
+        deadline_at = current_deadline()
+        with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(requests))) as executor:
+            futures = [
+                executor.submit(self._check_tags_of, deadline_at, registry,
+                                repository, tags)
+                for repository, tags in requests
+            ]
+            for future in futures:
+                try:
+                    repository, tags, existing = future.result()
+                except Exception:
+                    for future_ in futures:
+                        future_.cancel()
+                    raise
+                for tag in tags:
+                    if tag not in existing:
+                        continue
+                    results[(repository, tag)] = True
+                    if cache_ttl is not None:
+                        self.tag_cache.set((registry, repository, tag), True,
+                                           ttl=cache_ttl)
+        return results
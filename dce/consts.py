@@ -5,7 +5,51 @@ from .version import version
 DEFAULT_DCE_VERSION = '2.7.14'
 MINIMUM_DCE_VERSION = '2.6.0'
 DEFAULT_TIMEOUT_SECONDS = 60
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10
+DEFAULT_ASYNC_POOL_SIZE = 100
+DEFAULT_DISCOVERY_CACHE_PATH = '~/.dce/discovery.json'
+DEFAULT_DISCOVERY_CACHE_TTL = 24 * 60 * 60
 STREAM_HEADER_SIZE_BYTES = 8
+STREAM_CHUNK_SIZE_BYTES = 64 * 1024
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_BATCH_WORKERS = 8
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_TCP_KEEPALIVE_IDLE = 60
+DEFAULT_TCP_KEEPALIVE_INTERVAL = 10
+DEFAULT_TCP_KEEPALIVE_COUNT = 6
+DEFAULT_RESPONSE_CACHE_SIZE = 1024
+DEFAULT_VALIDATOR_STORE_SIZE = 256
+DEFAULT_VALIDATOR_STORE_PATH = '~/.dce/responses'
+DEFAULT_INVENTORY_PATH = '~/.dce/inventory.db'
+DEFAULT_INVENTORY_MAX_AGE = 24 * 3600
+DEFAULT_RETRY_TOTAL = 3
+DEFAULT_RETRY_BACKOFF_FACTOR = 0.5
+DEFAULT_RETRY_BACKOFF_MAX = 30
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+DEFAULT_RETRY_BUDGET_RATIO = 0.2
+DEFAULT_RETRY_BUDGET_MIN_PER_SECOND = 1
+DEFAULT_RETRY_BUDGET_MAX_TOKENS = 10
+DEFAULT_BREAKER_FAILURE_RATE = 0.5
+DEFAULT_BREAKER_WINDOW = 20
+DEFAULT_BREAKER_MIN_CALLS = 10
+DEFAULT_BREAKER_RESET_TIMEOUT = 30
+DEFAULT_BREAKER_HALF_OPEN_PROBES = 1
+DEFAULT_HEDGE_TEMPLATES = ('/accounts/{0}', '/my-account', '/now')
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_MIN_DELAY = 0.01
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_HEDGE_WINDOW = 200
+DEFAULT_HEDGE_WORKERS = 16
+DEFAULT_EXPORT_CHUNK_SIZE = 1000
+DEFAULT_CRAWL_WORKERS = 8
+DEFAULT_CRAWL_MAX_IN_FLIGHT = 32
+DEFAULT_SEARCH_INDEX_REFRESH_SECONDS = 60
+DEFAULT_SEARCH_INDEX_MIN_REFRESH_SECONDS = 5
+DEFAULT_TAG_CHECK_WORKERS = 16
+DEFAULT_TAG_CHECK_BATCH_SIZE = 100
+DEFAULT_TAG_CACHE_SIZE = 100000
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
 
 IS_WINDOWS_PLATFORM = (sys.platform == 'win32')
 
@@ -83,6 +83,36 @@ class NullResource(DCEException):
     pass
 
 
+class BatchDependencyError(DCEException):
+    """
+    An operation of batch was skipped since its dependencies failed.
+    """
+
+
+class CircuitOpenError(DCEException):
+    """
+    A request was rejected without being sent, since the circuit breaker
+    is open after too many failures.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super(CircuitOpenError, self).__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(DCEException):
+    """
+    A request was not sent since the deadline of the call has passed.
+    """
+
+
+class ThrottledError(DCEException):
+    """
+    A request was not sent since the limit of its endpoint allows no
+    more requests right now.
+    """
+
+
 class NotFound(APIError):
     pass
 
@@ -0,0 +1,5 @@
+# coding=utf-8
+from .base import Model
+from .account import Account, Team, Tenant
+from .registry import RegistryNamespace, Repository
+from .plugin import Plugin, PluginJob
@@ -0,0 +1,18 @@
+# coding=utf-8
+from .base import Model
+
+
+class Account(Model):
+    __slots__ = ()
+    fields = ('Id', 'Name', 'Email', 'IsAdmin', 'IsLDAP', 'CreatedAt')
+
+
+class Team(Model):
+    __slots__ = ()
+    fields = ('Id', 'Name', 'Description', 'Members', 'CreatedAt')
+
+
+class Tenant(Model):
+    __slots__ = ()
+    fields = ('Id', 'Name', 'Description', 'LimitCPU', 'LimitMemory',
+              'Constraints', 'Teams', 'CreatedAt')
@@ -0,0 +1,141 @@
+# coding=utf-8
+import json
+
+import six
+from inflection import camelize, underscore
+
+
+class _ModelMeta(type):
+    """
+    Turn the `fields` of model classes into slots named in snake case,
+    e.g. `CreatedAt` into `created_at`.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get('fields', ())
+        attributes = tuple((underscore(key), key) for key in fields)
+        namespace['__slots__'] = tuple(namespace.get('__slots__', ())) + \
+            tuple(attr for attr, _ in attributes)
+
+        cls = super(_ModelMeta, mcs).__new__(mcs, name, bases, namespace)
+        inherited = getattr(cls, '_attributes', ())
+        cls._attributes = inherited + attributes
+        cls._keys = dict((key, attr) for attr, key in cls._attributes)
+        return cls
+
+
+@six.add_metaclass(_ModelMeta)
+class Model(object):
+    """
+    A lightweight record of DCE, decoded from its raw JSON lazily.
+
+    The JSON is decoded on first access of fields, into slots instead of
+    a dict per record. Fields are accessed as attributes in snake case,
+    e.g. `repository.pull_count`, or by their keys in JSON like a dict,
+    e.g. `repository['PullCount']`. The keys which are not declared in
+    `fields` are kept in `extra`.
+    """
+    __slots__ = ('_raw', 'extra')
+    fields = ()
+
+    def __init__(self, raw):
+        """
+        :param raw: the JSON text of record, or a dict decoded already.
+        """
+        self._raw = raw
+        self.extra = None
+
+    @classmethod
+    def from_json(cls, raw):
+        return cls(raw)
+
+    @classmethod
+    def from_list(cls, values):
+        return [cls(value) for value in values]
+
+    def _decode(self):
+        raw = self._raw
+        if isinstance(raw, (six.binary_type, six.text_type)):
+            data = json.loads(raw if isinstance(raw, six.text_type)
+                              else raw.decode('utf-8'))
+        else:
+            data = dict(raw)
+        for attr, key in self._attributes:
+            setattr(self, attr, data.pop(key, None))
+        self.extra = data or None
+        self._raw = None
+
+    def __getattr__(self, name):
+        # only called for the fields which are not decoded yet,
+        # or the attributes which don't exist
+        try:
+            raw = object.__getattribute__(self, '_raw')
+        except AttributeError:
+            raise AttributeError(name)
+        if raw is not None:
+            self._decode()
+            return getattr(self, name)
+
+        extra = self.extra
+        if extra:
+            key = camelize(name)
+            if key in extra:
+                return extra[key]
+        raise AttributeError(name)
+
+    def __getitem__(self, key):
+        attr = self._keys.get(key)
+        if attr is not None:
+            return getattr(self, attr)
+        if self._raw is not None:
+            self._decode()
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """
+        :return: a dict of the fields and extra keys, the declared fields
+                 missing from the JSON are None.
+        """
+        if self._raw is not None:
+            self._decode()
+        data = dict((key, getattr(self, attr))
+                    for attr, key in self._attributes)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self._raw = state
+        self.extra = None
+
+    def __eq__(self, other):
+        if not isinstance(other, Model):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '<{0} {1!r}>'.format(type(self).__name__, self.get('Name'))
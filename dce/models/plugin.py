@@ -0,0 +1,14 @@
+# coding=utf-8
+from .base import Model
+
+
+class Plugin(Model):
+    __slots__ = ()
+    fields = ('Id', 'Name', 'Version', 'Image', 'State', 'Description',
+              'CreatedAt')
+
+
+class PluginJob(Model):
+    __slots__ = ()
+    fields = ('Id', 'Name', 'Plugin', 'State', 'Reason', 'ExtraContext',
+              'CreatedAt', 'UpdatedAt')
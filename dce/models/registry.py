@@ -0,0 +1,15 @@
+# coding=utf-8
+from .base import Model
+
+
+class RegistryNamespace(Model):
+    __slots__ = ()
+    fields = ('Id', 'Name', 'Registry', 'Visibility', 'RepositoryCount',
+              'CreatedAt')
+
+
+class Repository(Model):
+    __slots__ = ()
+    fields = ('Id', 'Name', 'Namespace', 'Registry', 'Visibility',
+              'ShortDescription', 'Description', 'Tags', 'PullCount',
+              'CreatedAt', 'UpdatedAt')
@@ -0,0 +1,123 @@
+# coding=utf-8
+import time
+import threading
+from collections import OrderedDict
+
+MISSING = object()
+
+if hasattr(OrderedDict, 'move_to_end'):
+    def _move_to_end(data, key):
+        data.move_to_end(key)
+else:
+    def _move_to_end(data, key):
+        data[key] = data.pop(key)
+
+
+class LRUCache(object):
+    """
+    A thread-safe cache bounded by size, evicting the least recently used
+    entries, whose entries can expire after given seconds.
+
+    The hits of unbounded cache are counted without lock, thus the
+    statistics are approximate under concurrent access.
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        """
+        :param maxsize: the maximum number of entries, None if unbounded.
+        :param ttl: the default seconds before entries expire,
+                    None if entries never expire.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        if self.maxsize is None:
+            # reading a dict is atomic, the order of unbounded cache
+            # doesn't matter, thus a hit needs no lock.
+            entry = self._data.get(key, MISSING)
+            if entry is not MISSING and \
+                    (entry[1] is None or time.time() < entry[1]):
+                self.hits += 1
+                return entry[0]
+
+        with self._lock:
+            entry = self._data.get(key, MISSING)
+            if entry is MISSING:
+                self.misses += 1
+                return default
+
+            value, expire_at = entry
+            if expire_at is not None and time.time() >= expire_at:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            # the order only matters when entries can be evicted
+            if self.maxsize is not None:
+                _move_to_end(self._data, key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=MISSING):
+        """
+        :param key: a hashable key.
+        :param value: the value.
+        :param ttl: the seconds before the entry expires,
+                    the default ttl of cache if not given.
+        """
+        if ttl is MISSING:
+            ttl = self.ttl
+        expire_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, expire_at)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, MISSING) is not MISSING
+
+    def delete_matching(self, predicate):
+        """
+        Delete the entries whose key matches given predicate.
+
+        :return: the number of deleted entries.
+        """
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        :return: a dict including `Hits`, `Misses`, `Evictions`,
+                 `Expirations` and `Size`.
+        """
+        with self._lock:
+            return {
+                'Hits': self.hits,
+                'Misses': self.misses,
+                'Evictions': self.evictions,
+                'Expirations': self.expirations,
+                'Size': len(self._data)
+            }
+
+    def __len__(self):
+        return len(self._data)
@@ -1,59 +1,121 @@
+import operator
 import functools
 
 from semantic_version import Version
 
 from .. import errors
+from .utils import getargspec
+
+
+def _check_resource_id(resource_name, resource_id):
+    if isinstance(resource_id, dict):
+        resource_id = resource_id.get('Id', resource_id.get('ID'))
+    if not resource_id:
+        raise errors.NullResource(
+            'Resource {0} was not provided, find {1}'.format(
+                resource_name, resource_id
+            )
+        )
 
 
 def check_resource(*resource_names):
+    """
+    Raise :class:`NullResource` if any of the resources, given by their
+    parameter names, is empty, whether it's passed positionally or by
+    keyword. A dict resource is checked by its `Id`.
+
+    The positions of parameters are resolved once when decorating, and
+    the checking is skipped if the `check_resources` of client is False.
+    """
     def decorator(f):
+        names = getargspec(f).args[1:]
+        positions = tuple(
+            (names.index(name), name) for name in resource_names
+        )
+
         @functools.wraps(f)
         def wrapped(self, *args, **kwargs):
-            ags = list(args)
-            for resource_name in resource_names:
-                resource_id = ags.pop()
-                if isinstance(resource_id, dict):
-                    resource_id = resource_id.get('Id', resource_id.get('ID'))
-                if not resource_id:
-                    raise errors.NullResource(
-                        'Resource {0} was not provided, find {1}'.format(
-                            resource_name, resource_id
-                        )
-                    )
+            if self.check_resources:
+                nargs = len(args)
+                for index, name in positions:
+                    if index < nargs:
+                        _check_resource_id(name, args[index])
+                    elif name in kwargs:
+                        _check_resource_id(name, kwargs[name])
             return f(self, *args, **kwargs)
+
         return wrapped
+
     return decorator
 
 
-def minimum_version(version):
+def _client_version(client):
+    try:
+        return client._parsed_dce_version
+    except AttributeError:
+        return Version(client.dce_version)
+
+
+def _version_gate(version, unavailable, relation):
+    """
+    Build a decorator making the method unavailable to the versions of DCE
+    for which `unavailable(client_version, threshold)` is True,
+    the threshold is parsed only once.
+    """
+    threshold = Version(version)
+
     def decorator(f):
+        message = '{0} is not available for DCE version {1} {2}'.format(
+            f.__name__, relation, version
+        )
+
         @functools.wraps(f)
         def wrapper(self, *args, **kwargs):
-            if Version(self.dce_version) < Version(version):
-                raise errors.InvalidVersion(
-                    '{0} is not available for DCE version < {1}'.format(
-                        f.__name__, version
-                    )
-                )
+            if unavailable(_client_version(self), threshold):
+                raise errors.InvalidVersion(message)
             return f(self, *args, **kwargs)
 
+        wrapper.version_gate = (unavailable, threshold, message, f)
         return wrapper
 
     return decorator
 
 
+def minimum_version(version):
+    return _version_gate(version, operator.lt, '<')
+
+
 def maximum_version(version):
-    def decorator(f):
-        @functools.wraps(f)
-        def wrapper(self, *args, **kwargs):
-            if Version(self.dce_version) > Version(version):
-                raise errors.InvalidVersion(
-                    '{0} is not available for DCE version > {1}'.format(
-                        f.__name__, version
-                    )
-                )
-            return f(self, *args, **kwargs)
+    return _version_gate(version, operator.gt, '>')
 
-        return wrapper
 
-    return decorator
+def resolve_version_gates(client):
+    """
+    Shadow the version gated methods unavailable to the client by stubs
+    raising :class:`InvalidVersion`, so that calling them fails without
+    running any other decorators, e.g. the checking of resources.
+
+    The gated properties are not replaced, since instance attributes can't
+    shadow them.
+    """
+    version = _client_version(client)
+    resolved = set()
+    for cls in type(client).__mro__:
+        for name, attr in vars(cls).items():
+            if name in resolved:
+                continue
+            resolved.add(name)
+            gate = getattr(attr, 'version_gate', None)
+            if gate is None or not callable(attr):
+                continue
+            unavailable, threshold, message, f = gate
+            if unavailable(version, threshold):
+                client.__dict__[name] = _unavailable_stub(f, message)
+
+
+def _unavailable_stub(f, message):
+    @functools.wraps(f)
+    def stub(*args, **kwargs):
+        raise errors.InvalidVersion(message)
+
+    return stub
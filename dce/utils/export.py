@@ -0,0 +1,269 @@
+# coding=utf-8
+import io
+import csv
+import json
+from itertools import islice
+
+import six
+
+from ..consts import DEFAULT_EXPORT_CHUNK_SIZE
+
+EXPORT_FORMATS = ('ndjson', 'csv', 'arrow', 'parquet')
+
+_EXTENSIONS = {
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.parquet': 'parquet'
+}
+
+
+def guess_format(path):
+    """
+    Guess the export format by the extension of path.
+
+    :raise ValueError: if the extension is unknown.
+    """
+    for extension, format_ in _EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return format_
+    raise ValueError(
+        "Can't guess the export format of '{0}', expected one of {1}".format(
+            path, ', '.join(sorted(_EXTENSIONS))
+        )
+    )
+
+
+def iter_chunks(records, size):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _as_dict(record):
+    if isinstance(record, six.string_types):
+        return json.loads(record)
+    if hasattr(record, 'to_dict'):
+        return record.to_dict()
+    return record
+
+
+def _scalar(value):
+    # nested values are kept as JSON, so that columns have stable types
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+
+class NDJSONWriter(object):
+    """
+    Write records as newline delimited JSON, the raw JSON text of
+    records is written without being decoded.
+    """
+
+    def __init__(self, fp, columns=None):
+        self.fp = fp
+
+    def write_chunk(self, records):
+        lines = []
+        for record in records:
+            if not isinstance(record, six.string_types):
+                record = json.dumps(_as_dict(record), sort_keys=True)
+            # the text of elements of a JSON array may span lines
+            lines.append(record.replace('\n', ' ').replace('\r', ' '))
+        lines.append('')
+        self.fp.write(u'\n'.join(lines))
+
+    def close(self):
+        pass
+
+
+class CSVWriter(object):
+    """
+    Write records as CSV, nested values are written as JSON.
+    The columns are the keys of the first chunk if not given.
+    """
+
+    def __init__(self, fp, columns=None):
+        self.fp = fp
+        self.columns = list(columns) if columns else None
+        self._writer = None
+
+    def write_chunk(self, records):
+        rows = [_as_dict(record) for record in records]
+        if self._writer is None:
+            if self.columns is None:
+                self.columns = _columns(rows)
+            self._writer = csv.writer(self.fp)
+            self._writer.writerow(self.columns)
+        self._writer.writerows(
+            [_scalar(row.get(column)) for column in self.columns]
+            for row in rows
+        )
+
+    def close(self):
+        pass
+
+
+def _import_pyarrow(format):
+    # pyarrow is optional and slow to import, so it's imported only
+    # when an arrow or parquet file is written
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            'pyarrow is required by the {0} format, '
+            'install it by `pip install dce[arrow]`'.format(format)
+        )
+    return pyarrow
+
+
+def _text(value):
+    if value is None or isinstance(value, six.text_type):
+        return value
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return json.dumps(value, sort_keys=True)
+
+
+class ArrowWriter(object):
+    """
+    Write records as Arrow record batches, to an Arrow IPC file or
+    a Parquet file. Nested values are written as JSON strings.
+
+    The schema is inferred from the first chunk unless `columns` is
+    a `pyarrow.Schema`, and the columns with only nulls in the first
+    chunk are strings. The values of string columns are converted to
+    their JSON text, so that e.g. a number in a column which was null
+    in the first chunk doesn't abort the export. Other values must
+    have the type of their column, give a schema if the first chunk
+    may not be representative.
+    """
+
+    def __init__(self, path, columns=None, format='parquet'):
+        self.pyarrow = _import_pyarrow(format)
+        self.path = path
+        self.format = format
+        self.schema = None
+        self.columns = None
+        if isinstance(columns, self.pyarrow.Schema):
+            self.schema = columns
+            self.columns = list(columns.names)
+        elif columns:
+            self.columns = list(columns)
+        self._writer = None
+
+    def _infer_schema(self, arrays):
+        pyarrow = self.pyarrow
+        table = pyarrow.table(arrays)
+        return pyarrow.schema([
+            field.with_type(pyarrow.string())
+            if pyarrow.types.is_null(field.type) else field
+            for field in table.schema
+        ])
+
+    def _batch(self, rows):
+        arrays = dict(
+            (column, [_scalar(row.get(column)) for row in rows])
+            for column in self.columns
+        )
+        if self.schema is None:
+            self.schema = self._infer_schema(arrays)
+        for field in self.schema:
+            if self.pyarrow.types.is_string(field.type):
+                arrays[field.name] = [_text(value)
+                                      for value in arrays[field.name]]
+        return self.pyarrow.Table.from_pydict(arrays, schema=self.schema)
+
+    def write_chunk(self, records):
+        rows = [_as_dict(record) for record in records]
+        if self.columns is None:
+            self.columns = _columns(rows)
+        table = self._batch(rows)
+        if self._writer is None:
+            if self.format == 'parquet':
+                self._writer = self.pyarrow.parquet.ParquetWriter(
+                    self.path, self.schema
+                )
+            else:
+                self._writer = self.pyarrow.ipc.new_file(
+                    self.path, self.schema
+                )
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _columns(rows):
+    columns = []
+    seen = set()
+    for row in rows:
+        for key in row:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    return columns
+
+
+def export_records(records, path, format=None, columns=None,
+                   chunk_size=DEFAULT_EXPORT_CHUNK_SIZE):
+    """
+    Write records to a file chunk by chunk, so that only a chunk of
+    records is held in memory.
+
+    :param records: an iterable of dicts, models or raw JSON texts.
+    :param path: the path of file.
+    :param format: `ndjson`, `csv`, `arrow` or `parquet`, guessed by
+                   the extension of path if None.
+    :param columns: the columns of csv, arrow and parquet formats,
+                    the keys of the first chunk if None, or a
+                    `pyarrow.Schema` of arrow and parquet formats.
+    :param chunk_size: the number of records per chunk, also the number
+                       of rows per Arrow record batch.
+
+    :return: the number of records written.
+
+    :raise ValueError: if the format is unknown.
+    :raise ImportError: if pyarrow is not installed for
+                        arrow and parquet formats.
+    """
+    format = format or guess_format(path)
+    if format not in EXPORT_FORMATS:
+        raise ValueError(
+            "'format' got an unexpected value: {0}, expected {1}".format(
+                format, ', '.join(EXPORT_FORMATS)
+            )
+        )
+
+    fp = None
+    if format == 'ndjson':
+        fp = io.open(path, 'w', encoding='utf-8')
+        writer = NDJSONWriter(fp)
+    elif format == 'csv':
+        if six.PY2:
+            fp = open(path, 'wb')
+        else:
+            fp = io.open(path, 'w', encoding='utf-8', newline='')
+        writer = CSVWriter(fp, columns=columns)
+    else:
+        writer = ArrowWriter(path, columns=columns, format=format)
+
+    count = 0
+    try:
+        for chunk in iter_chunks(records, chunk_size):
+            writer.write_chunk(chunk)
+            count += len(chunk)
+    finally:
+        writer.close()
+        if fp is not None:
+            fp.close()
+    return count
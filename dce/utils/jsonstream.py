@@ -0,0 +1,226 @@
+# coding=utf-8
+import re
+import codecs
+import json as to_json
+from itertools import chain
+
+try:
+    import ijson.backends.yajl2_c as ijson_c
+except ImportError:
+    ijson_c = None
+
+_STRUCTURE = re.compile(br'[\[\]{}",]')
+_STRING = re.compile(br'["\\]')
+_NON_SPACE = re.compile(br'\S')
+
+_OPENINGS = (b'[', b'{')
+_CLOSINGS = (b']', b'}')
+
+
+def _guess_encoding(data):
+    from requests.utils import guess_json_utf
+
+    if data.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    return guess_json_utf(data) or 'utf-8'
+
+
+class JSONArrayParser(object):
+    """
+    An incremental, byte level tokenizer of JSON arrays.
+
+    Chunks of bytes are fed in, and every element of the top-level array
+    is returned as soon as it's complete, so only the element being
+    parsed is buffered whatever the size of the document is. A document
+    whose top level is not an array is returned as a single element.
+
+    Usage::
+
+        parser = JSONArrayParser()
+        for chunk in chunks:
+            for element in parser.feed(chunk):
+                ...
+        for element in parser.close():
+            ...
+    """
+
+    def __init__(self, json=True):
+        """
+        :param json: if `True`, elements are decoded into python objects,
+                     else the text of every element is returned.
+        """
+        self.json = json
+        self._decoder = None
+        self._encoding = None
+        self._head = b''
+        self._buffer = bytearray()
+        self._depth = 0
+        self._is_array = None
+        self._in_string = False
+        self._escaped = False
+        self._finished = False
+
+    def _element(self, segment):
+        self._buffer.extend(segment)
+        data = bytes(self._buffer).strip()
+        del self._buffer[:]
+        if not data:
+            return []
+        text = data.decode('utf-8')
+        return [to_json.loads(text) if self.json else text]
+
+    def _utf8(self, chunk, final=False):
+        if self._encoding is None:
+            # the encoding of JSON is guessed from the first 4 bytes
+            chunk = self._head + chunk
+            if len(chunk) < 4 and not final:
+                self._head = chunk
+                return b''
+            self._encoding = _guess_encoding(chunk)
+            if self._encoding != 'utf-8':
+                self._decoder = codecs.getincrementaldecoder(self._encoding)()
+        if self._decoder is not None:
+            chunk = self._decoder.decode(chunk).encode('utf-8')
+        return chunk
+
+    def feed(self, chunk):
+        """
+        Feed a chunk of the document.
+
+        :param chunk: bytes.
+
+        :return: a list of the elements completed by given chunk.
+
+        :raise ValueError: if an element is not valid JSON.
+        """
+        if self._finished or not chunk:
+            return []
+        return self._feed(self._utf8(chunk))
+
+    def _feed(self, chunk):
+        if self._is_array is None:
+            match = _NON_SPACE.search(chunk)
+            if match is None:
+                return []
+            self._is_array = chunk[match.start():match.end()] == b'['
+            if self._is_array:
+                self._depth = 1
+                chunk = chunk[match.end():]
+
+        if not self._is_array:
+            self._buffer.extend(chunk)
+            return []
+
+        elements = []
+        pos = start = 0
+        length = len(chunk)
+        while pos < length:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    pos += 1
+                    continue
+                match = _STRING.search(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if chunk[match.start():pos] == b'\\':
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                continue
+
+            match = _STRUCTURE.search(chunk, pos)
+            if match is None:
+                break
+            char, pos = chunk[match.start():match.end()], match.end()
+
+            if char == b'"':
+                self._in_string = True
+            elif char in _OPENINGS:
+                self._depth += 1
+            elif char in _CLOSINGS:
+                self._depth -= 1
+                if self._depth == 1:
+                    elements.extend(self._element(chunk[start:pos]))
+                    start = pos
+                elif self._depth == 0:
+                    elements.extend(self._element(chunk[start:match.start()]))
+                    self._finished = True
+                    return elements
+            elif self._depth == 1:
+                elements.extend(self._element(chunk[start:match.start()]))
+                start = pos
+
+        self._buffer.extend(chunk[start:])
+        return elements
+
+    def close(self):
+        """
+        Finish the document.
+
+        :return: a list of the remaining elements.
+
+        :raise ValueError: if the document is truncated.
+        """
+        elements = []
+        if not self._finished:
+            tail = self._utf8(b'', final=True)
+            if self._decoder is not None:
+                tail += self._decoder.decode(b'', final=True).encode('utf-8')
+            elements = self._feed(tail)
+
+        if self._is_array is False:
+            return self._element(b'')
+        if self._is_array and not self._finished:
+            raise ValueError('Unterminated JSON array')
+        return elements
+
+
+class _ChunkReader(object):
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def read(self, size=-1):
+        if size == 0:
+            return b''
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b''
+
+
+def _iter_c_parser(chunks):
+    return ijson_c.items(_ChunkReader(chunks), 'item', use_float=True)
+
+
+def iter_json_array(chunks, json=True):
+    """
+    Iterate the elements of a JSON array from chunks of bytes.
+
+    The C parser of `ijson` is used to decode elements when installed.
+
+    :param chunks: an iterable of bytes, e.g. `response.iter_content()`.
+    :param json: if `True`, yield python objects, else the text of elements.
+
+    :return: a generator of elements.
+    """
+    chunks = iter(chunks)
+    if ijson_c is not None and json:
+        first = b''
+        for first in chunks:
+            if first.strip():
+                break
+        chunks = chain([first], chunks)
+        if first.lstrip().startswith(b'[') and \
+                _guess_encoding(first) == 'utf-8':
+            for element in _iter_c_parser(chunks):
+                yield element
+            return
+
+    parser = JSONArrayParser(json=json)
+    for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+    for element in parser.close():
+        yield element
@@ -1,12 +1,18 @@
 # encoding=utf-8
-import time
+import re
+import inspect
 import functools
-from inspect import getargspec
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    from inspect import getargspec
 from collections import OrderedDict
 from inflection import camelize
 from itsdangerous import JSONWebSignatureSerializer
 from itsdangerous import TimedJSONWebSignatureSerializer
 
+from .cache import LRUCache, MISSING
+
 true_bool_str = {'yes', 'true', 't', '1'}
 false_bool_str = {'no', 'false', 'f', '0'}
 
@@ -27,7 +33,7 @@ def is_valid_bool_str(v):
 
 
 def check_bool_str(**kwargs):
-    for k, v in kwargs.iteritems():
+    for k, v in kwargs.items():
         if not is_valid_bool_str(v):
             raise ValueError(
                 "'{0}' got a unexpected value, "
@@ -43,61 +49,178 @@ def camelize_dict(values, with_order=False):
     return {camelize(k): v for k, v in values.items() if v}
 
 
-def memoize(fn):
-    cache = fn.cache = {}
+def compile_url_template(template):
+    """
+    Compile the url template of API methods, e.g. `/accounts/{0}`,
+    into a regex matching the formatted paths.
+    """
+    parts = re.split(r'\{[^}]*\}', template)
+    return re.compile('^' + '[^/]+'.join(re.escape(p) for p in parts) + '$')
+
+
+class URLTemplateMap(object):
+    """
+    Map the url templates of API methods to values, looked up by the
+    formatted paths, the templates with less placeholders win.
+    """
+
+    def __init__(self, mapping=None):
+        self._entries = sorted(
+            ((compile_url_template(t), t, v) for t, v in (mapping or {}).items()),
+            key=lambda entry: entry[1].count('{')
+        )
+
+    def lookup(self, path):
+        """
+        :return: a tuple of the matched template and its value,
+                 or None if no template matches.
+        """
+        for regex, template, value in self._entries:
+            if regex.match(path):
+                return template, value
+        return None
+
+    def get(self, path, default=None):
+        matched = self.lookup(path)
+        return default if matched is None else matched[1]
+
+    def items(self):
+        return [(template, value) for _, template, value in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _make_key_builder(fn):
+    """
+    Bind the arguments of calls of `fn` to a tuple key, the parameters
+    are resolved once here instead of on every call, so that
+    `f(1)`, `f(1, b=2)` and `f(a=1)` share the same key if `b` defaults
+    to 2.
+
+    :return: a tuple of the key function and the number of parameters,
+             the positional arguments are the key itself if exactly that
+             many are given, -1 if `fn` takes variable arguments.
+    """
+    spec = getargspec(fn)
+    if spec.varargs or getattr(spec, 'varkw', getattr(spec, 'keywords', None)) \
+            or getattr(spec, 'kwonlyargs', None):
+        def make_key(args, kwargs):
+            if not kwargs:
+                return args
+            return args + (MISSING,) + tuple(sorted(kwargs.items()))
+
+        return make_key, -1
+
+    nargs = len(spec.args)
+    index = dict((name, i) for i, name in enumerate(spec.args))
+    defaults = tuple(spec.defaults or ())
+    template = (MISSING,) * (nargs - len(defaults)) + defaults
+
+    def make_key(args, kwargs):
+        values = list(args) + list(template[len(args):])
+        for name, value in kwargs.items():
+            values[index[name]] = value
+        return tuple(values)
+
+    return make_key, nargs
+
+
+def cached(maxsize=None, ttl=None, per_object=False):
+    """
+    Cache the results of function by its arguments.
+
+    The cache is thread-safe, but a result may be computed more than once
+    by concurrent calls with the same arguments. The calls with unhashable
+    arguments are not cached.
+
+    :param maxsize: the maximum number of cached results, None if unbounded.
+    :param ttl: the seconds before a result expires, None if never.
+    :param per_object: if `True`, the method caches results in its instance
+                       instead of sharing a cache between all instances.
+    """
+    def decorator(fn):
+        make_key, nargs = _make_key_builder(fn)
+
+        def lookup(cache, args, kwargs):
+            if kwargs or len(args) != nargs:
+                try:
+                    key = make_key(args, kwargs)
+                except KeyError:
+                    # an unexpected keyword argument, let `fn` raise
+                    return fn(*args, **kwargs)
+            else:
+                key = args
+            if per_object:
+                # the instance owns the cache, don't refer to it in keys
+                key = key[1:]
+
+            try:
+                value = cache.get(key, MISSING)
+            except TypeError:
+                # unhashable arguments
+                return fn(*args, **kwargs)
+            if value is MISSING:
+                value = fn(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        if per_object:
+            attr = '__cache__%s' % fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(self, *args, **kwargs):
+                cache = self.__dict__.get(attr)
+                if cache is None:
+                    cache = self.__dict__.setdefault(
+                        attr, LRUCache(maxsize=maxsize, ttl=ttl)
+                    )
+                return lookup(cache, (self,) + args, kwargs)
+
+            return wrapper
+
+        cache = LRUCache(maxsize=maxsize, ttl=ttl)
 
-    @functools.wraps(fn)
-    def _memoize(*args, **kwargs):
-        kwargs.update(dict(zip(getargspec(fn).args, args)))
-        key = tuple(kwargs.get(k, None) for k in getargspec(fn).args if k != 'self')
-        if key not in cache:
-            cache[key] = fn(**kwargs)
-        return cache[key]
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return lookup(cache, args, kwargs)
 
-    return _memoize
+        wrapper.cache = cache
+        return wrapper
 
+    return decorator
 
-def memoize_with_expire(expire):
-    def _memoize(fn):
-        cache = fn.cache = {}
-        cache['__last_cached_time'] = time.time()
 
-        @functools.wraps(fn)
-        def __memoize(*args, **kwargs):
-            kwargs.update(dict(zip(getargspec(fn).args, args)))
-            key = tuple(kwargs.get(k, None) for k in getargspec(fn).args if k != 'self')
-            if key not in cache or time.time() > cache['__last_cached_time'] + expire:
-                cache[key] = fn(**kwargs)
-                cache['__last_cached_time'] = time.time()
-            return cache[key]
+def memoize(fn):
+    return cached()(fn)
 
-        return __memoize
 
-    return _memoize
+def memoize_with_expire(expire):
+    return cached(ttl=expire)
 
 
 def memoize_in_object(fn):
-    @functools.wraps(fn)
-    def _memoize(self, *args, **kwargs):
-        kwargs.update(dict(zip(getargspec(fn).args, args)))
-        key = '__cache__%s__' % fn.__name__ + ','.join(str(kwargs.get(k, None)) for k in getargspec(fn).args)
-        if not hasattr(self, key):
-            setattr(self, key, fn(self, **kwargs))
-        return getattr(self, key)
+    return cached(per_object=True)(fn)
 
-    return _memoize
 
+def wrap_checking_resource(cls, exclude=()):
+    """
+    Check the required parameters of public methods of class are not empty,
+    see :func:`check_resource`.
 
-def wrap_checking_resource(cls):
+    :param exclude: the names of required parameters which are not
+                    resources, e.g. `config`.
+    """
     from .decorators import check_resource
 
-    attrs = cls.__dict__
-    for method in attrs:
-        if not method.startswith('__'):
-            args = getargspec(attrs[method]).args
-            slice_ = len(args) - len((getargspec(attrs[method]).defaults or ()))
-            if slice_ > 1:
-                cls.__dict__[method] = check_resource(*args[1:slice_])(attrs[method])
+    for method, attr in list(cls.__dict__.items()):
+        if method.startswith('__') or not inspect.isfunction(attr):
+            continue
+        spec = getargspec(attr)
+        required = spec.args[1:len(spec.args) - len(spec.defaults or ())]
+        resources = [name for name in required if name not in exclude]
+        if resources:
+            setattr(cls, method, check_resource(*resources)(attr))
 
 
 def gen_token_serializer(expired_in=3600, is_eternal=False):
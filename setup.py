@@ -11,10 +11,15 @@ SOURCE_DIR = os.path.join(ROOT_DIR)
 
 requirements = [
     'docker >= 2.5.1',
-    'semantic-version >= 2.6.0'
+    'semantic-version >= 2.6.0',
+    'futures >= 3.0.0; python_version < "3.2"'
 ]
 
-extras_require = {}
+extras_require = {
+    'async': ['aiohttp >= 3.0'],
+    'ijson': ['ijson >= 3.1'],
+    'arrow': ['pyarrow >= 1.0'],
+}
 
 version = None
 exec (open('dce/version.py').read())
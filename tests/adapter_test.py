@@ -0,0 +1,99 @@
+# coding=utf-8
+import socket
+import unittest
+from contextlib import contextmanager
+
+from requests.packages.urllib3.connection import HTTPConnection
+
+from dce import APIClient
+from dce.api.adapter import DCEHTTPAdapter, keepalive_socket_options
+from tests.fake_server import FakeServer
+
+TCP_OPTIONS = ('TCP_KEEPIDLE', 'TCP_KEEPALIVE', 'TCP_KEEPINTVL', 'TCP_KEEPCNT')
+
+
+@contextmanager
+def socket_constants(**constants):
+    """
+    Replace the TCP keep-alive constants of `socket`, a constant given
+    as None is removed as if the platform doesn't support it.
+    """
+    saved = dict((name, getattr(socket, name))
+                 for name in TCP_OPTIONS if hasattr(socket, name))
+    for name in TCP_OPTIONS:
+        if hasattr(socket, name):
+            delattr(socket, name)
+    for name, value in constants.items():
+        if value is not None:
+            setattr(socket, name, value)
+    try:
+        yield
+    finally:
+        for name in TCP_OPTIONS:
+            if hasattr(socket, name):
+                delattr(socket, name)
+        for name, value in saved.items():
+            setattr(socket, name, value)
+
+
+class KeepaliveSocketOptionsTest(unittest.TestCase):
+    def test_linux(self):
+        with socket_constants(TCP_KEEPIDLE=4, TCP_KEEPINTVL=5, TCP_KEEPCNT=6):
+            options = keepalive_socket_options(idle=60, interval=10, count=3)
+        self.assertEqual(options, [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            (socket.IPPROTO_TCP, 4, 60),
+            (socket.IPPROTO_TCP, 5, 10),
+            (socket.IPPROTO_TCP, 6, 3)
+        ])
+
+    def test_macos(self):
+        # TCP_KEEPIDLE is named TCP_KEEPALIVE on macOS
+        with socket_constants(TCP_KEEPALIVE=16, TCP_KEEPINTVL=257,
+                              TCP_KEEPCNT=258):
+            options = keepalive_socket_options(idle=60)
+        self.assertIn((socket.IPPROTO_TCP, 16, 60), options)
+
+    def test_unsupported(self):
+        with socket_constants():
+            options = keepalive_socket_options()
+        self.assertEqual(options, [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)])
+
+    def test_skip_none(self):
+        with socket_constants(TCP_KEEPIDLE=4, TCP_KEEPINTVL=5, TCP_KEEPCNT=6):
+            options = keepalive_socket_options(interval=None, count=None)
+        self.assertEqual(len(options), 2)
+
+
+class DCEHTTPAdapterTest(unittest.TestCase):
+    def test_default_socket_options(self):
+        adapter = DCEHTTPAdapter()
+        self.assertNotIn('socket_options', adapter.poolmanager.connection_pool_kw)
+
+    def test_merge_socket_options(self):
+        options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        adapter = DCEHTTPAdapter(socket_options=options, pool_maxsize=3,
+                                 pool_block=True)
+        pool_kw = adapter.poolmanager.connection_pool_kw
+        self.assertEqual(pool_kw['socket_options'],
+                         HTTPConnection.default_socket_options + options)
+        self.assertEqual(pool_kw['maxsize'], 3)
+        self.assertTrue(pool_kw['block'])
+
+    def test_pool_stats(self):
+        with FakeServer({'/dce/version': (200, {'DCEVersion': '2.8.0'}),
+                         '/dce/ping': (200, b'OK')}) as server:
+            client = APIClient(server.host, pool_maxsize=4)
+            client.ping()
+            client.ping()
+
+            stats = client.pool_stats()
+            self.assertEqual(list(stats.keys()),
+                             ['http://{0}'.format(server.host)])
+            self.assertEqual(stats['http://{0}'.format(server.host)], {
+                'Connections': 1,
+                'Requests': 3,
+                'Idle': 1,
+                'MaxSize': 4
+            })
+            client.close()
@@ -0,0 +1,145 @@
+# coding=utf-8
+import io
+import json
+import unittest
+
+import requests
+
+from dce.api.advance import (
+    CreateAccountWithTTRN, StreamStats, iter_result
+)
+
+OBJECTS = [{'Name': 'u{0}'.format(i)} for i in range(20000)]
+
+
+def streamed_response(objects, content_length=True):
+    content = json.dumps(objects).encode('utf-8')
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(content)
+    if content_length:
+        response.headers['Content-Length'] = str(len(content))
+    return response, len(content)
+
+
+class IterResultTest(unittest.TestCase):
+    def test_release_before_last_object(self):
+        response, length = streamed_response(OBJECTS)
+        stats = StreamStats()
+        result = iter_result(response, limit=2, json=True, stats=stats)
+
+        self.assertEqual(next(result), OBJECTS[0])
+        self.assertFalse(response.raw.closed)
+        self.assertEqual(next(result), OBJECTS[1])
+        # released before the last object is handed out
+        self.assertTrue(response.raw.closed)
+        self.assertRaises(StopIteration, next, result)
+
+        self.assertEqual(stats.early_releases, 1)
+        self.assertGreater(stats.bytes_avoided, 0)
+        self.assertLess(stats.bytes_avoided, length)
+
+    def test_consumed(self):
+        response, _ = streamed_response(OBJECTS[:10])
+        stats = StreamStats()
+        result = list(iter_result(response, json=True, stats=stats))
+
+        self.assertEqual(result, OBJECTS[:10])
+        self.assertEqual(stats.early_releases, 0)
+        self.assertEqual(stats.bytes_avoided, 0)
+
+    def test_abandoned(self):
+        response, _ = streamed_response(OBJECTS, content_length=False)
+        stats = StreamStats()
+        result = iter_result(response, json=True, stats=stats)
+        next(result)
+        result.close()
+
+        self.assertTrue(response.raw.closed)
+        self.assertEqual(stats.early_releases, 1)
+        # the length of body is unknown
+        self.assertEqual(stats.bytes_avoided, 0)
+
+    def test_limit_type(self):
+        response, _ = streamed_response(OBJECTS[:1])
+        self.assertRaises(TypeError, next,
+                          iter_result(response, limit='1', stats=None))
+
+
+class TTRNClient(CreateAccountWithTTRN):
+    """
+    Record the calls of create_account_with_ttrn, `fail` names
+    the method raising an error.
+    """
+
+    def __init__(self, fail=None):
+        self.fail = fail
+        self.calls = []
+
+    def __getattr__(self, method):
+        if method.startswith('_'):
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            self.calls.append((method, args))
+            if method == self.fail:
+                raise IOError(method)
+            if method == 'create_team':
+                return {'Id': 'team-id', 'Name': args[0]}
+            if method in ('create_tenant', 'create_registry_namespace'):
+                return {'Name': kwargs.get('name') or args[0]}
+            return {'Name': kwargs.get('name')}
+        return call
+
+    def methods(self):
+        return [method for method, _ in self.calls]
+
+
+class CreateAccountWithTTRNTest(unittest.TestCase):
+    def test_created(self):
+        client = TTRNClient()
+        result = client.create_account_with_ttrn(
+            'u1', 'u1@dce', 'secret', registry='r', limit_cpu=2,
+            limit_memory=1024
+        )
+        self.assertEqual(result['Team'], {'Id': 'team-id', 'Name': 'u1'})
+        self.assertEqual(result['Tenant'], {'Name': 'u1'})
+        self.assertEqual(result['RegistryNamespace'], {'Name': 'u1'})
+
+        methods = client.methods()
+        self.assertEqual(sorted(methods), [
+            'add_team_member', 'authorize_team_for_registry_namespace',
+            'create_account', 'create_registry_namespace', 'create_team',
+            'create_tenant', 'patch_registry_namespace', 'put_tenant_quota'
+        ])
+        # the steps run concurrently once their dependencies are done
+        for dependency, step in (
+                ('create_account', 'create_team'),
+                ('create_account', 'create_tenant'),
+                ('create_account', 'create_registry_namespace'),
+                ('create_team', 'add_team_member'),
+                ('create_tenant', 'put_tenant_quota'),
+                ('create_registry_namespace',
+                 'authorize_team_for_registry_namespace'),
+                ('authorize_team_for_registry_namespace',
+                 'patch_registry_namespace')):
+            self.assertLess(methods.index(dependency), methods.index(step))
+        self.assertIn(('add_team_member', ('team-id',)), client.calls)
+
+    def test_no_quota(self):
+        client = TTRNClient()
+        client.create_account_with_ttrn('u1', 'u1@dce', 'secret')
+        self.assertNotIn('put_tenant_quota', client.methods())
+
+    def test_rollback(self):
+        client = TTRNClient(fail='patch_registry_namespace')
+        self.assertRaises(IOError, client.create_account_with_ttrn,
+                          'u1', 'u1@dce', 'secret', registry='r',
+                          max_workers=1)
+        # undone in the reverse order of creation
+        self.assertEqual(client.calls[-4:], [
+            ('delete_registry_namespace', ('r', 'u1')),
+            ('delete_tenant', ('u1',)),
+            ('delete_team', ('team-id',)),
+            ('delete_account', ('u1',))
+        ])
@@ -0,0 +1,81 @@
+# coding=utf-8
+import unittest
+
+from dce.errors import DCEException, NotFound, NullResource
+from tests.fake_server import FakeServer
+
+try:
+    import asyncio
+    from dce.api.async_client import AsyncAPIClient
+except (ImportError, SyntaxError):
+    # aiohttp is not installed or python doesn't support asyncio.
+    AsyncAPIClient = None
+
+ACCOUNTS = [{'Name': 'u{0}'.format(i), 'Email': 'u{0}@dce'.format(i)}
+            for i in range(5000)]
+
+
+@unittest.skipIf(AsyncAPIClient is None, 'aiohttp is not installed')
+class AsyncAPIClientTest(unittest.TestCase):
+    def setUp(self):
+        # only the `/api` prefix is served
+        self.server = FakeServer({
+            '/api/version': (200, {'DCEVersion': '2.8.0'}),
+            '/api/accounts': (200, ACCOUNTS),
+            '/api/accounts/u1': (200, ACCOUNTS[1])
+        }).start()
+        self.loop = asyncio.new_event_loop()
+        self.client = AsyncAPIClient(self.server.host, 'admin', 'admin')
+        self.wait(self.client.open())
+
+    def tearDown(self):
+        self.wait(self.client.close())
+        self.loop.close()
+        self.server.stop()
+
+    def wait(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    def test_open(self):
+        self.assertEqual(self.client._prefix, 'api')
+        self.assertEqual(self.client.dce_version, '2.8.0')
+        self.assertEqual(self.server.hits['/dce/version'], 1)
+        self.assertEqual(self.client.timeout, (10, 60))
+
+        self.assertEqual(self.wait(self.client.read_account('u1')),
+                         ACCOUNTS[1])
+        self.assertEqual(len(self.wait(self.client.list_account())), 5000)
+
+    def test_not_opened(self):
+        client = AsyncAPIClient(self.server.host)
+        with self.assertRaises(DCEException):
+            self.wait(client.read_account('u1'))
+
+    def test_not_found(self):
+        with self.assertRaises(NotFound):
+            self.wait(self.client.read_account('missing'))
+        with self.assertRaises(NotFound):
+            self.wait(self.client.list_account_team('missing', iter=True)
+                     .__anext__())
+
+    def test_iter_early_release(self):
+        result = self.client.list_account(iter=True, limit=2)
+        self.assertEqual(self.wait(result.__anext__()), ACCOUNTS[0])
+        self.assertEqual(self.wait(result.__anext__()), ACCOUNTS[1])
+        with self.assertRaises(StopAsyncIteration):
+            self.wait(result.__anext__())
+
+        stats = self.client.stream_stats
+        self.assertEqual(stats.early_releases, 1)
+        self.assertGreater(stats.bytes_avoided, 0)
+
+        accounts = self.wait(self.client.list_account(limit=3))
+        self.assertEqual(accounts, ACCOUNTS[:3])
+
+    def test_check_resources(self):
+        with self.assertRaises(NullResource):
+            self.client.read_account(None)
+
+        self.client.check_resources = False
+        with self.assertRaises(NotFound):
+            self.wait(self.client.read_account(None))
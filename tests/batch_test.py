@@ -0,0 +1,74 @@
+# coding=utf-8
+import time
+import threading
+import unittest
+
+from dce import Batch, BatchDependencyError
+
+
+class BatchTest(unittest.TestCase):
+    def test_dependency_order(self):
+        order = []
+        lock = threading.Lock()
+
+        def step(name, *args):
+            time.sleep(0.01)
+            with lock:
+                order.append(name)
+            return {'Id': name, 'Args': args}
+
+        with Batch(max_workers=4) as batch:
+            team = batch.add(step, 'team')
+            member = batch.add(step, 'member', team['Id'])
+            quota = batch.add(step, 'quota', depends_on=[member])
+
+        self.assertEqual(order, ['team', 'member', 'quota'])
+        self.assertEqual(member.result['Args'], ('team',))
+        self.assertTrue(quota.ok)
+        self.assertEqual(batch.errors, [])
+
+    def test_independent_items_run_concurrently(self):
+        batch = Batch(max_workers=8)
+        for _ in range(8):
+            batch.add(time.sleep, 0.1)
+        start = time.time()
+        batch.run()
+        self.assertLess(time.time() - start, 0.5)
+
+    def test_failed_dependency_skips_dependents(self):
+        def fail():
+            raise ValueError('boom')
+
+        batch = Batch()
+        failed = batch.add(fail)
+        skipped = batch.add(len, failed)
+        independent = batch.add(len, 'abc')
+        batch.run()
+
+        self.assertIsInstance(failed.error, ValueError)
+        self.assertIsInstance(skipped.error, BatchDependencyError)
+        self.assertEqual(independent.result, 3)
+        self.assertEqual(batch.errors, [failed, skipped])
+
+    def test_foreign_dependency(self):
+        item = Batch().add(len, 'a')
+        with self.assertRaises(ValueError):
+            Batch().add(len, 'b', depends_on=[item])
+
+    def test_rollback(self):
+        undone = []
+
+        def fail(_):
+            raise ValueError('boom')
+
+        batch = Batch(rollback=True)
+        account = batch.add(dict, Name='a', undo=lambda r: undone.append(r['Name']))
+        team = batch.add(dict, Name='t', depends_on=[account],
+                         undo=lambda r: undone.append(r['Name']))
+        failed = batch.add(fail, team)
+        batch.run()
+
+        self.assertEqual(undone, ['t', 'a'])
+        self.assertTrue(team.rolled_back)
+        with self.assertRaises(ValueError):
+            batch.raise_for_errors()
@@ -0,0 +1,104 @@
+# coding=utf-8
+import time
+import unittest
+
+import requests
+
+from dce import APIClient, CircuitBreaker, CircuitOpenError
+from dce.api.breaker import CLOSED, OPEN, HALF_OPEN
+from tests.fake_server import FakeServer
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def call(self, breaker, success):
+        breaker.before_call()
+        breaker.record(success)
+
+    def test_open_on_failure_rate(self):
+        breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=4)
+        for success in (True, False, True):
+            self.call(breaker, success)
+        self.assertEqual(breaker.state, CLOSED)
+        self.call(breaker, False)
+        self.assertEqual(breaker.state, OPEN)
+
+        self.assertRaises(CircuitOpenError, breaker.before_call)
+        stats = breaker.stats()
+        self.assertEqual(stats['Opened'], 1)
+        self.assertEqual(stats['Rejected'], 1)
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(window=2, min_calls=2, reset_timeout=0.01,
+                                 half_open_probes=1)
+        self.call(breaker, False)
+        self.call(breaker, False)
+        time.sleep(0.02)
+        self.assertEqual(breaker.state, HALF_OPEN)
+
+        # only one probe at a time
+        breaker.before_call()
+        self.assertRaises(CircuitOpenError, breaker.before_call)
+        breaker.record(False)
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.02)
+        self.call(breaker, True)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats()['Calls'], 0)
+
+    def test_release_probe(self):
+        breaker = CircuitBreaker(window=1, min_calls=1, reset_timeout=0.01,
+                                 half_open_probes=1)
+        self.call(breaker, False)
+        time.sleep(0.02)
+
+        breaker.before_call()
+        breaker.release()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.call(breaker, True)
+        self.assertEqual(breaker.state, CLOSED)
+
+
+class ClientBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer({
+            '/dce/version': (200, {'DCEVersion': '2.8.0'}),
+            '/dce/ping': (200, b'OK')
+        }).start()
+        self.breaker = CircuitBreaker(window=1, min_calls=1,
+                                      reset_timeout=0.01, half_open_probes=1)
+        self.client = APIClient(self.server.host, breaker=self.breaker)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def raise_on_request(self, error):
+        def request(*args, **kwargs):
+            raise error
+        self.client.request = request
+
+    def test_local_error(self):
+        calls = self.breaker.stats()['Calls']
+        self.raise_on_request(ValueError('local'))
+        self.assertRaises(ValueError, self.client.ping)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats()['Calls'], calls)
+
+    def test_connection_error(self):
+        self.raise_on_request(requests.exceptions.ConnectionError('refused'))
+        self.assertRaises(requests.exceptions.ConnectionError,
+                          self.client.ping)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_interrupted_probe(self):
+        self.breaker.before_call()
+        self.breaker.record(False)
+        time.sleep(0.02)
+
+        self.raise_on_request(KeyboardInterrupt())
+        self.assertRaises(KeyboardInterrupt, self.client.ping)
+        del self.client.request
+        # the probe slot was given back
+        self.assertEqual(self.client.ping(), 'OK')
+        self.assertEqual(self.breaker.state, CLOSED)
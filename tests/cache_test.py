@@ -0,0 +1,134 @@
+# coding=utf-8
+import time
+import unittest
+
+from dce import APIClient, NotFound, ResponseCache
+from dce.api.base import build_response
+from dce.utils.cache import LRUCache
+from dce.utils.utils import URLTemplateMap
+from tests.fake_server import FakeServer
+
+TEAM = {'Name': 'dev', 'Members': ['u1']}
+
+
+def response(content=b'{}', status_code=200):
+    return build_response('http://dce/dce/', status_code, {}, content)
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_evict_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['Evictions'], 1)
+
+    def test_expire(self):
+        cache = LRUCache(ttl=0.01)
+        cache.set('a', 1)
+        cache.set('b', 2, ttl=None)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.stats()['Expirations'], 1)
+
+
+class URLTemplateMapTest(unittest.TestCase):
+    def test_lookup(self):
+        mapping = URLTemplateMap({'/accounts/{0}': 1, '/accounts/admin': 2})
+        self.assertEqual(mapping.get('/accounts/foo'), 1)
+        self.assertEqual(mapping.get('/accounts/admin'), 2)
+        self.assertIsNone(mapping.get('/accounts/foo/teams'))
+        self.assertIsNone(mapping.get('/accounts'))
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_only_cache_configured_endpoints(self):
+        cache = ResponseCache(ttls={'/accounts/{0}': 30})
+        cache.set('/accounts/foo', None, response())
+        cache.set('/accounts', None, response())
+        cache.set('/accounts/bar', None, response(status_code=404))
+        self.assertIsNotNone(cache.get('/accounts/foo'))
+        self.assertIsNone(cache.get('/accounts'))
+        self.assertIsNone(cache.get('/accounts/bar'))
+
+    def test_key_by_params(self):
+        cache = ResponseCache(ttls={'/accounts': 30})
+        cache.set('/accounts', {'Limit': 1, 'Start': 0}, response())
+        self.assertIsNotNone(cache.get('/accounts', {'Start': 0, 'Limit': 1}))
+        self.assertIsNone(cache.get('/accounts'))
+
+    def test_invalidate_related_paths(self):
+        cache = ResponseCache(ttls={
+            '/accounts': 30, '/accounts/{0}': 30,
+            '/accounts/{0}/teams': 30, '/teams/{0}': 30
+        })
+        for path in ('/accounts', '/accounts/foo', '/accounts/foo/teams',
+                     '/accounts/bar', '/teams/foo'):
+            cache.set(path, None, response())
+
+        self.assertEqual(cache.invalidate('/accounts/foo'), 3)
+        self.assertIsNone(cache.get('/accounts'))
+        self.assertIsNone(cache.get('/accounts/foo/teams'))
+        self.assertIsNotNone(cache.get('/accounts/bar'))
+        self.assertIsNotNone(cache.get('/teams/foo'))
+
+
+class ClientCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer({
+            '/dce/version': (200, {'DCEVersion': '2.8.0'}),
+            '/dce/teams': (200, [TEAM]),
+            '/dce/teams/dev': (200, TEAM),
+            '/dce/teams/dev/members': (200, TEAM),
+            '/dce/teams/ops': (200, {'Name': 'ops'}),
+            '/dce/teams/missing': (404, {'message': 'not found'})
+        }).start()
+        self.client = APIClient(self.server.host, cache=True)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_cache_hit(self):
+        self.assertEqual(self.client.read_team('dev'), TEAM)
+        self.assertEqual(self.client.read_team('dev'), TEAM)
+        self.assertEqual(self.server.hits['/dce/teams/dev'], 1)
+        self.assertEqual(self.client.response_cache.stats()['Hits'], 1)
+
+    def test_invalidate_on_write(self):
+        self.client.read_team('dev')
+        self.client.read_team('ops')
+
+        # the hits count the writes to the path too
+        # PATCH of the path itself
+        self.client.patch_team('dev', name='dev')
+        self.client.read_team('dev')
+        self.assertEqual(self.server.hits['/dce/teams/dev'], 3)
+
+        # POST to a sub path invalidates its parent path
+        self.client.add_team_member('dev', name='u2')
+        self.client.read_team('dev')
+        self.assertEqual(self.server.hits['/dce/teams/dev'], 4)
+
+        # DELETE of the path
+        self.client.delete_team('dev')
+        self.client.read_team('dev')
+        self.assertEqual(self.server.hits['/dce/teams/dev'], 6)
+
+        # unrelated paths are kept
+        self.client.read_team('ops')
+        self.assertEqual(self.server.hits['/dce/teams/ops'], 1)
+
+    def test_not_stored(self):
+        for _ in range(2):
+            self.assertRaises(NotFound, self.client.read_team, 'missing')
+        self.assertEqual(self.server.hits['/dce/teams/missing'], 2)
+
+    def test_uncached_endpoint(self):
+        self.client.list_team()
+        self.client.list_team()
+        self.assertEqual(self.server.hits['/dce/teams'], 2)
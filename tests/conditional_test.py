@@ -0,0 +1,98 @@
+# coding=utf-8
+import shutil
+import tempfile
+import unittest
+
+from dce import (
+    APIClient, ValidatorStore, MemoryValidatorStore, FileValidatorStore
+)
+from dce.api.base import build_response
+from dce.api.conditional import StoredResponse
+from tests.fake_server import FakeServer
+
+URL = 'http://dce/dce/tenants?Limit=10'
+
+
+class StoredResponseTest(unittest.TestCase):
+    def test_from_response(self):
+        response = build_response(URL, 200, {
+            'ETag': '"v1"', 'Content-Type': 'application/json',
+            'Server': 'nginx'
+        }, b'[1, 2]')
+        stored = StoredResponse.from_response(response)
+        self.assertEqual(stored.headers, {
+            'ETag': '"v1"', 'Content-Type': 'application/json'
+        })
+        self.assertEqual(stored.conditional_headers(),
+                         {'If-None-Match': '"v1"'})
+        self.assertEqual(stored.to_response(URL).json(), [1, 2])
+
+    def test_no_validators(self):
+        response = build_response(URL, 200, {}, b'[]')
+        self.assertIsNone(StoredResponse.from_response(response))
+
+
+class ValidatorStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _test_store(self, store):
+        self.assertIsNone(store.get(URL))
+        store.set(URL, StoredResponse(
+            {'Last-Modified': 'Mon, 01 Jan 2018 00:00:00 GMT'}, b'[]'
+        ))
+        stored = store.get(URL)
+        self.assertEqual(stored.content, b'[]')
+        self.assertEqual(stored.conditional_headers(), {
+            'If-Modified-Since': 'Mon, 01 Jan 2018 00:00:00 GMT'
+        })
+        store.delete(URL)
+        self.assertIsNone(store.get(URL))
+
+    def test_memory_store(self):
+        self._test_store(MemoryValidatorStore())
+
+    def test_file_store(self):
+        self._test_store(FileValidatorStore(self.directory))
+
+    def test_abstract(self):
+        self.assertRaises(TypeError, ValidatorStore)
+
+        class IncompleteStore(ValidatorStore):
+            def get(self, key):
+                return None
+
+        self.assertRaises(TypeError, IncompleteStore)
+
+
+class ConditionalGetTest(unittest.TestCase):
+    def setUp(self):
+        self.validators = []
+        self.directory = tempfile.mkdtemp()
+        self.server = FakeServer({
+            '/dce/version': (200, {'DCEVersion': '2.8.0'}),
+            '/dce/teams/dev': self.team
+        }).start()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def team(self, request):
+        validator = request.headers.get('If-None-Match')
+        self.validators.append(validator)
+        if validator == '"v1"':
+            return 304, b'', {'ETag': '"v1"'}
+        return 200, {'Name': 'dev'}, {'ETag': '"v1"'}
+
+    def test_replay_on_not_modified(self):
+        for conditional in (True, self.directory):
+            self.validators = []
+            client = APIClient(self.server.host, conditional=conditional)
+            self.assertEqual(client.read_team('dev'), {'Name': 'dev'})
+            self.assertEqual(client.read_team('dev'), {'Name': 'dev'})
+            self.assertEqual(self.validators, [None, '"v1"'])
+            client.close()
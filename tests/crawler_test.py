@@ -0,0 +1,102 @@
+# coding=utf-8
+import time
+import threading
+import unittest
+
+from dce.api.crawler import CrawlerMixin, CrawlStats
+from dce.errors import NotFound
+
+REGISTRY = dict(
+    ('ns{0}'.format(i), ['repo{0}'.format(j) for j in range(5)])
+    for i in range(4)
+)
+
+
+class Client(CrawlerMixin):
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def _enter(self):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+
+    def list_registry_namespace(self, registry, iter=False, limit=None):
+        return [{'Name': name} for name in sorted(REGISTRY)]
+
+    def list_registry_namespaced_repository(self, registry, namespace,
+                                            iter=False, limit=None):
+        self._enter()
+        return [{'Name': name} for name in REGISTRY[namespace]]
+
+    def list_registry_namespaced_repository_tags(self, registry, namespace,
+                                                 repository):
+        self._enter()
+        if repository == 'missing':
+            raise NotFound('not found')
+        return [{'Name': 'latest'}, {'Name': namespace}]
+
+
+class CrawlerTest(unittest.TestCase):
+    def test_crawl(self):
+        client = Client()
+        stats = CrawlStats()
+        results = list(client.crawl_registry('r', max_workers=4,
+                                             stats=stats))
+
+        self.assertEqual(len(results), 20)
+        self.assertEqual(
+            sorted((r['Namespace'], r['Repository']['Name'])
+                   for r in results),
+            sorted((ns, repo) for ns in REGISTRY for repo in REGISTRY[ns])
+        )
+        self.assertTrue(all(r['Tags'][1]['Name'] == r['Namespace']
+                            for r in results))
+        self.assertEqual(stats.requests, 25)
+        self.assertEqual(stats.namespaces, 4)
+        self.assertEqual(stats.repositories, 20)
+        self.assertEqual(stats.tags, 40)
+        self.assertIsNotNone(stats.finished_at)
+        self.assertGreater(stats.throughput, 0)
+        self.assertGreater(client.max_running, 1)
+        self.assertLessEqual(client.max_running, 4)
+
+    def test_max_in_flight(self):
+        client = Client()
+        results = list(client.crawl_registry('r', max_workers=8,
+                                             max_in_flight=2))
+        self.assertEqual(len(results), 20)
+        self.assertLessEqual(client.max_running, 2)
+
+    def test_without_tags(self):
+        client = Client()
+        results = list(client.crawl_registry('r', namespaces=['ns1'],
+                                             tags=False))
+        self.assertEqual([r['Repository']['Name'] for r in results],
+                         REGISTRY['ns1'])
+        self.assertTrue(all(r['Tags'] is None for r in results))
+
+    def test_error_stops_crawl(self):
+        client = Client()
+        REGISTRY['broken'] = ['missing']
+        try:
+            with self.assertRaises(NotFound):
+                list(client.crawl_registry('r', namespaces=['broken']))
+        finally:
+            del REGISTRY['broken']
+
+    def test_close(self):
+        client = Client(delay=0.05)
+        stats = CrawlStats()
+        crawl = client.crawl_registry('r', max_workers=1, max_in_flight=1,
+                                      stats=stats)
+        next(crawl)
+        crawl.close()
+        self.assertLess(stats.requests, 25)
+        self.assertIsNotNone(stats.finished_at)
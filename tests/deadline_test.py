@@ -0,0 +1,71 @@
+# coding=utf-8
+import time
+import unittest
+
+from dce import APIClient, Batch, CircuitBreaker, DeadlineExceeded, deadline
+from dce.api.deadline import clamp_timeout, current_deadline, remaining
+from tests.fake_server import FakeServer
+
+
+class DeadlineTest(unittest.TestCase):
+    def test_clamp_timeout(self):
+        self.assertEqual(clamp_timeout((10, 60)), (10, 60))
+        with deadline(5):
+            connect, read = clamp_timeout((10, None))
+            self.assertTrue(4 < connect <= 5)
+            self.assertTrue(4 < read <= 5)
+            self.assertEqual(clamp_timeout((1, 2)), (1, 2))
+
+    def test_expired(self):
+        with deadline(0.01):
+            time.sleep(0.02)
+            self.assertRaises(DeadlineExceeded, clamp_timeout, (10, 60))
+
+    def test_nested(self):
+        with deadline(1):
+            outer = current_deadline()
+            with deadline(10):
+                self.assertEqual(current_deadline(), outer)
+            with deadline(0.5):
+                self.assertTrue(current_deadline() < outer)
+            self.assertEqual(current_deadline(), outer)
+        self.assertIsNone(remaining())
+
+    def test_batch(self):
+        batch = Batch(max_workers=2)
+        items = [batch.add(remaining) for _ in range(3)]
+        with deadline(5):
+            batch.run()
+        for item in items:
+            self.assertTrue(0 < item.result <= 5)
+
+
+class ClientDeadlineTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer({
+            '/dce/version': (200, {'DCEVersion': '2.8.0'}),
+            '/dce/ping': (200, b'OK')
+        }).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_expired_not_recorded(self):
+        breaker = CircuitBreaker(window=1, min_calls=1)
+        client = APIClient(self.server.host, breaker=breaker, retry=True)
+        calls = breaker.stats()['Calls']
+        with deadline(0.01):
+            time.sleep(0.02)
+            self.assertRaises(DeadlineExceeded, client.ping)
+        self.assertEqual(breaker.stats()['Calls'], calls)
+        self.assertEqual(self.server.hits['/dce/ping'], 0)
+        self.assertEqual(client.ping(), 'OK')
+
+    def test_wait_for_limiter(self):
+        client = APIClient(self.server.host,
+                           limits={'/ping': {'max_in_flight': 1}})
+        limit = client.limiter.limits.lookup('/ping')[1]
+        with limit.acquire():
+            with deadline(0.1):
+                self.assertRaises(DeadlineExceeded, client.ping)
+        self.assertEqual(self.server.hits['/dce/ping'], 0)
@@ -0,0 +1,48 @@
+# coding=utf-8
+import unittest
+
+from dce.errors import NullResource
+from dce.utils.utils import wrap_checking_resource
+
+
+class Client(object):
+    check_resources = True
+
+    def read_namespace(self, registry, namespace, iter=False):
+        return registry, namespace
+
+    def save_config(self, plugin, config):
+        return plugin, config
+
+
+wrap_checking_resource(Client, exclude=('config',))
+
+
+class CheckResourceTest(unittest.TestCase):
+    def setUp(self):
+        self.client = Client()
+
+    def test_positional(self):
+        self.assertEqual(self.client.read_namespace('r', 'n'), ('r', 'n'))
+        self.assertRaises(NullResource, self.client.read_namespace, 'r', '')
+        self.assertRaises(NullResource, self.client.read_namespace, None, 'n')
+
+    def test_keyword(self):
+        self.assertEqual(self.client.read_namespace('r', namespace='n'),
+                         ('r', 'n'))
+        self.assertRaises(NullResource, self.client.read_namespace,
+                          'r', namespace=None)
+        self.assertRaises(NullResource, self.client.read_namespace,
+                          registry='', namespace='n')
+
+    def test_dict_resource(self):
+        self.client.read_namespace({'Id': 'r'}, 'n')
+        self.assertRaises(NullResource, self.client.read_namespace,
+                          {'Name': 'r'}, 'n')
+
+    def test_excluded(self):
+        self.assertEqual(self.client.save_config('p', {}), ('p', {}))
+
+    def test_disabled(self):
+        self.client.check_resources = False
+        self.assertEqual(self.client.read_namespace('r', None), ('r', None))
@@ -0,0 +1,79 @@
+# coding=utf-8
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from dce import APIClient, DiscoveryCache
+from tests.fake_server import FakeServer
+
+
+class DiscoveryTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer({
+            '/dce/version': (200, {'DCEVersion': '2.8.0'}),
+            '/dce/ping': (200, b'OK')
+        }).start()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'discovery.json')
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def test_eager(self):
+        client = APIClient(self.server.host)
+        self.assertEqual(self.server.hits['/dce/version'], 1)
+        self.assertEqual(client.dce_version, '2.8.0')
+
+    def test_lazy(self):
+        client = APIClient(self.server.host, lazy=True)
+        self.assertEqual(sum(self.server.hits.values()), 0)
+
+        self.assertEqual(client.ping(), 'OK')
+        self.assertEqual(self.server.hits['/dce/version'], 1)
+        client.ping()
+        self.assertEqual(self.server.hits['/dce/version'], 1)
+
+    def test_known_prefix_and_version(self):
+        client = APIClient(self.server.host, prefix='dce',
+                           dce_version='2.8.0')
+        self.assertEqual(client.dce_version, '2.8.0')
+        self.assertEqual(client.ping(), 'OK')
+        self.assertEqual(self.server.hits['/dce/version'], 0)
+
+    def test_cache_hit(self):
+        APIClient(self.server.host, discovery_cache=self.path)
+        self.assertEqual(self.server.hits['/dce/version'], 1)
+
+        client = APIClient(self.server.host, discovery_cache=self.path)
+        self.assertEqual(self.server.hits['/dce/version'], 1)
+        self.assertEqual(client.dce_version, '2.8.0')
+        self.assertEqual(client.ping(), 'OK')
+
+    def test_cache_expiry(self):
+        cache = DiscoveryCache(self.path, ttl=60)
+        APIClient(self.server.host, discovery_cache=cache)
+        base_url = APIClient(self.server.host, discovery_cache=cache).base_url
+        self.assertIsNotNone(cache.get(base_url))
+
+        with open(self.path) as f:
+            entries = json.load(f)
+        entries[base_url]['Time'] -= 120
+        with open(self.path, 'w') as f:
+            json.dump(entries, f)
+        self.assertIsNone(cache.get(base_url))
+
+        APIClient(self.server.host, discovery_cache=cache)
+        self.assertEqual(self.server.hits['/dce/version'], 2)
+        self.assertIsNotNone(cache.get(base_url))
+
+        cache.invalidate(base_url)
+        self.assertIsNone(cache.get(base_url))
+
+    def test_unwritable_cache(self):
+        path = os.path.join(self.path, 'not-a-directory', 'discovery.json')
+        open(self.path, 'w').close()
+        client = APIClient(self.server.host, discovery_cache=path)
+        self.assertEqual(client.dce_version, '2.8.0')
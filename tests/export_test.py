@@ -0,0 +1,142 @@
+# coding=utf-8
+import io
+import os
+import csv
+import json
+import sys
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+import six
+
+from dce.api.advance import IterResult
+from dce.api.base import BaseClientMixin, build_response
+from dce.utils.export import export_records, guess_format, iter_chunks
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class Client(IterResult, BaseClientMixin):
+    def __init__(self, content):
+        self.content = content
+        self.raws = []
+
+    def list_accounts(self, iter=False, limit=None):
+        response = build_response('http://dce/dce/accounts', 200, {},
+                                  self.content)
+        result = self._advanced_result(response, iter=iter, limit=limit,
+                                       json=True)
+        for record in result:
+            self.raws.append(record)
+            yield record
+
+
+ACCOUNTS = [
+    {'Name': 'u{0}'.format(i), 'IsAdmin': i % 2 == 0, 'Teams': [i]}
+    for i in range(25)
+]
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_iter_chunks(self):
+        chunks = list(iter_chunks(iter(range(7)), 3))
+        self.assertEqual(chunks, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_guess_format(self):
+        self.assertEqual(guess_format('a.JSONL'), 'ndjson')
+        self.assertEqual(guess_format('a.feather'), 'arrow')
+        self.assertRaises(ValueError, guess_format, 'a.txt')
+        self.assertRaises(ValueError, export_records, [], 'a.csv',
+                          format='xml')
+
+    def test_ndjson_from_raw_text(self):
+        content = json.dumps(ACCOUNTS, indent=2).encode('utf-8')
+        client = Client(content)
+        count = client.export(self.path('accounts.ndjson'),
+                              client.list_accounts, chunk_size=10)
+        self.assertEqual(count, 25)
+        # the objects were piped without being decoded
+        self.assertTrue(all(isinstance(raw, six.string_types)
+                            for raw in client.raws))
+
+        with io.open(self.path('accounts.ndjson'), encoding='utf-8') as fp:
+            lines = fp.read().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], ACCOUNTS)
+
+    def test_csv(self):
+        count = export_records(iter(ACCOUNTS), self.path('accounts.csv'),
+                               columns=['Name', 'Teams'], chunk_size=4)
+        self.assertEqual(count, 25)
+        with io.open(self.path('accounts.csv'), encoding='utf-8',
+                     newline='') as fp:
+            rows = list(csv.reader(fp))
+        self.assertEqual(rows[0], ['Name', 'Teams'])
+        self.assertEqual(rows[1], ['u0', '[0]'])
+        self.assertEqual(len(rows), 26)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        records = [dict(account, Email=None) for account in ACCOUNTS]
+        records[-1]['Email'] = 'u24@dce'
+        count = export_records(records, self.path('accounts.parquet'),
+                               chunk_size=10)
+        self.assertEqual(count, 25)
+
+        parquet = pyarrow.parquet.ParquetFile(self.path('accounts.parquet'))
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        table = parquet.read()
+        self.assertEqual(table.column('Name').to_pylist()[-1], 'u24')
+        self.assertEqual(table.column('IsAdmin').type, pyarrow.bool_())
+        self.assertEqual(table.column('Email').to_pylist()[-1], 'u24@dce')
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow(self):
+        export_records(ACCOUNTS, self.path('accounts.arrow'), chunk_size=10)
+        with pyarrow.ipc.open_file(self.path('accounts.arrow')) as reader:
+            self.assertEqual(reader.num_record_batches, 3)
+            table = reader.read_all()
+        self.assertEqual(table.num_rows, 25)
+        self.assertEqual(table.column('Teams').to_pylist()[0], '[0]')
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_null_column_of_first_chunk(self):
+        records = [{'A': None}] * 3 + [{'A': 5}]
+        count = export_records(records, self.path('a.parquet'), chunk_size=2)
+        self.assertEqual(count, 4)
+        table = pyarrow.parquet.read_table(self.path('a.parquet'))
+        self.assertEqual(table.column('A').to_pylist(),
+                         [None, None, None, '5'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_schema(self):
+        schema = pyarrow.schema([('Name', pyarrow.string()),
+                                 ('Size', pyarrow.int64())])
+        records = [{'Name': 'a', 'Size': None}, {'Name': 'b', 'Size': 3}]
+        export_records(records, self.path('a.parquet'), columns=schema,
+                       chunk_size=1)
+        table = pyarrow.parquet.read_table(self.path('a.parquet'))
+        self.assertEqual(table.schema, schema)
+        self.assertEqual(table.column('Size').to_pylist(), [None, 3])
+
+    def test_pyarrow_imported_lazily(self):
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            "import sys, dce; print('pyarrow' in sys.modules)"
+        ])
+        self.assertEqual(output.strip(), b'False')
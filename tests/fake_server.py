@@ -0,0 +1,100 @@
+# coding=utf-8
+"""
+A local HTTP server answering canned responses, for the tests which
+need a real connection but no DCE.
+"""
+import json
+import threading
+from collections import Counter
+
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import urlparse
+
+
+class FakeServer(object):
+    """
+    Serve `routes`, a dict mapping paths to `(status, body)` or
+    `(status, body, headers)`, or to callables taking the request
+    handler and returning such tuples. The body is JSON encoded unless
+    it's bytes. Other paths are 404.
+
+    Usage::
+
+        with FakeServer({'/dce/version': (200, {'DCEVersion': '2.8.0'})}) \\
+                as server:
+            APIClient(server.host)
+    """
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.hits = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                path = urlparse(self.path).path
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                with server._lock:
+                    server.hits[path] += 1
+                route = server.routes.get(
+                    path, (404, {'message': 'not found'})
+                )
+                if callable(route):
+                    route = route(self)
+                status, body, headers = (tuple(route) + ({},))[:3]
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (IOError, OSError):
+                    # the client released the connection early
+                    pass
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+        return Handler
+
+    @property
+    def host(self):
+        return '127.0.0.1:{0}'.format(self._server.server_address[1])
+
+    def start(self):
+        class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+
+            def handle_error(self, request, client_address):
+                pass
+
+        self._server = Server(('127.0.0.1', 0), self._handler())
+        thread = threading.Thread(target=self._server.serve_forever,
+                                  kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,157 @@
+# coding=utf-8
+import time
+import threading
+import unittest
+
+from dce import APIClient, HedgePolicy, ThrottledError
+from dce.api.hedge import LatencyTracker
+from tests.fake_server import FakeServer
+
+
+class Response(object):
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def sleeping(seconds, response):
+    def send():
+        time.sleep(seconds)
+        return response
+    return send
+
+
+def failing():
+    raise IOError('reset')
+
+
+class LatencyTrackerTest(unittest.TestCase):
+    def test_percentile(self):
+        tracker = LatencyTracker(size=100)
+        self.assertIsNone(tracker.percentile(95))
+        for i in range(1, 101):
+            tracker.record(i)
+        self.assertEqual(tracker.percentile(50), 51)
+        self.assertEqual(tracker.percentile(95), 95)
+
+
+class HedgePolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.policy = HedgePolicy(templates=['/accounts/{0}'],
+                                  min_delay=0.01, min_samples=3)
+        for _ in range(3):
+            self.policy.send('/accounts/a', sleeping(0, None), failing)
+
+    def tearDown(self):
+        self.policy.shutdown()
+
+    def test_not_hedged(self):
+        primary = Response('primary')
+        self.assertIs(self.policy.send('/accounts', lambda: primary, failing),
+                      primary)
+        self.assertIs(self.policy.send('/accounts/a', lambda: primary,
+                                       failing), primary)
+        self.assertEqual(self.policy.stats()['Fired'], 0)
+
+    def test_hedge_wins(self):
+        primary, hedge = Response('primary'), Response('hedge')
+        response = self.policy.send(
+            '/accounts/a', sleeping(0.2, primary), sleeping(0, hedge)
+        )
+        self.assertIs(response, hedge)
+        stats = self.policy.stats()
+        self.assertEqual((stats['Fired'], stats['Won']), (1, 1))
+        time.sleep(0.3)
+        self.assertTrue(primary.closed)
+
+    def test_failed_hedge(self):
+        primary = Response('primary')
+        response = self.policy.send(
+            '/accounts/a', sleeping(0.1, primary), failing
+        )
+        self.assertIs(response, primary)
+        self.assertEqual(self.policy.stats()['Won'], 0)
+
+    def send_concurrently(self, policy, count, primary, hedge):
+        threads = [threading.Thread(target=policy.send,
+                                    args=('/accounts/a', primary, hedge))
+                   for _ in range(count)]
+        started_at = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.time() - started_at
+
+    def test_primaries_not_queued(self):
+        policy = HedgePolicy(templates=['/accounts/{0}'], min_delay=5,
+                             min_samples=3, max_workers=2)
+        for _ in range(3):
+            policy.send('/accounts/a', sleeping(0, None), failing)
+        try:
+            # serialised by 2 workers, 8 primaries would take 0.8s
+            elapsed = self.send_concurrently(
+                policy, 8, sleeping(0.2, Response('primary')), failing
+            )
+            self.assertLess(elapsed, 0.6)
+            self.assertEqual(policy.stats()['Fired'], 0)
+        finally:
+            policy.shutdown()
+
+    def test_skip_while_workers_busy(self):
+        policy = HedgePolicy(templates=['/accounts/{0}'], min_delay=0.01,
+                             min_samples=3, max_workers=1)
+        for _ in range(3):
+            policy.send('/accounts/a', sleeping(0, None), failing)
+        try:
+            self.send_concurrently(
+                policy, 4, sleeping(0.2, Response('primary')),
+                sleeping(0.5, Response('hedge'))
+            )
+            stats = policy.stats()
+            self.assertEqual((stats['Fired'], stats['Won']), (1, 0))
+            self.assertEqual(stats['Skipped'], 3)
+        finally:
+            policy.shutdown()
+
+
+class ClientHedgeTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer({
+            '/dce/version': (200, {'DCEVersion': '2.8.0'}),
+            '/dce/ping': (200, b'OK')
+        }).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_hedge_takes_limiter_slot(self):
+        client = APIClient(self.server.host, hedge=['/ping'],
+                           limits={'/ping': {'max_in_flight': 1}})
+        url = client._url('/ping')
+        kwargs = client._set_request_kwargs({})
+        self.assertEqual(client._send_hedge('GET', url, kwargs).text, 'OK')
+
+        limit = client.limiter.limits.lookup('/ping')[1]
+        with limit.acquire():
+            self.assertRaises(ThrottledError, client._send_hedge,
+                              'GET', url, kwargs)
+        self.assertEqual(limit.stats()['Requests'], 2)
+        client.close()
+
+    def test_close_owned_policy(self):
+        client = APIClient(self.server.host, hedge=True)
+        policy = client.hedge_policy
+        policy._submit(LatencyTracker(), lambda: None).result()
+        client.close()
+        self.assertIsNone(policy._executor)
+
+    def test_keep_shared_policy(self):
+        policy = HedgePolicy()
+        policy._submit(LatencyTracker(), lambda: None).result()
+        APIClient(self.server.host, hedge=policy).close()
+        self.assertIsNotNone(policy._executor)
+        policy.shutdown()
@@ -0,0 +1,138 @@
+# coding=utf-8
+import os
+import shutil
+import tempfile
+import unittest
+
+from dce.api.inventory import InventoryMixin, InventoryStore
+
+
+class Client(InventoryMixin):
+    def __init__(self, registry):
+        self.registry = registry
+        self.crawled = []
+
+    def list_registry_namespace(self, registry, iter=False, limit=None):
+        return [{'Name': name} for name in sorted(self.registry)]
+
+    def list_repository_for_all_registry_namespaces(
+            self, registry, with_remote='True', iter=False, limit=None):
+        return [
+            {'Name': name, 'Namespace': namespace,
+             'UpdatedAt': repository['UpdatedAt']}
+            for namespace, repositories in sorted(self.registry.items())
+            for name, repository in sorted(repositories.items())
+        ]
+
+    def list_registry_namespaced_repository_tags(self, registry, namespace,
+                                                 repository):
+        self.crawled.append((namespace, repository))
+        return [{'Name': tag}
+                for tag in self.registry[namespace][repository]['Tags']]
+
+
+def repository(*tags):
+    return {'UpdatedAt': 1, 'Tags': list(tags)}
+
+
+class InventoryTest(unittest.TestCase):
+    def setUp(self):
+        self.client = Client({
+            'library': {'nginx': repository('latest', '1.19'),
+                        'redis': repository('6')},
+            'team': {'api': repository('v1')}
+        })
+        self.store = InventoryStore(':memory:')
+
+    def test_sync_and_query(self):
+        result = self.client.sync_inventory('r', self.store)
+        self.assertEqual(result['Added'], ['library', 'team'])
+        self.assertEqual(result['Crawled'], 3)
+
+        self.assertEqual([n['Name'] for n in self.store.namespaces('r')],
+                         ['library', 'team'])
+        self.assertEqual(len(self.store.repositories('r')), 3)
+        self.assertEqual(
+            [r['Name'] for r in self.store.repositories('r', 'library')],
+            ['nginx', 'redis']
+        )
+        self.assertEqual([t['Name'] for t in
+                          self.store.tags('r', 'library', 'nginx')],
+                         ['1.19', 'latest'])
+        self.assertTrue(self.store.has_tag('r', 'team', 'api', 'v1'))
+        self.assertFalse(self.store.has_tag('r', 'team', 'api', 'v2'))
+        self.assertIsNotNone(self.store.synced_at('r'))
+        self.assertIsNone(self.store.synced_at('other'))
+
+    def test_incremental_sync(self):
+        self.client.sync_inventory('r', self.store)
+        self.client.crawled = []
+
+        result = self.client.sync_inventory('r', self.store)
+        self.assertEqual(result['Unchanged'], 2)
+        self.assertEqual(self.client.crawled, [])
+
+        registry = self.client.registry
+        registry['library']['nginx'] = dict(repository('latest', '1.21'),
+                                            UpdatedAt=2)
+        del registry['library']['redis']
+        del registry['team']
+        registry['new'] = {'app': repository('v1')}
+        result = self.client.sync_inventory('r', self.store)
+
+        self.assertEqual(result['Added'], ['new'])
+        self.assertEqual(result['Changed'], ['library'])
+        self.assertEqual(result['Removed'], ['team'])
+        self.assertEqual(self.client.crawled,
+                         [('library', 'nginx'), ('new', 'app')])
+        self.assertTrue(self.store.has_tag('r', 'library', 'nginx', '1.21'))
+        self.assertFalse(self.store.has_tag('r', 'library', 'nginx', '1.19'))
+        self.assertEqual(self.store.tags('r', 'library', 'redis'), [])
+        self.assertEqual(self.store.repositories('r', 'team'), [])
+
+        self.client.crawled = []
+        self.client.sync_inventory('r', self.store, full=True)
+        self.assertEqual(len(self.client.crawled), 2)
+
+    def test_expired_tags(self):
+        self.client.sync_inventory('r', self.store)
+        # a tag pushed without changing the repository object
+        self.client.registry['library']['redis']['Tags'].append('7')
+        self.client.crawled = []
+
+        result = self.client.sync_inventory('r', self.store, max_age=None)
+        self.assertEqual(result['Unchanged'], 2)
+        self.assertFalse(self.store.has_tag('r', 'library', 'redis', '7'))
+
+        crawled_at = self.store.crawled_at('r')
+        self.assertEqual(sorted(crawled_at), ['library', 'team'])
+        result = self.client.sync_inventory('r', self.store, max_age=3600)
+        self.assertEqual(result['Unchanged'], 2)
+
+        self.store._conn.execute(
+            "UPDATE crawls SET crawled_at = crawled_at - 7200 "
+            "WHERE name = 'library'"
+        )
+        result = self.client.sync_inventory('r', self.store, max_age=3600)
+        self.assertEqual(result['Expired'], ['library'])
+        self.assertEqual(result['Changed'], [])
+        self.assertEqual(result['Unchanged'], 1)
+        self.assertEqual(self.client.crawled,
+                         [('library', 'nginx'), ('library', 'redis')])
+        self.assertTrue(self.store.has_tag('r', 'library', 'redis', '7'))
+        self.assertGreater(self.store.crawled_at('r')['library'],
+                           crawled_at['library'])
+
+    def test_file_store(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'dce', 'inventory.db')
+            store = InventoryStore(path)
+            self.client.sync_inventory('r', store)
+            store.close()
+
+            store = InventoryStore(path)
+            self.assertTrue(store.has_tag('r', 'library', 'redis', '6'))
+            store.close()
+        finally:
+            shutil.rmtree(directory)
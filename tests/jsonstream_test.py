@@ -0,0 +1,69 @@
+# coding=utf-8
+import json
+import unittest
+
+from dce.utils.jsonstream import JSONArrayParser, iter_json_array
+
+
+def split_every(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class JSONArrayParserTest(unittest.TestCase):
+    objects = [
+        {'Name': 'a{b', 'Labels': {'x': '}]'}},
+        {'Name': 'quote \\" and \\\\', 'Tags': ['1', '2']},
+        [1, [2, {'3': None}]],
+        u'中文',
+        12.5,
+        True,
+        None
+    ]
+
+    def parse(self, chunks, json_=True):
+        parser = JSONArrayParser(json=json_)
+        result = []
+        for chunk in chunks:
+            result.extend(parser.feed(chunk))
+        result.extend(parser.close())
+        return result
+
+    def test_compact_document(self):
+        data = json.dumps(self.objects, separators=(',', ':')).encode('utf-8')
+        self.assertEqual(self.parse([data]), self.objects)
+
+    def test_any_chunk_boundary(self):
+        data = json.dumps(self.objects, indent=2,
+                          ensure_ascii=False).encode('utf-8')
+        for size in range(1, 16):
+            self.assertEqual(self.parse(split_every(data, size)), self.objects)
+
+    def test_element_is_returned_when_complete(self):
+        parser = JSONArrayParser()
+        self.assertEqual(parser.feed(b'[{"a": 1}, {"b"'), [{'a': 1}])
+        self.assertEqual(parser.feed(b': 2}'), [{'b': 2}])
+        self.assertEqual(parser.feed(b']'), [])
+
+    def test_raw_text(self):
+        data = b'[ {"a": [1, 2]} , "x" ]'
+        self.assertEqual(self.parse([data], json_=False),
+                         [u'{"a": [1, 2]}', u'"x"'])
+
+    def test_empty_array(self):
+        self.assertEqual(self.parse([b' [ ', b' ] ']), [])
+
+    def test_not_an_array(self):
+        self.assertEqual(self.parse([b'{"a"', b': 1}']), [{'a': 1}])
+
+    def test_utf16(self):
+        data = json.dumps(self.objects).encode('utf-16-le')
+        self.assertEqual(self.parse(split_every(data, 3)), self.objects)
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            self.parse([b'[{"a": 1}, {"b"'])
+
+    def test_iter_json_array(self):
+        data = json.dumps(self.objects).encode('utf-8')
+        self.assertEqual(list(iter_json_array(split_every(data, 7))),
+                         self.objects)
@@ -0,0 +1,102 @@
+# coding=utf-8
+import time
+import threading
+import unittest
+
+from dce import (
+    DeadlineExceeded, EndpointLimiter, Limit, ThrottledError, deadline
+)
+from dce.api.limiter import TokenBucket
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_rate(self):
+        bucket = TokenBucket(rate=100, burst=5)
+        started_at = time.time()
+        for _ in range(15):
+            bucket.acquire()
+        elapsed = time.time() - started_at
+        self.assertTrue(0.08 <= elapsed < 0.5, elapsed)
+
+
+class EndpointLimiterTest(unittest.TestCase):
+    def test_max_in_flight(self):
+        limiter = EndpointLimiter({
+            '/registries/{0}/repositories': {'max_in_flight': 2}
+        })
+        state = {'in_flight': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def request(registry):
+            with limiter.acquire('/registries/{0}/repositories'.format(registry)):
+                with lock:
+                    state['in_flight'] += 1
+                    state['peak'] = max(state['peak'], state['in_flight'])
+                time.sleep(0.01)
+                with lock:
+                    state['in_flight'] -= 1
+
+        threads = [threading.Thread(target=request, args=(str(i % 3),))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(state['peak'], 2)
+        stats = limiter.stats()['/registries/{0}/repositories']
+        self.assertEqual(stats['Requests'], 8)
+        self.assertEqual(stats['InFlight'], 0)
+        self.assertTrue(stats['Throttled'] > 0)
+
+    def test_unmatched_paths(self):
+        limiter = EndpointLimiter({'/accounts/{0}': Limit(rate=1)})
+        with limiter.acquire('/accounts'):
+            pass
+        self.assertEqual(limiter.stats()['/accounts/{0}']['Requests'], 0)
+
+        limiter = EndpointLimiter(default={'max_in_flight': 1})
+        with limiter.acquire('/accounts'):
+            self.assertEqual(limiter.stats()['*']['InFlight'], 1)
+
+
+class DeadlineLimitTest(unittest.TestCase):
+    def test_rate(self):
+        limit = Limit(rate=1, burst=1)
+        with limit.acquire():
+            pass
+        started_at = time.time()
+        with deadline(0.1):
+            with self.assertRaises(DeadlineExceeded):
+                with limit.acquire():
+                    pass
+        # gave up without waiting for the next token
+        self.assertLess(time.time() - started_at, 0.05)
+        self.assertEqual(limit.stats()['Requests'], 1)
+
+    def test_max_in_flight(self):
+        limit = Limit(max_in_flight=1)
+        with limit.acquire():
+            started_at = time.time()
+            with deadline(0.1):
+                with self.assertRaises(DeadlineExceeded):
+                    with limit.acquire():
+                        pass
+            self.assertTrue(0.08 <= time.time() - started_at < 0.5)
+        stats = limit.stats()
+        self.assertEqual(stats['Requests'], 1)
+        self.assertEqual(stats['InFlight'], 0)
+
+    def test_not_blocking(self):
+        limiter = EndpointLimiter(default={'max_in_flight': 1})
+        with limiter.acquire('/accounts', blocking=False):
+            self.assertRaises(ThrottledError, limiter.acquire('/accounts',
+                                                             blocking=False)
+                              .__enter__)
+
+        limit = Limit(rate=1, burst=1)
+        with limit.acquire(blocking=False):
+            pass
+        self.assertRaises(ThrottledError, limit.acquire(blocking=False)
+                          .__enter__)
+        self.assertEqual(limit.stats()['Requests'], 1)
@@ -0,0 +1,51 @@
+# coding=utf-8
+import json
+import pickle
+import unittest
+
+from dce.api.advance import IterResult
+from dce.api.base import BaseClientMixin, build_response
+from dce.models import Account, Repository
+
+
+class Client(IterResult, BaseClientMixin):
+    pass
+
+
+class ModelTest(unittest.TestCase):
+    def test_lazy_decoding(self):
+        repository = Repository('{"Name": "nginx", "PullCount": 3, "Stars": 1}')
+        self.assertEqual(repository._raw, '{"Name": "nginx", "PullCount": 3, "Stars": 1}')
+        self.assertEqual(repository.pull_count, 3)
+        self.assertIsNone(repository._raw)
+        self.assertIsNone(repository.description)
+        self.assertEqual(repository['Name'], 'nginx')
+        self.assertEqual(repository.stars, 1)
+        self.assertEqual(repository.extra, {'Stars': 1})
+        self.assertRaises(AttributeError, getattr, repository, 'forks')
+        self.assertRaises(KeyError, repository.__getitem__, 'Forks')
+
+    def test_slots(self):
+        account = Account({'Name': 'admin', 'IsAdmin': True})
+        self.assertFalse(hasattr(account, '__dict__'))
+        self.assertTrue(account.is_admin)
+        self.assertIn('is_admin', Account.__slots__)
+
+    def test_to_dict(self):
+        account = Account(b'{"Name": "admin", "Teams": []}')
+        data = account.to_dict()
+        self.assertEqual(data['Name'], 'admin')
+        self.assertEqual(data['Teams'], [])
+        self.assertIsNone(data['Email'])
+        self.assertEqual(pickle.loads(pickle.dumps(account)), account)
+
+    def test_iterated_listing(self):
+        content = json.dumps([{'Name': 'a'}, {'Name': 'b'}]).encode('utf-8')
+        client = Client()
+        with client.models(Account):
+            result = client._advanced_result(
+                build_response('http://dce/dce/accounts', 200, {}, content),
+                iter=False, json=True
+            )
+        self.assertEqual([type(a) for a in result], [Account, Account])
+        self.assertEqual([a.name for a in result], ['a', 'b'])
@@ -0,0 +1,65 @@
+# coding=utf-8
+import unittest
+
+from dce import Pager, OffsetPaging, deadline
+from dce.api.advance import IterResult
+from dce.api.deadline import current_deadline
+
+
+class FakeClient(IterResult):
+    def __init__(self, size, honor_paging=True):
+        self.objects = [{'Name': str(i)} for i in range(size)]
+        self.honor_paging = honor_paging
+        self.requests = []
+        self.contexts = []
+
+    def list_object(self, iter=False, limit=None):
+        options = self._current_iter_options()
+        params = options.get('params') or {}
+        self.requests.append(params)
+        self.contexts.append((options.get('model'), current_deadline()))
+        objects = self.objects
+        if params and self.honor_paging:
+            objects = objects[params['Offset']:params['Offset'] + params['Limit']]
+        return (object_ for object_ in objects)
+
+
+class PagerTest(unittest.TestCase):
+    def test_client_side_pages(self):
+        client = FakeClient(10)
+        pager = Pager(client.list_object, page_size=4)
+        self.assertEqual([len(page) for page in pager.pages()], [4, 4, 2])
+        self.assertEqual(list(pager), client.objects)
+        self.assertEqual(client.requests, [{}, {}])
+
+    def test_server_side_pages(self):
+        client = FakeClient(8)
+        pager = Pager(client.list_object, page_size=4, paging=OffsetPaging())
+        self.assertEqual(list(pager), client.objects)
+        self.assertEqual([r['Offset'] for r in client.requests], [0, 4, 8])
+
+    def test_paging_ignored_by_server(self):
+        client = FakeClient(10, honor_paging=False)
+        pager = Pager(client.list_object, page_size=4, paging=OffsetPaging(),
+                      prefetch=False)
+        self.assertEqual([len(page) for page in pager.pages()], [4, 4, 2])
+        self.assertEqual(len(client.requests), 1)
+
+    def test_paging_ignored_with_exactly_one_page(self):
+        client = FakeClient(4, honor_paging=False)
+        pager = Pager(client.list_object, page_size=4, paging=OffsetPaging())
+        self.assertEqual(list(pager.pages()), [client.objects])
+        self.assertEqual(len(client.requests), 2)
+
+    def test_prefetch_inherits_context(self):
+        for prefetch in (False, True):
+            client = FakeClient(8)
+            pager = Pager(client.list_object, page_size=4,
+                          paging=OffsetPaging(), prefetch=prefetch)
+            with deadline(60) as deadline_at, client._iter_options(model=dict):
+                list(pager)
+            self.assertEqual(client.contexts, [(dict, deadline_at)] * 3)
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(ValueError):
+            Pager(FakeClient(1).list_object, page_size=0)
@@ -0,0 +1,60 @@
+# coding=utf-8
+import threading
+import unittest
+
+from dce import ClientPool
+from tests.fake_server import FakeServer
+
+THREADS = 8
+
+
+class ClientPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer({
+            '/dce/version': (200, {'DCEVersion': '2.8.0'}),
+            '/dce/info': (200, {'Name': 'dce'}),
+            '/dce/ping': (200, b'OK')
+        }).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_threads(self, pool):
+        start = threading.Event()
+        results = []
+        lock = threading.Lock()
+
+        def work():
+            start.wait()
+            result = (pool.client, pool.info, pool.ping(), pool.client)
+            with lock:
+                results.append(result)
+
+        threads = [threading.Thread(target=work) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_threads(self):
+        for lazy in (False, True):
+            self.server.hits.clear()
+            pool = ClientPool(self.server.host, lazy=lazy)
+            results = self.run_threads(pool)
+
+            self.assertEqual(len(results), THREADS)
+            self.assertEqual(self.server.hits['/dce/version'], 1)
+            self.assertEqual(self.server.hits['/dce/info'], 1)
+            self.assertEqual(self.server.hits['/dce/ping'], THREADS)
+            for client, info, pong, client_ in results:
+                self.assertEqual(info, {'Name': 'dce'})
+                self.assertEqual(pong, 'OK')
+                # the client is kept by its thread
+                self.assertIs(client, client_)
+            # every thread has its own client and session
+            clients = set(id(result[0]) for result in results)
+            self.assertEqual(len(clients), THREADS)
+            self.assertNotIn(pool.client, [result[0] for result in results])
+            pool.close()
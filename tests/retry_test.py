@@ -0,0 +1,64 @@
+# coding=utf-8
+import time
+import unittest
+from email.utils import formatdate
+
+import requests
+
+from dce import RetryPolicy, RetryBudget
+from dce.api.base import build_response
+from dce.api.retry import parse_retry_after
+
+
+def response(status_code, headers=None):
+    return build_response('http://dce/dce/', status_code, headers, b'')
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_retry_statuses(self):
+        policy = RetryPolicy(total=2, backoff_factor=1, jitter=False,
+                             budget=False)
+        self.assertEqual(policy.next_delay('GET', 0, response(503)), 1)
+        self.assertEqual(policy.next_delay('GET', 1, response(502)), 2)
+        self.assertIsNone(policy.next_delay('GET', 2, response(503)))
+        self.assertIsNone(policy.next_delay('GET', 0, response(500)))
+        self.assertIsNone(policy.next_delay('GET', 0, response(200)))
+
+        stats = policy.stats.as_dict()
+        self.assertEqual(stats['Retries'], 2)
+        self.assertEqual(stats['Exhausted'], 1)
+        self.assertEqual(stats['Reasons'], {'503': 1, '502': 1})
+
+    def test_idempotent_methods(self):
+        policy = RetryPolicy(budget=False)
+        error = requests.exceptions.ConnectionError()
+        self.assertIsNotNone(policy.next_delay('PUT', 0, error=error))
+        self.assertIsNone(policy.next_delay('POST', 0, error=error))
+
+        policy = RetryPolicy(total={'POST': 1}, methods=['POST'],
+                             budget=False)
+        self.assertIsNotNone(policy.next_delay('POST', 0, error=error))
+        self.assertIsNone(policy.next_delay('POST', 1, error=error))
+
+    def test_retry_after(self):
+        policy = RetryPolicy(backoff_max=10, budget=False)
+        self.assertEqual(policy.next_delay(
+            'GET', 0, response(503, {'Retry-After': '3'})
+        ), 3)
+        self.assertIsNone(policy.next_delay(
+            'GET', 0, response(503, {'Retry-After': '60'})
+        ))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('5'), 5)
+        self.assertIsNone(parse_retry_after('soon'))
+        delay = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+        self.assertTrue(25 < delay <= 30)
+
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, min_per_second=0, max_tokens=1)
+        policy = RetryPolicy(budget=budget)
+        self.assertIsNotNone(policy.next_delay('GET', 0, response(503)))
+        self.assertIsNone(policy.next_delay('GET', 0, response(503)))
+        self.assertIsNotNone(policy.next_delay('GET', 0, response(503)))
+        self.assertEqual(policy.stats.as_dict()['BudgetExhausted'], 1)
@@ -0,0 +1,98 @@
+# coding=utf-8
+import time
+import unittest
+
+from dce.api.search import RepositoryIndex, SearchIndexMixin
+
+
+def repositories(*names):
+    return [{'Namespace': name.split('/')[0], 'Name': name.split('/')[1]}
+            for name in names]
+
+
+class Client(SearchIndexMixin):
+    def __init__(self, names):
+        self.names = list(names)
+        self.searched = []
+
+    def list_repository_for_all_registry_namespaces(
+            self, registry, with_remote='True', iter=False, limit=None):
+        return repositories(*self.names)
+
+    def search_repository_and_image_in_registry(self, prefix=None):
+        self.searched.append(prefix)
+        return {
+            'ByRepoName': [{'Namespace': 'library', 'Name': 'remote'}],
+            'ByName': [{'Name': 'remote', 'Tag': 'latest'}]
+        }
+
+
+class RepositoryIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = RepositoryIndex(['r'])
+        self.index.update('r', repositories(
+            'library/nginx', 'library/Node', 'team/nginx-proxy', 'team/api'
+        ))
+
+    def names(self, result):
+        return ['{0}/{1}'.format(r['Namespace'], r['Name']) for r in result]
+
+    def test_prefix(self):
+        self.assertEqual(self.names(self.index.prefix('ngi')),
+                         ['library/nginx', 'team/nginx-proxy'])
+        self.assertEqual(self.names(self.index.prefix('LIB')),
+                         ['library/nginx', 'library/Node'])
+        self.assertEqual(self.names(self.index.prefix('n', limit=1)),
+                         ['library/nginx'])
+        self.assertEqual(self.index.prefix('x'), [])
+
+    def test_search(self):
+        self.assertEqual(self.names(self.index.search('nginx')),
+                         ['library/nginx', 'team/nginx-proxy'])
+        self.assertEqual(self.names(self.index.search('M/A')), ['team/api'])
+        self.assertEqual(self.names(self.index.search('od')), ['library/Node'])
+        self.assertEqual(self.index.search('nginy'), [])
+
+    def test_incremental_update(self):
+        changed = repositories('library/nginx', 'team/api', 'team/web')
+        changed[1]['UpdatedAt'] = 2
+        self.assertEqual(self.index.update('r', changed), (2, 2))
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.search('proxy'), [])
+        self.assertEqual(self.index.prefix('team/api')[0]['UpdatedAt'], 2)
+        self.assertEqual(self.names(self.index.search('web')), ['team/web'])
+        self.assertEqual(self.index.update('r', changed), (0, 0))
+
+
+class SearchIndexMixinTest(unittest.TestCase):
+    def test_search_repository(self):
+        client = Client(['library/nginx'])
+        remote = {'Namespace': 'library', 'Name': 'remote'}
+        self.assertEqual(client.search_repository('ngi', prefix=True),
+                         [remote])
+        # repositories, not images, filtered by substring
+        self.assertEqual(client.search_repository('RARY/rem'), [remote])
+        self.assertEqual(client.search_repository('web'), [])
+        client.searched = []
+
+        index = client.index_repositories(['r'], refresh_interval=60)
+        try:
+            while not index.ready:
+                time.sleep(0.01)
+            self.assertEqual(client.search_repository('ngi', prefix=True),
+                             [{'Namespace': 'library', 'Name': 'nginx'}])
+            # answered by the index
+            self.assertEqual(client.searched, [])
+
+            # a miss falls back to the server and refreshes the index
+            client.names.append('team/web')
+            index.min_refresh_interval = 0
+            self.assertEqual(client.search_repository('web'), [])
+            self.assertEqual(client.searched, ['web'])
+            for _ in range(100):
+                if len(index) == 2:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(len(client.search_repository('web')), 1)
+        finally:
+            index.stop()
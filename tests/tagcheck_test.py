@@ -0,0 +1,74 @@
+# coding=utf-8
+import threading
+import unittest
+
+from dce.api.tagcheck import TagCheckMixin
+from dce.errors import NotFound
+
+TAGS = {
+    ('library', 'nginx'): ['latest', '1.19'],
+    ('team', 'api'): ['v1']
+}
+
+
+class Client(TagCheckMixin):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def check_registry_namespaced_repository_tags(self, registry, namespace,
+                                                  repository, tags=None):
+        with self.lock:
+            self.requests.append((namespace, repository, tuple(tags)))
+        if (namespace, repository) not in TAGS:
+            raise NotFound('not found')
+        existing = TAGS[(namespace, repository)]
+        return {'RelatedTable': dict((tag, tag in existing) for tag in tags)}
+
+
+class TagCheckTest(unittest.TestCase):
+    def test_grouped_and_deduplicated(self):
+        client = Client()
+        pairs = [('library/nginx', 'latest'), ('team/api', 'v2'),
+                 ('library/nginx', '1.20'), ('library/nginx', 'latest'),
+                 ('team/api', 'v1')]
+        result = client.bulk_check_tags('r', pairs)
+
+        self.assertEqual(result, {
+            ('library/nginx', 'latest'): True,
+            ('library/nginx', '1.20'): False,
+            ('team/api', 'v2'): False,
+            ('team/api', 'v1'): True
+        })
+        self.assertEqual(sorted(client.requests), [
+            ('library', 'nginx', ('latest', '1.20')),
+            ('team', 'api', ('v2', 'v1'))
+        ])
+
+    def test_batch_size(self):
+        client = Client()
+        pairs = [('library/nginx', str(i)) for i in range(5)]
+        client.bulk_check_tags('r', pairs, batch_size=2)
+        self.assertEqual(len(client.requests), 3)
+
+    def test_cache_positive_results(self):
+        client = Client()
+        pairs = [('library/nginx', 'latest'), ('library/nginx', '1.20')]
+        client.bulk_check_tags('r', pairs, cache_ttl=60)
+        client.requests = []
+
+        result = client.bulk_check_tags('r', pairs, cache_ttl=60)
+        self.assertTrue(result[('library/nginx', 'latest')])
+        self.assertEqual(client.requests, [('library', 'nginx', ('1.20',))])
+
+        client.requests = []
+        client.bulk_check_tags('r', pairs[:1], cache_ttl=60)
+        self.assertEqual(client.requests, [])
+
+    def test_errors(self):
+        client = Client()
+        self.assertRaises(ValueError, client.bulk_check_tags, 'r',
+                          [('nginx', 'latest')])
+        self.assertRaises(NotFound, client.bulk_check_tags, 'r',
+                          [('library/missing', 'latest')])
+        self.assertEqual(client.bulk_check_tags('r', []), {})
@@ -0,0 +1,115 @@
+# coding=utf-8
+import time
+import unittest
+
+from dce.errors import InvalidVersion
+from dce.utils.decorators import (
+    maximum_version, minimum_version, resolve_version_gates
+)
+from dce.utils.utils import (
+    cached, memoize, memoize_with_expire, memoize_in_object
+)
+
+
+class Counter(object):
+    def __init__(self):
+        self.calls = 0
+
+    @memoize_in_object
+    def add(self, a, b=1):
+        self.calls += 1
+        return a + b
+
+
+class MemoizeTest(unittest.TestCase):
+    def test_bind_arguments(self):
+        calls = []
+
+        @memoize
+        def add(a, b=1):
+            calls.append((a, b))
+            return a + b
+
+        self.assertEqual(add(1), 2)
+        self.assertEqual(add(1, 1), 2)
+        self.assertEqual(add(1, b=1), 2)
+        self.assertEqual(add(b=1, a=1), 2)
+        self.assertEqual(add(2), 3)
+        self.assertEqual(calls, [(1, 1), (2, 1)])
+
+    def test_unhashable_arguments(self):
+        @memoize
+        def length(values):
+            return len(values)
+
+        self.assertEqual(length([1, 2]), 2)
+        self.assertEqual(len(length.cache), 0)
+
+    def test_unexpected_keyword_argument(self):
+        @memoize
+        def identity(a):
+            return a
+
+        self.assertRaises(TypeError, identity, b=1)
+
+    def test_expire(self):
+        calls = []
+
+        @memoize_with_expire(0.01)
+        def now():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(now(), 1)
+        self.assertEqual(now(), 1)
+        time.sleep(0.02)
+        self.assertEqual(now(), 2)
+
+    def test_maxsize(self):
+        @cached(maxsize=2)
+        def square(a):
+            return a * a
+
+        for a in range(4):
+            square(a)
+        self.assertEqual(len(square.cache), 2)
+        self.assertEqual(square.cache.stats()['Evictions'], 2)
+
+    def test_in_object(self):
+        first, second = Counter(), Counter()
+        self.assertEqual(first.add(1), 2)
+        self.assertEqual(first.add(1, b=1), 2)
+        self.assertEqual(second.add(1), 2)
+        self.assertEqual((first.calls, second.calls), (1, 1))
+
+
+class Client(object):
+    def __init__(self, dce_version):
+        self.dce_version = dce_version
+
+    @minimum_version('2.7.13')
+    def new_feature(self):
+        return 'new'
+
+    @maximum_version('2.7.0')
+    def old_feature(self):
+        return 'old'
+
+
+class VersionGateTest(unittest.TestCase):
+    def test_gates(self):
+        client = Client('2.7.14')
+        self.assertEqual(client.new_feature(), 'new')
+        self.assertRaises(InvalidVersion, client.old_feature)
+
+        client = Client('2.6.0')
+        self.assertRaises(InvalidVersion, client.new_feature)
+        self.assertEqual(client.old_feature(), 'old')
+
+    def test_resolve_gates(self):
+        client = Client('2.6.0')
+        resolve_version_gates(client)
+        self.assertIn('new_feature', client.__dict__)
+        self.assertNotIn('old_feature', client.__dict__)
+        self.assertRaises(InvalidVersion, client.new_feature)
+        self.assertEqual(client.old_feature(), 'old')